@@ -11,114 +11,4296 @@ Version 2.0
 - Lets user select which file types to process (video/audio/images/other)
 - Usage-based protection for compound contents
 - Option to check for updates and download new version (.zip) automatically 
+- Headless command-line mode (--headless) with JSON report output
 """
 
+# Only what a scan needs is imported here. Networking (update checker), argparse (command
+# line), ctypes, subprocess, multiprocessing, sqlite3 and csv load where they are used,
+# so launching the GUI from Workspace > Scripts stays fast.
+import functools
 import os
 import sys
 import shutil
+import stat
+import queue
+import mmap
+import random
+import re
 import threading
-import subprocess
-import urllib.request
-import urllib.error
+import time
+import unicodedata
 import json
-import ssl
-import tkinter as tk
-from tkinter import (
-    Tk, Button, Checkbutton, IntVar, Text, Scrollbar, END,
-    Label, Entry, messagebox, Radiobutton, DISABLED, NORMAL
+import hashlib
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+APP_VERSION = "2.0.0"
+GITHUB_API_LATEST = "https://api.github.com/repos/groovelanddesigns/davinciresolveunusedmediacleaner/releases/latest"
+
+# OS Detection
+IS_WINDOWS = sys.platform.startswith('win')
+IS_MAC = sys.platform.startswith('darwin')
+IS_LINUX = sys.platform.startswith('linux')
+
+# Dynamic UI & Paths based on OS
+if IS_WINDOWS:
+    TRASH_NAME = "Recycle Bin"
+    RESOLVE_MODULE_PATH = r"C:\ProgramData\Blackmagic Design\DaVinci Resolve\Support\Developer\Scripting\Modules"
+elif IS_MAC:
+    TRASH_NAME = "Trash"
+    RESOLVE_MODULE_PATH = "/Library/Application Support/Blackmagic Design/DaVinci Resolve/Developer/Scripting/Modules"
+else:
+    TRASH_NAME = "Trash"
+    RESOLVE_MODULE_PATH = "" # Linux fallback if needed
+
+if RESOLVE_MODULE_PATH and RESOLVE_MODULE_PATH not in sys.path and os.path.isdir(RESOLVE_MODULE_PATH):
+    sys.path.append(RESOLVE_MODULE_PATH)
+
+# Imported by connect_resolve() on first use; --help and the benchmarks work without it
+DaVinciResolveScript = None
+
+
+# --- OS-Specific Trash Implementations ---
+
+TRASH_BATCH_SIZE = 100
+
+
+def _shell_delete_win(paths) -> tuple[int, bool]:
+    """One SHFileOperationW call for all paths; pFrom takes a double-NUL-terminated list."""
+    import ctypes
+    from ctypes.wintypes import HWND, LPCWSTR, UINT
+
+    class SHFILEOPSTRUCT(ctypes.Structure):
+        _fields_ = [
+            ("hwnd", HWND),
+            ("wFunc", UINT),
+            ("pFrom", LPCWSTR),
+            ("pTo", LPCWSTR),
+            ("fFlags", ctypes.c_uint),
+            ("fAnyOperationsAborted", ctypes.c_bool),
+            ("hNameMappings", ctypes.c_void_p),
+            ("lpszProgressTitle", LPCWSTR),
+        ]
+    FO_DELETE = 3
+    FOF_ALLOWUNDO = 0x0040
+    FOF_NOCONFIRMATION = 0x0010
+    FOF_SILENT = 0x0004
+    flags = FOF_ALLOWUNDO | FOF_NOCONFIRMATION | FOF_SILENT
+    pfrom = "\0".join(os.path.abspath(p) for p in paths) + "\0\0"
+    op = SHFILEOPSTRUCT()
+    op.hwnd = None
+    op.wFunc = FO_DELETE
+    op.pFrom = pfrom
+    op.pTo = None
+    op.fFlags = flags
+    op.fAnyOperationsAborted = False
+    op.hNameMappings = None
+    op.lpszProgressTitle = None
+    ret = ctypes.windll.shell32.SHFileOperationW(ctypes.byref(op))
+    return ret, bool(op.fAnyOperationsAborted)
+
+def move_to_recycle_bin_win(path: str) -> tuple[bool, str]:
+    if not IS_WINDOWS: return False, "Not Windows"
+    ret, _ = _shell_delete_win([path])
+    return (ret == 0, "" if ret == 0 else f"SHFileOperationW returned code {ret}")
+
+def move_to_recycle_bin_win_batch(paths: list) -> list:
+    if not IS_WINDOWS: return [(False, "Not Windows")] * len(paths)
+    ret, aborted = _shell_delete_win(paths)
+    if ret == 0 and not aborted:
+        return [(True, "")] * len(paths)
+    # Partial failure: whatever is still on disk did not make it to the Recycle Bin
+    err = f"SHFileOperationW returned code {ret}" if ret else "Operation aborted"
+    return [(False, err) if os.path.lexists(p) else (True, "") for p in paths]
+
+def _applescript_file(path: str) -> str:
+    escaped_path = os.path.abspath(path).replace('\\', '\\\\').replace('"', '\\"')
+    return f'POSIX file "{escaped_path}"'
+
+def move_to_trash_mac(path: str) -> tuple[bool, str]:
+    if not IS_MAC: return False, "Not macOS"
+    import subprocess
+    try:
+        script = f'tell application "Finder" to move {_applescript_file(path)} to trash'
+        result = subprocess.run(['osascript', '-e', script], capture_output=True, text=True)
+        if result.returncode == 0:
+            return True, ""
+        else:
+            return False, result.stderr.strip() or "Unknown AppleScript error"
+    except Exception as e:
+        return False, str(e)
+
+def move_to_trash_mac_batch(paths: list) -> list:
+    """Moves a list of files with a single osascript process / Finder event."""
+    if not IS_MAC: return [(False, "Not macOS")] * len(paths)
+    import subprocess
+    try:
+        items = ", ".join(_applescript_file(p) for p in paths)
+        script = f'tell application "Finder" to move {{{items}}} to trash'
+        result = subprocess.run(['osascript', '-e', script], capture_output=True, text=True)
+        if result.returncode == 0:
+            return [(True, "")] * len(paths)
+    except Exception:
+        pass
+    # Finder aborts the whole list on the first bad item; retry the leftovers one by one
+    return [move_to_trash_mac(p) if os.path.lexists(p) else (True, "") for p in paths]
+
+def _linux_trash_dir_for(abs_path: str) -> tuple[str, str]:
+    """Picks the freedesktop.org trash directory for a file; returns (trash_dir, topdir).
+
+    topdir is "" for the home trash, where .trashinfo paths are absolute.
+    """
+    data_home = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    home_trash = os.path.join(data_home, "Trash")
+    file_dev = os.lstat(abs_path).st_dev
+    probe = home_trash
+    while not os.path.exists(probe):
+        probe = os.path.dirname(probe)
+    if os.stat(probe).st_dev == file_dev:
+        return home_trash, ""
+
+    # Different volume: use the volume's own trash rather than copying across devices
+    topdir = os.path.dirname(abs_path)
+    while topdir != os.path.dirname(topdir) and os.stat(os.path.dirname(topdir)).st_dev == file_dev:
+        topdir = os.path.dirname(topdir)
+    uid = str(os.getuid())
+    shared = os.path.join(topdir, ".Trash")
+    try:
+        st = os.lstat(shared)
+        if stat.S_ISDIR(st.st_mode) and st.st_mode & stat.S_ISVTX:
+            return os.path.join(shared, uid), topdir
+    except OSError:
+        pass
+    return os.path.join(topdir, f".Trash-{uid}"), topdir
+
+def _linux_trash_into(abs_path: str, files_dir: str, info_dir: str, topdir: str, deleted: str):
+    """Writes a file's .trashinfo and renames it into an existing trash directory."""
+    import urllib.parse
+    original = os.path.relpath(abs_path, topdir) if topdir else abs_path
+    info = ("[Trash Info]\n"
+            f"Path={urllib.parse.quote(original)}\n"
+            f"DeletionDate={deleted}\n")
+    base = os.path.basename(abs_path)
+    stem, ext = os.path.splitext(base)
+    n = 1
+    while True:
+        name = base if n == 1 else f"{stem}.{n}{ext}"
+        info_path = os.path.join(info_dir, name + ".trashinfo")
+        try:
+            # Creating the .trashinfo exclusively reserves the name
+            fd = os.open(info_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            n += 1
+            continue
+        if os.path.lexists(os.path.join(files_dir, name)):
+            os.close(fd)
+            os.unlink(info_path)
+            n += 1
+            continue
+        break
+    with os.fdopen(fd, "w") as f:
+        f.write(info)
+    try:
+        os.rename(abs_path, os.path.join(files_dir, name))
+    except OSError:
+        os.unlink(info_path)
+        raise
+
+def move_to_trash_linux(path: str) -> tuple[bool, str]:
+    """Trashes a file following the freedesktop.org Trash specification."""
+    if not IS_LINUX: return False, "Not Linux"
+    return move_to_trash_linux_batch([path])[0]
+
+def move_to_trash_linux_batch(paths: list) -> list:
+    """Trashes a list of files, picking and creating each device's trash directory once.
+
+    There is no system call to trash several files, so every file still costs
+    its own .trashinfo and rename; the batch only saves the repeated trash lookups.
+    """
+    if not IS_LINUX: return [(False, "Not Linux")] * len(paths)
+    trashes = {}  # st_dev -> (files_dir, info_dir, topdir)
+    deleted = time.strftime('%Y-%m-%dT%H:%M:%S')
+    results = []
+    for path in paths:
+        try:
+            abs_path = os.path.abspath(path)
+            dev = os.lstat(abs_path).st_dev
+            trash = trashes.get(dev)
+            if trash is None:
+                trash_dir, topdir = _linux_trash_dir_for(abs_path)
+                files_dir = os.path.join(trash_dir, "files")
+                info_dir = os.path.join(trash_dir, "info")
+                os.makedirs(files_dir, mode=0o700, exist_ok=True)
+                os.makedirs(info_dir, mode=0o700, exist_ok=True)
+                trash = trashes[dev] = (files_dir, info_dir, topdir)
+            _linux_trash_into(abs_path, *trash, deleted)
+            results.append((True, ""))
+        except Exception as e:
+            results.append((False, str(e)))
+    return results
+
+def send_to_trash(path: str) -> tuple[bool, str]:
+    """Router function to send to the correct native trash."""
+    if IS_WINDOWS:
+        return move_to_recycle_bin_win(path)
+    elif IS_MAC:
+        return move_to_trash_mac(path)
+    elif IS_LINUX:
+        return move_to_trash_linux(path)
+    else:
+        return False, "Unsupported OS for native trash implementation."
+
+def send_to_trash_batch(paths: list, batch_size: int = TRASH_BATCH_SIZE, on_done=None) -> list:
+    """Batch form of send_to_trash: one native operation per batch of paths.
+
+    Returns a (ok, error) tuple for every path, in the same order as `paths`.
+    on_done(index, ok, error) is called for each path as its batch finishes.
+    """
+    batch_size = max(1, int(batch_size))
+    results = []
+    for i in range(0, len(paths), batch_size):
+        batch = paths[i:i + batch_size]
+        if IS_WINDOWS:
+            batch_results = move_to_recycle_bin_win_batch(batch)
+        elif IS_MAC:
+            batch_results = move_to_trash_mac_batch(batch)
+        elif IS_LINUX:
+            batch_results = move_to_trash_linux_batch(batch)
+        else:
+            batch_results = [send_to_trash(p) for p in batch]
+        if on_done is not None:
+            for j, (ok, err) in enumerate(batch_results):
+                on_done(i + j, ok, err)
+        results.extend(batch_results)
+    return results
+
+
+# --- Scripting API Call Accounting ---
+
+LATENCY_SAMPLES = 2048  # Per-method reservoir for latency percentiles
+
+
+class LatencyStats:
+    """Exact count, total and max of one method's call latencies plus a bounded sample for percentiles."""
+    __slots__ = ("count", "total", "max", "samples", "_rng")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = []
+        self._rng = random.Random(0)
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        if len(self.samples) < LATENCY_SAMPLES:
+            self.samples.append(seconds)
+        else:
+            j = self._rng.randrange(self.count)
+            if j < LATENCY_SAMPLES:
+                self.samples[j] = seconds
+
+    def merge(self, other: "LatencyStats"):
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        samples = self.samples + other.samples
+        if len(samples) > LATENCY_SAMPLES:
+            samples = self._rng.sample(samples, LATENCY_SAMPLES)
+        self.samples = samples
+
+    def percentile(self, q: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def to_dict(self) -> dict:
+        return {"calls": self.count, "total_ms": round(self.total * 1000, 3),
+                "mean_ms": round(self.total * 1000 / self.count, 4) if self.count else 0.0,
+                "p50_ms": round(self.percentile(0.50) * 1000, 4), "p95_ms": round(self.percentile(0.95) * 1000, 4),
+                "max_ms": round(self.max * 1000, 4)}
+
+
+class ApiCallCounter:
+    """Tallies scripting-API round-trips per method name for a single run.
+
+    With `timed`, every call is timed as well (see LatencyStats); untimed counters
+    cost one dictionary update per call.
+    """
+
+    def __init__(self, timed: bool = False):
+        self.calls = {}
+        self.clip_count = 0
+        self.latency = {} if timed else None
+
+    def add(self, name: str):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def add_timed(self, name: str, seconds: float):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        stats = self.latency.get(name)
+        if stats is None:
+            stats = self.latency[name] = LatencyStats()
+        stats.add(seconds)
+
+    def merge(self, other: "ApiCallCounter"):
+        """Folds in the tally of another connection (e.g. a scan worker)."""
+        for name, count in other.calls.items():
+            self.calls[name] = self.calls.get(name, 0) + count
+        if self.latency is not None and other.latency:
+            for name, stats in other.latency.items():
+                self.latency.setdefault(name, LatencyStats()).merge(stats)
+
+    @property
+    def total(self) -> int:
+        return sum(self.calls.values())
+
+
+_PLAIN_TYPES = (str, bytes, int, float, bool)
+
+
+def _wrap_api_result(value, counter):
+    if value is None or isinstance(value, _PLAIN_TYPES):
+        return value
+    if isinstance(value, dict):
+        return {k: _wrap_api_result(v, counter) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_wrap_api_result(v, counter) for v in value)
+    return CountingProxy(value, counter)
+
+
+def _unwrap_api_arg(value):
+    if isinstance(value, CountingProxy):
+        return value._target
+    if isinstance(value, dict):
+        return {k: _unwrap_api_arg(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_unwrap_api_arg(v) for v in value)
+    return value
+
+
+class CountingProxy:
+    """Transparent wrapper around a Resolve scripting object that counts every method call.
+
+    Objects returned from calls (timelines, items, folders...) are wrapped too, so
+    wrapping the Resolve handle once accounts for the whole run.
+    """
+    __slots__ = ("_target", "_counter")
+
+    def __init__(self, target, counter: ApiCallCounter):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_counter", counter)
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+        counter = self._counter
+        if counter.latency is None:
+            def call(*args, **kwargs):
+                counter.add(name)
+                result = attr(*_unwrap_api_arg(args), **_unwrap_api_arg(kwargs))
+                return _wrap_api_result(result, counter)
+        else:
+            def call(*args, **kwargs):
+                args, kwargs = _unwrap_api_arg(args), _unwrap_api_arg(kwargs)
+                started = time.perf_counter()
+                try:
+                    result = attr(*args, **kwargs)
+                finally:
+                    counter.add_timed(name, time.perf_counter() - started)
+                return _wrap_api_result(result, counter)
+        return call
+
+    def __bool__(self):
+        return bool(self._target)
+
+
+# --- Profiling ---
+
+class ProfileSpan:
+    """One timed stage on one thread; `items` is what the stage worked through."""
+    __slots__ = ("name", "thread", "start", "end", "items", "args")
+
+    def __init__(self, name: str, args=None):
+        self.name = name
+        self.thread = threading.get_ident()
+        self.start = self.end = 0.0
+        self.items = None
+        self.args = args
+
+
+# Handed out by disabled profiling; assignments to its `items` are simply ignored
+_NO_PROFILE = nullcontext(ProfileSpan(""))
+
+
+def profiled(stage: str, items=None):
+    """CleanerEngine method decorator: times each call as `stage` while the engine is profiling.
+
+    `items(result)` counts the work a call did, for the profile's item totals.
+    """
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.profiler is None:
+                return method(self, *args, **kwargs)
+            with self.profiler.stage(stage) as span:
+                result = method(self, *args, **kwargs)
+                if items is not None:
+                    span.items = items(result)
+            return result
+        return wrapper
+    return decorate
+
+
+class Profiler:
+    """Collects stage spans for a run's JSON profile and Chrome trace.
+
+    Stages nest (the Media Pool pass contains its stat and compound stages), so
+    stage seconds in the summary are inclusive. Safe to use from worker threads.
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.spans = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str, **args):
+        span = ProfileSpan(name, args or None)
+        span.start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.end = time.perf_counter()
+            with self._lock:
+                self.spans.append(span)
+
+    def stages(self) -> dict:
+        """{stage: {count, seconds, items}} in order of first appearance."""
+        totals = {}
+        for span in sorted(self.spans, key=lambda sp: sp.start):
+            entry = totals.setdefault(span.name, {"count": 0, "seconds": 0.0, "items": 0})
+            entry["count"] += 1
+            entry["seconds"] += span.end - span.start
+            entry["items"] += span.items or 0
+        for entry in totals.values():
+            entry["seconds"] = round(entry["seconds"], 4)
+        return totals
+
+    def to_dict(self, api_calls: ApiCallCounter = None) -> dict:
+        profile = {"version": 1, "wall_s": round(time.perf_counter() - self.origin, 4), "stages": self.stages()}
+        if api_calls is not None:
+            latency = api_calls.latency or {}
+            profile["api"] = {
+                "total": api_calls.total,
+                "by_method": {name: latency[name].to_dict() if name in latency else {"calls": count}
+                              for name, count in sorted(api_calls.calls.items(), key=lambda kv: -kv[1])},
+            }
+        return profile
+
+    def chrome_trace(self, api_calls: ApiCallCounter = None) -> dict:
+        """Trace Event Format, for chrome://tracing or ui.perfetto.dev."""
+        pid = os.getpid()
+        threads = {}
+        events = []
+        for span in sorted(self.spans, key=lambda sp: sp.start):
+            tid = threads.setdefault(span.thread, len(threads) + 1)
+            event = {"name": span.name, "cat": "stage", "ph": "X", "pid": pid, "tid": tid,
+                     "ts": round((span.start - self.origin) * 1e6, 1),
+                     "dur": round((span.end - span.start) * 1e6, 1)}
+            args = dict(span.args or {})
+            if span.items is not None:
+                args["items"] = span.items
+            if args:
+                event["args"] = args
+            events.append(event)
+        for ident, tid in threads.items():
+            label = "main" if ident == threading.main_thread().ident else f"worker {tid}"
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": label}})
+        other = {"version": APP_VERSION}
+        if api_calls is not None:
+            other["api"] = self.to_dict(api_calls)["api"]
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": other}
+
+
+# --- Media Pool Snapshot ---
+
+CONTAINER_TYPE_KEYWORDS = ("compound", "fusion", "multicam", "timeline")
+SNAPSHOT_PROPERTIES = ("Clip Name", "Type", "File Path", "Usage")
+
+
+def is_container_type(ctype: str) -> bool:
+    return any(x in ctype for x in CONTAINER_TYPE_KEYWORDS)
+
+
+def classify_clip_type(ctype: str) -> str:
+    """Maps a lowercased Resolve clip Type to one of video/audio/image/other."""
+    if "video" in ctype:
+        return "video"
+    if "audio" in ctype:
+        return "audio"
+    if ctype in ("still", "image"):
+        return "image"
+    return "other"
+
+
+def parse_usage(value) -> int:
+    if value is not None and str(value).isdigit():
+        return int(value)
+    return 0
+
+
+def fetch_clip_properties(clip) -> dict:
+    """Returns all clip properties, using the bulk no-argument GetClipProperty() form.
+
+    Falls back to one call per needed key if the bulk form is unavailable.
+    """
+    try:
+        props = clip.GetClipProperty()
+    except Exception:
+        props = None
+    if isinstance(props, dict) and props:
+        return props
+    props = {}
+    for key in SNAPSHOT_PROPERTIES:
+        try:
+            props[key] = clip.GetClipProperty(key)
+        except Exception:
+            props[key] = None
+    return props
+
+
+class ClipRecord:
+    """Compact per-clip row of everything the scan pipeline needs from the Media Pool."""
+    __slots__ = ("clip", "uid", "name", "ctype", "kind", "path", "usage", "props", "cached", "folder")
+
+    def __init__(self, clip, props: dict, uid: str = "", cached: bool = False, folder: int = -1):
+        self.clip = clip
+        self.uid = uid or ""
+        self.cached = cached
+        self.folder = folder
+        self.name = props.get("Clip Name") or ""
+        self.ctype = (props.get("Type") or "").lower()
+        self.kind = "container" if is_container_type(self.ctype) else classify_clip_type(self.ctype)
+        fp = props.get("File Path")
+        self.path = os.path.normpath(fp) if fp else ""
+        self.usage = parse_usage(props.get("Usage"))
+        # Containers keep their full property dict for compound child discovery
+        self.props = props if self.kind == "container" else None
+
+    @property
+    def is_container(self) -> bool:
+        return self.kind == "container"
+
+    def cache_props(self) -> dict:
+        """The properties needed to rebuild this record from the on-disk scan cache."""
+        if self.props is not None:
+            return dict(self.props)
+        return {"Clip Name": self.name, "Type": self.ctype, "File Path": self.path, "Usage": str(self.usage)}
+
+
+class MediaPoolIndex:
+    """Resolved clip records by unique ID, plus timelines by name.
+
+    The timeline walk fills it with the (proxy-free) records of every clip it meets,
+    so the Media Pool pass can reuse their properties. Timelines are indexed by name
+    so nested-timeline resolution never searches the project. Records hold no clip
+    proxies, so removing clips still finds them in the pool (see _resolve_clips):
+    in the bin each was seen in, or with one walk of the whole pool for cached scans.
+    """
+
+    def __init__(self):
+        self.by_id = {}
+        self.timelines_by_name = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def add(self, rec: ClipRecord):
+        # Concurrent timeline workers add records too
+        with self._lock:
+            if rec.uid and rec.uid not in self.by_id:
+                self.by_id[rec.uid] = rec
+
+    def remove(self, rec: ClipRecord):
+        """Patches the index after the tool deletes a clip from the Media Pool."""
+        if rec.uid:
+            self.by_id.pop(rec.uid, None)
+
+    def get(self, uid: str):
+        return self.by_id.get(uid)
+
+    def add_timeline(self, timeline, name: str):
+        if name:
+            self.timelines_by_name.setdefault(name, timeline)
+
+    def timeline_by_name(self, name: str):
+        return self.timelines_by_name.get(name)
+
+
+def iter_media_pool(root_folder, cache=None, project_key: str = "",
+                    known: MediaPoolIndex = None, folders: list = None, bins: list = None):
+    """Lazily walks the Media Pool, yielding a ClipRecord per clip, one folder at a time.
+
+    Records carry their live clip proxy; consumers that keep a record should drop it.
+    If `folders` is given it collects the folder proxies and rec.folder indexes into
+    it, so a clip can be found again without walking the whole pool; `bins` collects
+    the matching bin paths below the root ("" for the root itself). Clips already in
+    `known` (resolved by the timeline walk) reuse those properties. With a
+    ScanCacheDB, folders whose clip IDs are unchanged are rebuilt from the cache
+    instead of fetching every clip's properties.
+    """
+    stack = [(root_folder, "")]
+    while stack:
+        folder, folder_path = stack.pop()
+        folder_no = -1
+        if folders is not None:
+            folder_no = len(folders)
+            folders.append(folder)
+            if bins is not None:
+                bins.append(folder_path)
+        try:
+            clips = folder.GetClips() or {}
+        except Exception:
+            clips = {}
+        uids = []
+        for _, c in clips.items():
+            try:
+                uids.append(c.GetUniqueId() or "")
+            except Exception:
+                uids.append("")
+
+        cached_rows = None
+        if cache is not None:
+            folder_key = _unique_key(folder, "folder") or f"path:{folder_path}"
+            folder_fp = fingerprint_digest(sorted(uids))
+            cached_rows = cache.get_folder(project_key, folder_key, folder_fp)
+        if cached_rows is not None:
+            by_uid = dict(zip(uids, clips.values()))
+            records = [ClipRecord(by_uid.get(uid), props, uid, cached=True, folder=folder_no)
+                       for uid, props in cached_rows]
+        else:
+            records = []
+            for uid, c in zip(uids, clips.values()):
+                rec = known.get(uid) if known is not None and uid else None
+                if rec is None:
+                    rec = ClipRecord(c, fetch_clip_properties(c), uid, folder=folder_no)
+                else:
+                    rec.clip, rec.folder = c, folder_no
+                records.append(rec)
+            if cache is not None and all(uids):
+                cache.put_folder(project_key, folder_key, folder_fp,
+                                 [(rec.uid, rec.cache_props()) for rec in records])
+        try:
+            subs = folder.GetSubFolders() or {}
+        except Exception:
+            subs = {}
+        # Reverse so folders pop in the same order a recursive walk visits them
+        for sf in reversed(list(subs.values())):
+            try:
+                name = sf.GetName()
+            except Exception:
+                name = ""
+            stack.append((sf, f"{folder_path}/{name}"))
+        yield from records
+
+
+def find_clips_by_uid(root_folder, uids, recursive: bool = True) -> dict:
+    """Walks the Media Pool (or one folder) and returns {unique_id: clip} for the wanted IDs only."""
+    wanted = set(uids)
+    found = {}
+    stack = [root_folder]
+    while stack and len(found) < len(wanted):
+        folder = stack.pop()
+        try:
+            clips = folder.GetClips() or {}
+        except Exception:
+            clips = {}
+        for _, c in clips.items():
+            try:
+                uid = c.GetUniqueId()
+            except Exception:
+                continue
+            if uid in wanted:
+                found[uid] = c
+        if not recursive:
+            break
+        try:
+            stack.extend((folder.GetSubFolders() or {}).values())
+        except Exception:
+            pass
+    return found
+
+
+# --- Image Sequences ---
+
+# Frame-number token in a Media Pool sequence path: clip_[0001-0240].exr, clip_%04d.dpx, clip_####.tif
+SEQUENCE_PATTERN = re.compile(r"\[(\d+)-(\d+)\]|%0?(\d*)d|(#{2,})")
+SEQUENCE_CLIP_KINDS = ("video", "image")  # Resolve lists image sequences as Video or Still clips
+
+
+class SequencePattern:
+    """Frame-name matcher for one image-sequence path.
+
+    The bracket form carries its own frame range; printf and hash forms match
+    any frame number. Frame numbers may outgrow the padding (9999 -> 10000).
+    """
+    __slots__ = ("directory", "prefix", "suffix", "width", "_regex", "_first", "_last")
+
+    def __init__(self, directory: str, prefix: str, suffix: str, width: int,
+                 first=None, last=None, ignore_case: bool = False):
+        self.directory = directory
+        self.prefix = prefix
+        self.suffix = suffix
+        self.width = width
+        self._regex = re.compile(f"{re.escape(prefix)}(\\d{{{max(width, 1)},}}){re.escape(suffix)}",
+                                 re.IGNORECASE if ignore_case else 0)
+        self._first = first
+        self._last = last
+
+    def match(self, name: str) -> bool:
+        return self.frame(name) is not None
+
+    def frame(self, name: str):
+        """Frame number of a member file name, None if the name is not part of the sequence."""
+        m = self._regex.fullmatch(name)
+        if m is None:
+            return None
+        number = int(m.group(1))
+        if self._first is not None and not self._first <= number <= self._last:
+            return None
+        return number
+
+    def printf_path(self) -> str:
+        """The sequence path in the %0Nd form ImportMedia takes."""
+        return os.path.join(self.directory, f"{self.prefix}%0{self.width}d{self.suffix}")
+
+
+def parse_sequence(path: str, ignore_case: bool = False, ctype=None):
+    """SequencePattern for a normalised sequence path, or None for an ordinary file path.
+
+    Only image formats form sequences, so "Interview [2019-2020].mov" is a plain
+    file. With the clip's lowercased Type given, only video and still clips do.
+    A pattern is a guess: callers that can should check the literal name first.
+    """
+    if not path.lower().endswith(MEDIA_EXTENSIONS["image"]):
+        return None
+    if ctype is not None and classify_clip_type(ctype) not in SEQUENCE_CLIP_KINDS:
+        return None
+    directory, _, name = path.rpartition(os.sep)
+    m = None
+    for m in SEQUENCE_PATTERN.finditer(name):
+        pass
+    if m is None:
+        return None
+    first, last, printf_width, hashes = m.groups()
+    if first is not None:
+        width = len(first) if first.startswith("0") else 1
+        first, last = sorted((int(first), int(last)))
+    else:
+        width = len(hashes) if hashes else int(printf_width or 1)
+    return SequencePattern(directory, name[:m.start()], name[m.end():], width, first, last, ignore_case)
+
+
+class FileSequence:
+    """Member files of one image-sequence clip, as found in its directory listing."""
+    __slots__ = ("directory", "names", "bytes")
+
+    def __init__(self, directory: str, names):
+        self.directory = directory
+        self.names = sorted(names)
+        self.bytes = None  # Total size, filled in by StatCache.size() on first use
+
+    def __len__(self):
+        return len(self.names)
+
+    def paths(self) -> list:
+        return [os.path.join(self.directory, name) for name in self.names]
+
+
+# --- Filesystem Stat Cache ---
+
+STAT_WORKERS = 16
+LISTING_CACHE_DIRS = 256  # Directory listings kept between prefill() batches
+
+
+class StatCache:
+    """Per-run cache of os.stat results keyed by normalised path (None = missing).
+
+    prefill() lists each parent directory once with os.scandir so a single listing
+    answers every wanted file in that folder; later lookups are dictionary reads.
+    The most recent listings are kept, so a streaming scan that prefills in batches
+    does not list the same folder again for every batch.
+    Image-sequence paths are expanded to their member frames from that same
+    listing; such a path exists while at least one frame does. A file actually
+    named like a sequence pattern is taken literally. `clip_types` maps paths to
+    their clip's lowercased Type, which rules out sequences for audio and other clips.
+    Only restat() deliberately goes back to the filesystem.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._listings = OrderedDict()
+        self._sequences = {}
+        self.listings = 0
+        self.stats = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def prefill(self, paths, workers: int = STAT_WORKERS, clip_types=None):
+        by_dir = {}
+        sequences = {}
+        for p in paths:
+            norm = os.path.normpath(p)
+            if norm in self._entries:
+                continue
+            pattern = parse_sequence(norm, ctype=clip_types.get(p) if clip_types else None)
+            if pattern is not None:
+                # The literal name is looked up too; frames are only picked out of the
+                # listing below when no such file exists
+                sequences.setdefault(pattern.directory, []).append((norm, pattern))
+            by_dir.setdefault(os.path.dirname(norm), set()).add(os.path.basename(norm))
+        if not by_dir:
+            return
+        jobs = [(directory, names, self._listings.get(directory)) for directory, names in by_dir.items()]
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(jobs)))) as pool:
+            listed = list(pool.map(lambda job: self._list_dir(*job), jobs))
+        for (directory, _, known), (listing, found, unmatched) in zip(jobs, listed):
+            if listing is not None:
+                if known is None:
+                    self.listings += 1
+                self._listings[directory] = listing
+                self._listings.move_to_end(directory)
+                if len(self._listings) > LISTING_CACHE_DIRS:
+                    self._listings.popitem(last=False)
+            for name, st in found.items():
+                self._entries[os.path.join(directory, name)] = st
+            for name in unmatched:
+                self.stat(os.path.join(directory, name))
+            for path, pattern in sequences.get(directory, ()):
+                if self._entries.get(path) is None:
+                    self._set_sequence(path, pattern, listing[0] if listing is not None else None)
+
+    def _set_sequence(self, path: str, pattern: SequencePattern, names):
+        if names is None:
+            try:
+                with os.scandir(pattern.directory) as it:
+                    names = [entry.name for entry in it]
+            except OSError:
+                names = ()
+            self.listings += 1
+        seq = self._sequences[path] = FileSequence(pattern.directory, filter(pattern.match, names))
+        # The first frame stands in for the whole sequence in stat()/exists()
+        st = None
+        for member in seq.paths()[:1]:
+            try:
+                st = os.stat(member)
+            except OSError:
+                pass
+        self._entries[path] = st
+        return st
+
+    @staticmethod
+    def _fold(name: str) -> str:
+        return unicodedata.normalize("NFC", name).casefold()
+
+    @classmethod
+    def _list_dir(cls, directory: str, names: set, listing=None):
+        """Returns (listing, {name: stat or None}, names needing an individual stat).
+
+        A listing is [set of entry names, folded names or None]. Only names are kept
+        between batches (not DirEntry objects with their stat results), and the folded
+        set is only built when a wanted name is absent.
+        """
+        entries = None
+        if listing is None:
+            try:
+                with os.scandir(directory) as it:
+                    entries = {entry.name: entry for entry in it}
+            except (FileNotFoundError, NotADirectoryError):
+                return None, {name: None for name in names}, ()
+            except OSError:
+                return None, {}, names
+            listing = [set(entries), None]
+        found = {}
+        absent = []
+        for name in names:
+            if name not in listing[0]:
+                absent.append(name)
+                continue
+            try:
+                # A fresh DirEntry may answer without a syscall (Windows)
+                found[name] = entries[name].stat() if entries else os.stat(os.path.join(directory, name))
+            except OSError:
+                found[name] = None
+        # A name that only matches up to case or Unicode form may still be the same
+        # file on case-insensitive volumes; those get an individual stat. Anything
+        # else absent from the listing is missing.
+        unmatched = []
+        if absent:
+            if listing[1] is None:
+                listing[1] = {cls._fold(name) for name in listing[0]}
+            for name in absent:
+                if cls._fold(name) in listing[1]:
+                    unmatched.append(name)
+                else:
+                    found[name] = None
+        return listing, found, unmatched
+
+    def stat(self, path: str):
+        norm = os.path.normpath(path)
+        try:
+            return self._entries[norm]
+        except KeyError:
+            return self.restat(norm)
+
+    def restat(self, path: str, ctype=None):
+        norm = os.path.normpath(path)
+        self.stats += 1
+        try:
+            st = os.stat(norm)
+        except (OSError, ValueError):
+            st = None
+        if st is None:
+            pattern = parse_sequence(norm, ctype=ctype)
+            if pattern is not None:
+                return self._set_sequence(norm, pattern, None)
+        self._sequences.pop(norm, None)
+        self._entries[norm] = st
+        return st
+
+    def exists(self, path: str) -> bool:
+        return self.stat(path) is not None
+
+    def discard(self, path: str):
+        """Forgets a path the scan no longer needs (keeps the cache bounded by candidates)."""
+        norm = os.path.normpath(path)
+        self._entries.pop(norm, None)
+        self._sequences.pop(norm, None)
+
+    def sequence(self, path: str):
+        """FileSequence for a prefilled/restatted sequence path, None for ordinary files."""
+        return self._sequences.get(os.path.normpath(path))
+
+    def size(self, path: str, workers: int = STAT_WORKERS) -> int:
+        """Bytes on disk behind a clip path, 0 if missing. Sequence frames are stat'ed once, on first use."""
+        seq = self.sequence(path)
+        if seq is None:
+            st = self.stat(path)
+            return st.st_size if st is not None else 0
+        if seq.bytes is None:
+            def frame_size(member):
+                try:
+                    return os.stat(member).st_size
+                except OSError:
+                    return 0
+            members = seq.paths()
+            self.stats += len(members)
+            with ThreadPoolExecutor(max_workers=max(1, min(workers, len(members)))) as pool:
+                seq.bytes = sum(pool.map(frame_size, members))
+        return seq.bytes
+
+    def member_paths(self, path: str) -> list:
+        """Every file on disk behind a clip path: the frames of a sequence, else the path itself."""
+        seq = self.sequence(path)
+        return seq.paths() if seq is not None else [path]
+
+
+# --- Used-Path Store ---
+
+_CASE_FOLDING = {}  # st_dev -> True if the volume ignores case
+
+
+def volume_ignores_case(directory: str) -> bool:
+    """True if the volume holding `directory` treats names case-insensitively.
+
+    Probed without writing: the nearest path component with letters is stat'ed with
+    its case swapped. Results are cached per device; paths that cannot be stat'ed
+    (offline media) get the platform default.
+    """
+    default = IS_WINDOWS or IS_MAC
+    try:
+        dev = os.stat(directory).st_dev
+    except (OSError, ValueError):
+        return default
+    cached = _CASE_FOLDING.get(dev)
+    if cached is not None:
+        return cached
+    result = default
+    path = os.path.abspath(directory)
+    while True:
+        head, tail = os.path.split(path)
+        if tail and tail.swapcase() != tail:
+            try:
+                if os.stat(path).st_dev == dev:
+                    result = os.path.samefile(path, os.path.join(head, tail.swapcase()))
+            except OSError:
+                result = False
+            break
+        if head == path:
+            break
+        path = head
+    _CASE_FOLDING[dev] = result
+    return result
+
+
+class PathStore:
+    """Set of normalised file paths, case/Unicode folded on case-insensitive volumes.
+
+    Lookups go to one flat set of keys: every spelling added, plus the folded form
+    of paths on case-insensitive volumes, so an exact spelling is a single set
+    probe and a spelling variant of the same file still compares equal. Iteration
+    returns each file once, as first added. Paths must already be
+    os.path.normpath'ed (ClipRecord does that once).
+    """
+
+    def __init__(self, ignores_case=volume_ignores_case):
+        self._ignores_case = ignores_case
+        self._keys = set()         # spellings added plus folded keys
+        self._paths = []           # one spelling per file, as first added
+        self._dirs = {}            # directory as seen -> folded directory, None if case-sensitive
+        self._folded_dirs = set()  # folded directories holding a folded key
+
+    def __len__(self):
+        return len(self._paths)
+
+    def _dir_key(self, directory: str):
+        try:
+            return self._dirs[directory]
+        except KeyError:
+            # Memoised even for directories never added: the probe stats the
+            # directory, which is a network round-trip on shared storage
+            key = self._dirs[directory] = StatCache._fold(directory) if self._ignores_case(directory) else None
+            return key
+
+    def add(self, path: str):
+        if path in self._keys:
+            return
+        # Normalised paths use os.sep only, so a plain rpartition is a safe, fast split
+        directory, _, name = path.rpartition(os.sep)
+        folded_dir = self._dir_key(directory)
+        self._keys.add(path)
+        if folded_dir is not None:
+            key = f"{folded_dir}{os.sep}{StatCache._fold(name)}"
+            if key in self._keys:
+                return  # Another spelling of a file already stored
+            self._keys.add(key)
+            self._folded_dirs.add(folded_dir)
+        self._paths.append(path)
+
+    def update(self, paths):
+        for path in paths:
+            self.add(path)
+
+    def __contains__(self, path) -> bool:
+        if path in self._keys:
+            return True
+        if not self._folded_dirs:
+            return False
+        directory, _, name = path.rpartition(os.sep)
+        folded_dir = self._dir_key(directory)
+        return (folded_dir is not None and folded_dir in self._folded_dirs
+                and f"{folded_dir}{os.sep}{StatCache._fold(name)}" in self._keys)
+
+    def __iter__(self):
+        return iter(self._paths)
+
+    def directories(self) -> list:
+        """Directories (as first seen) holding at least one used file."""
+        seen = {}
+        for path in self._paths:
+            directory = path.rpartition(os.sep)[0]
+            seen.setdefault(self._dirs.get(directory) or directory, directory)
+        return list(seen.values())
+
+
+# --- Timeline Traversal ---
+
+MAX_NESTING_DEPTH = 64  # Safety net only; cycles are caught by the in-progress stack
+
+
+def _unique_key(obj, prefix: str):
+    """Stable memo key for a timeline or Media Pool item, or None if it has no identity."""
+    try:
+        uid = obj.GetUniqueId()
+    except Exception:
+        uid = None
+    if uid:
+        return f"{prefix}:{uid}"
+    if prefix == "tl":
+        # Timeline names are unique within a project
+        try:
+            name = obj.GetName()
+        except Exception:
+            name = None
+        if name:
+            return f"tl-name:{name}"
+    return None
+
+
+class TimelineWalker:
+    """Resolves the file paths used by timelines, walking each inner timeline once per run.
+
+    Results are memoised by timeline and Media Pool item unique ID, so a compound
+    that appears hundreds of times is only walked on its first occurrence and the
+    Media Pool side of compound discovery reuses the same sets.
+    """
+
+    def __init__(self, project, index: MediaPoolIndex = None, log=None):
+        self.project = project
+        self.index = index
+        self.log = log or (lambda msg: None)
+        self._timeline_paths = {}
+        self._item_paths = {}
+        self._stack = []
+        self._on_stack = set()
+        self._tainted = set()
+        self._index_timelines = True
+        self.timelines_walked = 0
+        self.cache_hits = 0
+        self.cycles = 0
+
+    def fork(self, project) -> "TimelineWalker":
+        """A walker for another scripting connection that shares this one's finished results.
+
+        Memo entries are immutable sets keyed by unique ID, so forks running on other
+        threads can read and publish them freely; the in-progress stack stays per fork.
+        Timelines are looked up through the fork's own project rather than the index,
+        whose objects belong to the original connection.
+        """
+        other = TimelineWalker(project, self.index, self.log)
+        other._timeline_paths = self._timeline_paths
+        other._item_paths = self._item_paths
+        other._index_timelines = False
+        return other
+
+    def absorb(self, other: "TimelineWalker"):
+        self.timelines_walked += other.timelines_walked
+        self.cache_hits += other.cache_hits
+        self.cycles += other.cycles
+
+    def paths_for_timeline(self, timeline) -> frozenset:
+        if not timeline:
+            return frozenset()
+        key = _unique_key(timeline, "tl")
+        if key is not None:
+            cached = self._timeline_paths.get(key)
+            if cached is not None:
+                self.cache_hits += 1
+                return cached
+            if key in self._on_stack:
+                # Back-edge: timelines above `key` on the stack only see a partial set
+                self.cycles += 1
+                self._tainted.update(self._stack[self._stack.index(key) + 1:])
+                self.log(f"WARNING: Timeline nesting cycle detected at {key}; skipping re-entry.")
+                return frozenset()
+        if len(self._stack) >= MAX_NESTING_DEPTH:
+            return frozenset()
+
+        self._stack.append(key)
+        if key is not None:
+            self._on_stack.add(key)
+        try:
+            paths = frozenset(self._walk_tracks(timeline))
+        finally:
+            self._stack.pop()
+            self._on_stack.discard(key)
+        self.timelines_walked += 1
+        if key is not None:
+            if key in self._tainted:
+                self._tainted.discard(key)
+            else:
+                self._timeline_paths[key] = paths
+        return paths
+
+    def paths_for_track(self, timeline, track_type: str, track_index: int) -> frozenset:
+        """File paths used by one track of a top-level timeline (a unit of concurrent work)."""
+        key = _unique_key(timeline, "tl")
+        self._stack.append(key)
+        if key is not None:
+            self._on_stack.add(key)
+        try:
+            found = set()
+            self._walk_track(timeline, track_type, track_index, found)
+        finally:
+            self._stack.pop()
+            self._on_stack.discard(key)
+            self._tainted.discard(key)
+        return frozenset(found)
+
+    @staticmethod
+    def track_counts(timeline) -> list:
+        """[(track_type, count), ...] for the video and audio tracks of a timeline."""
+        counts = []
+        if not hasattr(timeline, "GetTrackCount") or not callable(timeline.GetTrackCount):
+            return counts
+        for track_type in ("video", "audio"):
+            try:
+                counts.append((track_type, timeline.GetTrackCount(track_type) or 0))
+            except Exception:
+                counts.append((track_type, 0))
+        return counts
+
+    def _walk_tracks(self, timeline):
+        found = set()
+        for track_type, track_count in self.track_counts(timeline):
+            for ti in range(1, track_count + 1):
+                self._walk_track(timeline, track_type, ti, found)
+        return found
+
+    def _walk_track(self, timeline, track_type, track_index, found):
+        try:
+            items = timeline.GetItemsInTrack(track_type, track_index) or {}
+        except Exception:
+            items = {}
+        for _, item in items.items():
+            try:
+                mpi = item.GetMediaPoolItem()
+            except Exception:
+                mpi = None
+            if mpi:
+                found.update(self.paths_for_item(mpi))
+
+    def paths_for_item(self, mpi, props=None, all_sources=False) -> frozenset:
+        """File paths a Media Pool item contributes: its own file plus any inner timeline."""
+        key = _unique_key(mpi, "mpi")
+        memo_key = (key, all_sources)
+        if key is not None:
+            cached = self._item_paths.get(memo_key)
+            if cached is not None:
+                self.cache_hits += 1
+                return cached
+        rec = self.index.get(key[len("mpi:"):]) if self.index is not None and key else None
+        if rec is None:
+            if props is None:
+                props = fetch_clip_properties(mpi)
+            rec = ClipRecord(None, props, key[len("mpi:"):] if key else "")
+            if self.index is not None and rec.uid:
+                self.index.add(rec)
+        found = set()
+        if rec.path:
+            # No existence filter: a used set must stay valid if offline media comes back
+            found.add(rec.path)
+
+        cacheable = key is not None
+        if rec.is_container:
+            for inner in self._inner_timelines(mpi, rec.name, all_sources):
+                found.update(self.paths_for_timeline(inner))
+                inner_key = _unique_key(inner, "tl")
+                if inner_key is None or inner_key not in self._timeline_paths:
+                    cacheable = False
+        result = frozenset(found)
+        if cacheable:
+            self._item_paths[memo_key] = result
+        return result
+
+    def _inner_timelines(self, mpi, name, all_sources):
+        inners = []
+        for attr in ("GetTimeline", "GetSourceTimeline"):
+            try:
+                fn = getattr(mpi, attr, None)
+                inner = fn() if callable(fn) else fn
+            except Exception:
+                inner = None
+            if inner:
+                inners.append(inner)
+                if not all_sources:
+                    break
+        if not inners and name:
+            try:
+                if self._index_timelines and self.index is not None and self.index.timelines_by_name:
+                    inner = self.index.timeline_by_name(name)
+                else:
+                    inner = self.project.GetTimelineByName(name)
+            except Exception:
+                inner = None
+            if inner:
+                inners.append(inner)
+        return inners
+
+
+def project_identity(project) -> str:
+    """Key identifying a project across scripting connections and runs."""
+    try:
+        uid = project.GetUniqueId()
+    except Exception:
+        uid = None
+    return f"proj:{uid}" if uid else f"proj-name:{project.GetName()}"
+
+
+# --- Concurrent Timeline Scan ---
+
+TIMELINE_WORKERS = 4  # Scripting connections used to walk timelines; 1 scans serially
+
+
+class TimelineScanError(Exception):
+    """A scan worker could not mirror the main connection; the caller falls back to serial."""
+
+
+class _ScanWorker:
+    __slots__ = ("handle", "counter", "project", "walker", "timelines")
+
+    def __init__(self, handle, counter, project, walker):
+        self.handle = handle
+        self.counter = counter
+        self.project = project
+        self.walker = walker
+        self.timelines = {}
+
+
+class TimelineScanPool:
+    """Walks timelines track by track on a pool of threads, each with its own connection.
+
+    Each round-trip to Resolve blocks its connection, so one shared handle would just
+    serialise the workers. `connect()` must return a Resolve handle not used by any
+    other worker (a ResolveSession lends spares; `release(handle)` returns them); every worker
+    opens the current project through it, checks that it matches `project_key`, and
+    fetches timelines by index from there. Inner timelines are memoised through forks
+    of `walker`, so a compound shared between tracks is still walked about once.
+    """
+
+    def __init__(self, connect, walker: TimelineWalker, project_key: str,
+                 workers: int = TIMELINE_WORKERS, profiler: Profiler = None, release=None):
+        self.connect = connect
+        self.release = release
+        self.walker = walker
+        self.project_key = project_key
+        self.workers = max(1, workers)
+        self.profiler = profiler
+        self.api_calls = ApiCallCounter(timed=profiler is not None)
+        self.connections = 0
+        self.units = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._workers = []
+
+    def _worker(self) -> _ScanWorker:
+        worker = getattr(self._local, "worker", None)
+        if worker is None:
+            counter = ApiCallCounter(timed=self.profiler is not None)
+            handle = self.connect()
+            if not handle:
+                raise TimelineScanError("could not open an extra scripting connection")
+            resolve = CountingProxy(handle, counter)
+            project = resolve.GetProjectManager().GetCurrentProject()
+            if not project or project_identity(project) != self.project_key:
+                raise TimelineScanError("worker connection sees a different current project")
+            worker = _ScanWorker(handle, counter, project, self.walker.fork(project))
+            self._local.worker = worker
+            with self._lock:
+                self._workers.append(worker)
+        return worker
+
+    def _timeline(self, worker, index: int, name: str):
+        tl = worker.timelines.get(index)
+        if tl is None:
+            tl = worker.project.GetTimelineByIndex(index)
+            if not tl or (name and tl.GetName() != name):
+                raise TimelineScanError(f"timeline {index} changed during the scan")
+            worker.timelines[index] = tl
+        return tl
+
+    def scan(self, timelines) -> dict:
+        """timelines: [(index, name), ...] -> {index: frozenset of used paths}."""
+        names = dict(timelines)
+        results = {index: set() for index in names}
+        workers = min(self.workers, len(names))
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                def count(index):
+                    worker = self._worker()
+                    return index, TimelineWalker.track_counts(self._timeline(worker, index, names[index]))
+
+                units = [(index, track_type, ti)
+                         for index, counts in pool.map(count, names)
+                         for track_type, n in counts
+                         for ti in range(1, n + 1)]
+                self.units = len(units)
+
+                def walk(unit):
+                    index, track_type, ti = unit
+                    worker = self._worker()
+                    tl = self._timeline(worker, index, names[index])
+                    if self.profiler is None:
+                        return index, worker.walker.paths_for_track(tl, track_type, ti)
+                    with self.profiler.stage("track", timeline=names[index], track=f"{track_type} {ti}") as span:
+                        paths = worker.walker.paths_for_track(tl, track_type, ti)
+                        span.items = len(paths)
+                    return index, paths
+
+                for index, paths in pool.map(walk, units):
+                    results[index].update(paths)
+        finally:
+            for worker in self._workers:
+                self.api_calls.merge(worker.counter)
+                self.walker.absorb(worker.walker)
+                if self.release is not None:
+                    self.release(worker.handle)
+            self.connections = len(self._workers)
+            self._workers = []
+        self.walker.timelines_walked += len(names)
+        return {index: frozenset(paths) for index, paths in results.items()}
+
+
+# --- Batched Media Pool Removal ---
+
+DELETE_BATCH_SIZE = 250
+
+
+def delete_clips_batched(media_pool, records, batch_size: int = DELETE_BATCH_SIZE, log=None) -> tuple[list, list]:
+    """Removes clip records from the Media Pool in chunks; returns (removed, failed).
+
+    A chunk that fails is bisected until the offending clips are isolated, so
+    per-clip errors are still reported without one call per clip on the happy path.
+    """
+    log = log or (lambda msg: None)
+    batch_size = max(1, int(batch_size))
+    removed, failed = [], []
+
+    def delete(chunk):
+        try:
+            ok = bool(media_pool.DeleteClips([r.clip for r in chunk]))
+        except Exception:
+            ok = False
+        if ok:
+            removed.extend(chunk)
+        elif len(chunk) == 1:
+            failed.append(chunk[0])
+        else:
+            mid = len(chunk) // 2
+            delete(chunk[:mid])
+            delete(chunk[mid:])
+
+    chunks = [records[i:i + batch_size] for i in range(0, len(records), batch_size)]
+    for n, chunk in enumerate(chunks, 1):
+        start = time.perf_counter()
+        before = len(failed)
+        delete(chunk)
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        note = f", {len(failed) - before} failed after bisection" if len(failed) > before else ""
+        log(f"INFO: Media Pool removal chunk {n}/{len(chunks)}: {len(chunk)} clips in {elapsed_ms:.0f} ms{note}")
+    return removed, failed
+
+
+# --- Concurrent File Moves ---
+
+MOVE_WORKERS = 8
+MOVE_PER_VOLUME = 4
+COPY_CHUNK_SIZE = 8 * 1024 * 1024
+COPY_PROGRESS_INTERVAL = 256 * 1024 * 1024
+
+
+class MoveExecutor:
+    """Moves files on a bounded thread pool with a per-destination-volume concurrency cap.
+
+    Same-device moves are a single rename. Cross-device moves stream a chunked copy
+    to a temporary name, verify the size, and only then unlink the source.
+    """
+
+    def __init__(self, max_workers: int = MOVE_WORKERS, per_volume: int = MOVE_PER_VOLUME,
+                 chunk_size: int = COPY_CHUNK_SIZE, progress=None):
+        self.max_workers = max(1, int(max_workers))
+        self.per_volume = max(1, int(per_volume))
+        self.chunk_size = chunk_size
+        self.progress = progress  # progress(src, copied_bytes, total_bytes), from worker threads
+        self._volume_slots = {}
+        self._lock = threading.Lock()
+        self.renamed = 0
+        self.copied = 0
+
+    def _slot_for(self, dev):
+        with self._lock:
+            sem = self._volume_slots.get(dev)
+            if sem is None:
+                sem = self._volume_slots[dev] = threading.Semaphore(self.per_volume)
+            return sem
+
+    def move_all(self, jobs: list, on_done=None) -> list:
+        """Runs (src, dst) moves; returns an (ok, error) tuple per job, in order.
+
+        on_done(index, ok, error) is called from the worker thread as each move finishes.
+        """
+        if not jobs:
+            return []
+
+        def run(indexed):
+            i, (src, dst) = indexed
+            ok, err = self.move(src, dst)
+            if on_done is not None:
+                on_done(i, ok, err)
+            return ok, err
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(jobs))) as pool:
+            return list(pool.map(run, enumerate(jobs)))
+
+    def move(self, src: str, dst: str) -> tuple[bool, str]:
+        try:
+            dest_dir = os.path.dirname(dst)
+            os.makedirs(dest_dir, exist_ok=True)
+            dest_dev = os.stat(dest_dir).st_dev
+            src_st = os.stat(src)
+            with self._slot_for(dest_dev):
+                if src_st.st_dev == dest_dev:
+                    os.replace(src, dst)
+                    with self._lock:
+                        self.renamed += 1
+                else:
+                    self._copy_then_unlink(src, dst, src_st.st_size)
+                    with self._lock:
+                        self.copied += 1
+            return True, ""
+        except Exception as e:
+            return False, str(e)
+
+    def _copy_then_unlink(self, src: str, dst: str, total: int):
+        tmp = dst + ".partial"
+        copied = 0
+        next_report = COPY_PROGRESS_INTERVAL
+        try:
+            with open(src, "rb") as fin, open(tmp, "wb") as fout:
+                while True:
+                    chunk = fin.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    fout.write(chunk)
+                    copied += len(chunk)
+                    if self.progress and copied >= next_report:
+                        self.progress(src, copied, total)
+                        next_report += COPY_PROGRESS_INTERVAL
+            shutil.copystat(src, tmp)
+            written = os.stat(tmp).st_size
+            if written != total:
+                raise OSError(f"Size mismatch after copy ({written} of {total} bytes)")
+            os.replace(tmp, dst)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        if self.progress:
+            self.progress(src, copied, total)
+        os.unlink(src)
+
+
+# --- Orphan Discovery ---
+
+MEDIA_EXTENSIONS = {
+    "video": (".mov", ".mp4", ".m4v", ".mxf", ".avi", ".mkv", ".webm", ".mpg", ".mpeg", ".mts", ".m2ts",
+              ".3gp", ".wmv", ".dv", ".braw", ".r3d", ".ari", ".crm", ".mxr"),
+    "audio": (".wav", ".bwf", ".aif", ".aiff", ".mp3", ".m4a", ".aac", ".flac", ".ogg", ".caf"),
+    "image": (".png", ".jpg", ".jpeg", ".tif", ".tiff", ".exr", ".dpx", ".cin", ".dng", ".psd", ".bmp",
+              ".gif", ".tga", ".heic", ".jp2"),
+    # "other" is never guessed from an extension; only Media Pool clips count as other
+    "other": (),
+}
+ORPHAN_CLIP_TYPES = {"video": "Video", "audio": "Audio", "image": "Still"}  # kind -> Resolve Type
+ORPHAN_WALK_WORKERS = 8
+# Folders of generated media no clip's File Path names (Resolve proxies, optimized
+# media and cache, camera proxy folders); never searched for orphans. Lower case.
+RESOLVE_MANAGED_DIRS = ("proxy", "proxies", "proxymedia", "optimizedmedia", "cacheclip")
+
+
+def media_extensions_for(include: dict) -> dict:
+    """{extension: kind} for the file kinds switched on in `include`."""
+    return {ext: kind for kind, exts in MEDIA_EXTENSIONS.items() if include.get(kind) for ext in exts}
+
+
+def format_bytes(n: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} TB"
+
+
+def collapse_roots(directories) -> list:
+    """Absolute, de-duplicated roots with any directory inside another root dropped."""
+    kept = set()
+    for d in sorted({os.path.normpath(os.path.abspath(d)) for d in directories if d}, key=len):
+        p = d
+        while p not in kept:
+            head = os.path.dirname(p)
+            if head == p:
+                kept.add(d)
+                break
+            p = head
+    return sorted(kept)
+
+
+def is_broad_root(path: str) -> bool:
+    """True for a drive or volume root or the user's home folder; never searched for orphans."""
+    path = os.path.normpath(os.path.abspath(path))
+    home = os.path.normpath(os.path.expanduser("~"))
+    return (os.path.dirname(path) == path or os.path.ismount(path)
+            or os.path.normcase(path) == os.path.normcase(home))
+
+
+def walk_media_files(roots, extensions: dict, skip_dir_names=(), exclude=None,
+                     workers: int = ORPHAN_WALK_WORKERS, on_error=None, recursive: bool = True):
+    """Walks roots in parallel with os.scandir, yielding (path, size, kind) per media file.
+
+    Each directory is one task; subdirectories are queued as listings come back, so
+    wide trees keep every worker busy. Hidden entries, symlinked directories and
+    directories named in skip_dir_names (e.g. the move folder; compared ignoring
+    case) are not entered. With recursive=False only the roots themselves are listed.
+    Files for which exclude(directory, name) is true are skipped before any stat.
+    on_error(directory, exc) is called for unreadable directories.
+    """
+    skip_dir_names = {name.lower() for name in skip_dir_names}
+
+    def scan(directory):
+        found, subdirs = [], []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.name.startswith("."):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name.lower() not in skip_dir_names:
+                                subdirs.append(entry.path)
+                        elif entry.is_file():
+                            kind = extensions.get(os.path.splitext(entry.name)[1].lower())
+                            if kind and not (exclude and exclude(directory, entry.name)):
+                                found.append((entry.path, entry.stat().st_size, kind))
+                    except OSError:
+                        continue
+        except OSError as e:
+            if on_error is not None:
+                on_error(directory, e)
+        return found, subdirs
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        pending = {pool.submit(scan, root) for root in roots}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                found, subdirs = future.result()
+                if recursive:
+                    pending.update(pool.submit(scan, d) for d in subdirs)
+                yield from found
+
+
+# --- Duplicate Detection ---
+
+HASH_BLOCK = 1 << 16  # Bytes read from each end of a file for the partial hash
+HASH_WORKERS = min(8, os.cpu_count() or 4)
+HASH_QUERY_CHUNK = 500
+
+
+def hash_file(path: str, size: int, partial: bool):
+    """Hex digest of a file's head and tail blocks (partial) or its whole content.
+
+    Files no larger than two blocks are read in full either way. Full hashes go
+    through mmap, so large files are hashed without copying them into Python.
+    Returns None if the file can't be read.
+    """
+    h = hashlib.blake2b(digest_size=20)
+    try:
+        with open(path, "rb") as f:
+            if partial or size <= 2 * HASH_BLOCK:
+                h.update(f.read(HASH_BLOCK))
+                if size > HASH_BLOCK:
+                    f.seek(max(HASH_BLOCK, size - HASH_BLOCK))
+                    h.update(f.read(HASH_BLOCK))
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                    h.update(m)
+    except (OSError, ValueError):
+        return None
+    return h.hexdigest()
+
+
+def _process_hashing_available() -> bool:
+    # Worker processes re-run this script, which only works from a plain Python
+    # interpreter running it as __main__ (inside Resolve, sys.executable is Resolve)
+    exe = os.path.basename(getattr(sys, "executable", "") or "").lower()
+    return __name__ == "__main__" and exe.startswith("python")
+
+
+class DuplicateFinder:
+    """Finds files with identical content: by size, then head/tail hash, then full hash.
+
+    Each stage only looks at files still colliding after the previous one. Hashes
+    run in a process pool when possible and in threads otherwise (hashlib releases
+    the GIL). With a ScanCacheDB, digests are reused while path, size and mtime
+    are unchanged, so repeat runs only hash new or modified files.
+    """
+
+    def __init__(self, db=None, workers: int = HASH_WORKERS, processes: bool = None, log=None):
+        self.db = db
+        self.workers = max(1, workers)
+        self.processes = _process_hashing_available() if processes is None else processes
+        self.log = log or (lambda msg: None)
+        self.partial_hashed = self.full_hashed = self.cache_hits = 0
+
+    def find(self, files: dict) -> list:
+        """{path: os.stat_result} -> [(size, digest, [paths])], largest reclaimable first."""
+        by_size = {}
+        for path, st in files.items():
+            if st is not None and st.st_size > 0:
+                by_size.setdefault(st.st_size, []).append(path)
+        candidates = {p: files[p] for paths in by_size.values() if len(paths) > 1 for p in paths}
+        if not candidates:
+            return []
+        cached = self.db.get_hashes(candidates) if self.db is not None else {}
+        known = {}
+        for path, st in candidates.items():
+            row = cached.get(path)
+            if row is not None and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+                known[path] = [row[2], row[3]]
+            else:
+                known[path] = [None, None]
+
+        partial_groups = self._group(by_size, candidates, known, 0)
+        groups = []
+        for (size, partial), paths in partial_groups.items():
+            if size <= 2 * HASH_BLOCK:
+                # The partial hash already covered the whole file
+                groups.append((size, partial, sorted(paths)))
+                continue
+            for (_, full), same in self._group({size: paths}, candidates, known, 1).items():
+                groups.append((size, full, sorted(same)))
+
+        if self.db is not None:
+            self.db.put_hashes([(p, candidates[p].st_size, candidates[p].st_mtime_ns, *known[p]) for p in known])
+        groups.sort(key=lambda g: g[0] * (len(g[2]) - 1), reverse=True)
+        return groups
+
+    def _group(self, by_size: dict, stats: dict, known: dict, stage: int) -> dict:
+        """{(size, digest): [paths]} for colliding sizes at stage 0 (partial) or 1 (full)."""
+        jobs = [(p, size) for size, paths in by_size.items() if len(paths) > 1 for p in paths
+                if known[p][stage] is None]
+        self.cache_hits += sum(1 for size, paths in by_size.items() if len(paths) > 1
+                               for p in paths if known[p][stage] is not None)
+        for (path, _), digest in zip(jobs, self._hash_all(jobs, stage == 0)):
+            known[path][stage] = digest
+        if stage == 0:
+            self.partial_hashed += len(jobs)
+        else:
+            self.full_hashed += len(jobs)
+        grouped = {}
+        for size, paths in by_size.items():
+            for p in paths:
+                if known[p][stage] is not None:
+                    grouped.setdefault((size, known[p][stage]), []).append(p)
+        return {key: paths for key, paths in grouped.items() if len(paths) > 1}
+
+    def _hash_all(self, jobs, partial: bool) -> list:
+        if not jobs:
+            return []
+        paths = [p for p, _ in jobs]
+        sizes = [size for _, size in jobs]
+        flags = [partial] * len(jobs)
+        if self.processes and len(jobs) > 1:
+            try:
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+                # spawn, not fork: the scan runs alongside other threads (GUI, Resolve IPC)
+                with ProcessPoolExecutor(max_workers=min(self.workers, len(jobs)),
+                                         mp_context=multiprocessing.get_context("spawn")) as pool:
+                    return list(pool.map(hash_file, paths, sizes, flags,
+                                         chunksize=max(1, len(jobs) // (self.workers * 4))))
+            except Exception as e:
+                self.log(f"WARNING: Hashing in worker processes unavailable ({e}); using threads.")
+                self.processes = False
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(jobs))) as pool:
+            return list(pool.map(hash_file, paths, sizes, flags))
+
+
+# --- Reclaimable Space Report ---
+
+SPACE_GROUPS = (  # (report key, title)
+    ("type", "File type"),
+    ("volume", "Volume"),
+    ("bin", "Media Pool bin"),
+    ("directory", "Folder"),
 )
+SPACE_REPORT_TOP = 50  # Rows per group in the GUI table and the log
+NOT_IN_POOL = "(not in Media Pool)"
+
+
+class SpaceReport:
+    """Reclaimable bytes and file counts per file type, volume, Media Pool bin and folder.
+
+    Fed with sizes the scan already has, so building it never touches the
+    filesystem beyond one mount-point lookup per new folder.
+    """
+
+    def __init__(self):
+        self.totals = {group: {} for group, _ in SPACE_GROUPS}
+        self.bytes = 0
+        self.files = 0
+        self._volumes = {}
+
+    def add(self, path: str, size: int, kind: str, bin_path: str = NOT_IN_POOL, files: int = 1):
+        self.bytes += size
+        self.files += files
+        directory = os.path.dirname(path)
+        for group, key in (("type", kind), ("volume", self._volume(directory)),
+                           ("bin", bin_path), ("directory", directory)):
+            entry = self.totals[group].get(key)
+            if entry is None:
+                self.totals[group][key] = [size, files]
+            else:
+                entry[0] += size
+                entry[1] += files
+
+    def _volume(self, directory: str) -> str:
+        if IS_WINDOWS:
+            return os.path.splitdrive(directory)[0] or directory
+        walked = []
+        d = directory
+        while d not in self._volumes:
+            walked.append(d)
+            parent = os.path.dirname(d)
+            if parent == d or os.path.ismount(d):
+                self._volumes[d] = d
+                break
+            d = parent
+        volume = self._volumes[d]
+        for w in walked:
+            self._volumes[w] = volume
+        return volume
+
+    def to_dict(self) -> dict:
+        """JSON-ready totals; every group sorted by bytes, largest first."""
+        out = {"bytes": self.bytes, "files": self.files}
+        for group, _ in SPACE_GROUPS:
+            rows = sorted(self.totals[group].items(), key=lambda kv: kv[1][0], reverse=True)
+            out[f"by_{group}"] = [{"key": key, "bytes": b, "files": n} for key, (b, n) in rows]
+        return out
+
+
+def write_space_report(reclaimable: dict, path: str):
+    """Writes a report's "reclaimable" section as CSV (for a .csv path) or JSON."""
+    if path.lower().endswith(".csv"):
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            import csv
+            writer = csv.writer(f)
+            writer.writerow(["group", "key", "bytes", "files"])
+            for group, _ in SPACE_GROUPS:
+                for row in reclaimable.get(f"by_{group}", ()):
+                    writer.writerow([group, row["key"], row["bytes"], row["files"]])
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(reclaimable, f, indent=2)
+
+
+# --- Project Database Sweep ---
+
+def list_database_projects(pm, folder_path=(), recursive: bool = True) -> list:
+    """Lists (folder_path, project_name) pairs in the Project Manager database.
+
+    folder_path is a tuple of folder names below the database root.
+    """
+    results = []
+    pm.GotoRootFolder()
+    for part in folder_path:
+        if not pm.OpenFolder(part):
+            return results
+
+    def visit(path):
+        for name in pm.GetProjectListInCurrentFolder() or []:
+            results.append((path, name))
+        if not recursive:
+            return
+        for sub in pm.GetFolderListInCurrentFolder() or []:
+            if pm.OpenFolder(sub):
+                visit(path + (sub,))
+                pm.GotoParentFolder()
+
+    visit(tuple(folder_path))
+    return results
+
+
+def open_database_project(pm, folder_path, name):
+    pm.GotoRootFolder()
+    for part in folder_path:
+        if not pm.OpenFolder(part):
+            return None
+    return pm.LoadProject(name)
+
+
+def timeline_fingerprint(timeline) -> tuple:
+    """Cheap change signature: unique ID, start/end frame and item count per track."""
+    parts = [_unique_key(timeline, "tl")]
+    for getter in ("GetStartFrame", "GetEndFrame"):
+        try:
+            parts.append(getattr(timeline, getter)())
+        except Exception:
+            parts.append(None)
+    for track_type in ("video", "audio"):
+        try:
+            track_count = timeline.GetTrackCount(track_type) or 0
+        except Exception:
+            track_count = 0
+        counts = []
+        for ti in range(1, track_count + 1):
+            try:
+                counts.append(len(timeline.GetItemsInTrack(track_type, ti) or {}))
+            except Exception:
+                counts.append(-1)
+        parts.append(tuple(counts))
+    return tuple(parts)
+
+
+def media_pool_fingerprint(root_folder) -> tuple:
+    """Folder names and clip counts in walk order; no per-clip calls."""
+    parts = []
+    stack = [root_folder]
+    while stack:
+        folder = stack.pop()
+        try:
+            name = folder.GetName()
+        except Exception:
+            name = ""
+        try:
+            count = len(folder.GetClips() or {})
+        except Exception:
+            count = -1
+        parts.append((name, count))
+        try:
+            stack.extend(reversed(list((folder.GetSubFolders() or {}).values())))
+        except Exception:
+            pass
+    return tuple(parts)
+
+
+class ProjectScan:
+    """Result of scanning one project: its used-path set and the detached records of
+    file clips that may be unused or missing (everything else was dropped mid-scan)."""
+    __slots__ = ("name", "used_paths", "records", "cached", "clip_count", "pool_paths", "pool_files", "bins")
+
+    def __init__(self, name: str, used_paths: PathStore, records: list, cached: bool = False,
+                 clip_count: int = 0, pool_paths: PathStore = None, pool_files: set = None, bins: list = None):
+        self.name = name
+        self.used_paths = used_paths
+        self.records = records
+        self.cached = cached
+        self.clip_count = clip_count
+        # Every file clip path in the Media Pool; only collected for orphan discovery
+        self.pool_paths = pool_paths
+        # The same paths as spelled by Resolve; only collected for duplicate detection
+        self.pool_files = pool_files
+        # Bin path per Media Pool folder; records index it with rec.folder
+        self.bins = bins or []
+
+
+class ProjectScanCache:
+    """Keeps ProjectScan results per project, valid while the project fingerprint matches.
+
+    Held in memory by the GUI for its session, so only repeat scans in one window
+    reuse a project's results; only dry runs without a plan reuse them at all.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def get(self, key, fingerprint):
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != fingerprint:
+            return None
+        return entry[1]
+
+    def put(self, key, fingerprint, scan: ProjectScan):
+        self._entries[key] = (fingerprint, scan)
+
+
+# --- Persistent Scan Cache ---
+
+def config_dir() -> str:
+    """Per-user directory for the tool's caches, logs and journals."""
+    if IS_WINDOWS:
+        base = os.environ.get("APPDATA") or os.path.expanduser("~")
+        return os.path.join(base, "DRMediaCleaner")
+    if IS_MAC:
+        return os.path.join(os.path.expanduser("~"), "Library", "Application Support", "DRMediaCleaner")
+    base = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+    return os.path.join(base, "drmediacleaner")
+
+
+def fingerprint_digest(value) -> str:
+    return hashlib.sha1(repr(value).encode("utf-8")).hexdigest()
+
+
+class ScanCacheDB:
+    """On-disk cache of per-timeline used-path sets and per-folder Media Pool snapshots.
+
+    Each row carries a cheap fingerprint; a row is only reused while the live
+    timeline or folder still produces the same fingerprint. Content hashes for
+    duplicate detection are kept per file path with the size and mtime they
+    were computed for.
+    """
+
+    SCHEMA_VERSION = 1
+
+    def __init__(self, path: str = None):
+        self.path = path or os.path.join(config_dir(), "scan_cache.sqlite3")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        import sqlite3
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != self.SCHEMA_VERSION:
+            self.conn.executescript("""
+                DROP TABLE IF EXISTS timelines;
+                DROP TABLE IF EXISTS folders;
+            """)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS timelines (
+                project TEXT, timeline TEXT, fingerprint TEXT, paths TEXT,
+                PRIMARY KEY (project, timeline));
+            CREATE TABLE IF NOT EXISTS folders (
+                project TEXT, folder TEXT, fingerprint TEXT, records TEXT,
+                PRIMARY KEY (project, folder));
+            CREATE TABLE IF NOT EXISTS file_hashes (
+                path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, partial TEXT, full TEXT);
+        """)
+        self.conn.execute(f"PRAGMA user_version={self.SCHEMA_VERSION}")
+        self.timeline_hits = self.timeline_misses = 0
+        self.folder_hits = self.folder_misses = 0
+
+    def get_timeline(self, project: str, timeline: str, fingerprint: str):
+        row = self.conn.execute("SELECT fingerprint, paths FROM timelines WHERE project=? AND timeline=?",
+                                (project, timeline)).fetchone()
+        if row is None or row[0] != fingerprint:
+            self.timeline_misses += 1
+            return None
+        self.timeline_hits += 1
+        return frozenset(json.loads(row[1]))
+
+    def put_timeline(self, project: str, timeline: str, fingerprint: str, paths):
+        self.conn.execute("INSERT OR REPLACE INTO timelines VALUES (?, ?, ?, ?)",
+                          (project, timeline, fingerprint, json.dumps(sorted(paths))))
+
+    def get_folder(self, project: str, folder: str, fingerprint: str):
+        row = self.conn.execute("SELECT fingerprint, records FROM folders WHERE project=? AND folder=?",
+                                (project, folder)).fetchone()
+        if row is None or row[0] != fingerprint:
+            self.folder_misses += 1
+            return None
+        self.folder_hits += 1
+        return json.loads(row[1])
+
+    def put_folder(self, project: str, folder: str, fingerprint: str, rows):
+        self.conn.execute("INSERT OR REPLACE INTO folders VALUES (?, ?, ?, ?)",
+                          (project, folder, fingerprint, json.dumps(rows)))
+
+    def get_hashes(self, paths) -> dict:
+        """{path: (size, mtime_ns, partial digest, full digest)} for the cached paths."""
+        paths = list(paths)
+        found = {}
+        for i in range(0, len(paths), HASH_QUERY_CHUNK):
+            chunk = paths[i:i + HASH_QUERY_CHUNK]
+            rows = self.conn.execute(
+                f"SELECT path, size, mtime_ns, partial, full FROM file_hashes "
+                f"WHERE path IN ({','.join('?' * len(chunk))})", chunk)
+            for path, *row in rows:
+                found[path] = tuple(row)
+        return found
+
+    def put_hashes(self, rows):
+        """rows of (path, size, mtime_ns, partial digest, full digest)."""
+        self.conn.executemany("INSERT OR REPLACE INTO file_hashes VALUES (?, ?, ?, ?, ?)", rows)
+
+    def prune_timelines(self, project: str, keep):
+        keep = set(keep)
+        stale = [t for (t,) in self.conn.execute("SELECT timeline FROM timelines WHERE project=?", (project,))
+                 if t not in keep]
+        self.conn.executemany("DELETE FROM timelines WHERE project=? AND timeline=?",
+                              [(project, t) for t in stale])
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        try:
+            self.conn.commit()
+        finally:
+            self.conn.close()
+
+
+# --- Cleanup Journal ---
+
+JOURNAL_VERSION = 1
+JOURNAL_SYNC_EVERY = 256     # Records written between fsyncs
+JOURNAL_SYNC_SECONDS = 1.0   # ...or this long, whichever comes first
+IMPORT_BATCH_SIZE = 200      # Paths per ImportMedia call when undoing
+
+
+def journal_dir() -> str:
+    return os.path.join(config_dir(), "journals")
+
+
+def _journal_order(name: str) -> tuple:
+    # run-YYYYMMDD-HHMMSS.jsonl, then -2, -3... for later runs started in the same second
+    stem = name[:-len(".jsonl")]
+    if stem.count("-") == 3:
+        stem, _, n = stem.rpartition("-")
+        return stem, int(n) if n.isdigit() else 0
+    return stem, 1
+
+
+def latest_journal():
+    """Path of the most recent cleanup journal, or None."""
+    try:
+        names = [n for n in os.listdir(journal_dir()) if n.endswith(".jsonl")]
+    except OSError:
+        return None
+    return os.path.join(journal_dir(), max(names, key=_journal_order)) if names else None
+
+
+class CleanupJournal:
+    """Append-only JSON Lines record of one cleanup.
+
+    Record types (the "op" field):
+      begin    action, move folder name and project of the run
+      plan     one per clip or orphan file: n, kind ("file" or "offline"), clip path,
+               size, [source, destination] per file (no destination for trash) and the
+               Media Pool identity of every clip that refers to it
+      done     n, ok, error: all files of plan n were handled
+      removed  n, project, uid: that clip left the Media Pool
+      undone   n, ok: files of plan n were moved back
+      end      the run's summary
+    Lines are flushed and fsync'ed in batches; plans are synced before any file is touched.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+
+    @classmethod
+    def create(cls, action: str, project, folder_name: str, sweep: bool = False) -> "CleanupJournal":
+        os.makedirs(journal_dir(), exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(journal_dir(), f"run-{stamp}.jsonl")
+        n = 1
+        while os.path.exists(path):
+            n += 1
+            path = os.path.join(journal_dir(), f"run-{stamp}-{n}.jsonl")
+        journal = cls(path)
+        journal.write({"op": "begin", "version": JOURNAL_VERSION, "action": action, "folder_name": folder_name,
+                       "project": project, "sweep": sweep, "time": time.strftime("%Y-%m-%dT%H:%M:%S")})
+        journal.sync()
+        return journal
+
+    def write(self, record: dict):
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._unsynced += 1
+            if self._unsynced >= JOURNAL_SYNC_EVERY or time.monotonic() - self._synced_at >= JOURNAL_SYNC_SECONDS:
+                self._sync()
+
+    def sync(self):
+        with self._lock:
+            self._sync()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            try:
+                self._sync()
+            finally:
+                self._file.close()
+
+
+class JournalState:
+    """A journal read back: the begin record plus plans and outcomes keyed by plan number."""
+    __slots__ = ("path", "begin", "plans", "done", "removed", "undone", "ended")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.begin = {}
+        self.plans = {}
+        self.done = {}
+        self.removed = set()  # (project, uid)
+        self.undone = set()
+        self.ended = False
+
+    @property
+    def action(self) -> str:
+        return self.begin.get("action", "")
+
+
+def read_journal(path: str) -> JournalState:
+    """Parses a journal; a torn last line (crash mid-write) is ignored."""
+    state = JournalState(path)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            op = record.get("op")
+            if op == "begin":
+                state.begin = record
+            elif op == "plan":
+                state.plans[record["n"]] = record
+            elif op == "done":
+                state.done[record["n"]] = record.get("ok", False)
+            elif op == "removed":
+                state.removed.add((record.get("project"), record.get("uid")))
+            elif op == "undone":
+                if record.get("ok"):
+                    state.undone.add(record["n"])
+            elif op == "end":
+                state.ended = True
+    if state.begin.get("version", JOURNAL_VERSION) > JOURNAL_VERSION:
+        raise ValueError(f"Journal was written by a newer version of this tool: {path}")
+    return state
+
+
+class _PlanProgress:
+    """Journals one record per plan once the last of its files has finished.
+
+    `owner[i]` is the plan (index into plan_ids) of the i-th file job; file_done()
+    is safe to call from worker threads.
+    """
+
+    def __init__(self, journal: CleanupJournal, op: str, plan_ids: list, owner: list):
+        self.journal = journal
+        self.op = op
+        self.plan_ids = plan_ids
+        self.owner = owner
+        self.remaining = [0] * len(plan_ids)
+        for k in owner:
+            self.remaining[k] += 1
+        self.first_error = [None] * len(plan_ids)
+        self._lock = threading.Lock()
+
+    def file_done(self, i: int, ok: bool, err: str):
+        k = self.owner[i]
+        with self._lock:
+            if not ok and self.first_error[k] is None:
+                self.first_error[k] = err or "failed"
+            self.remaining[k] -= 1
+            finished = self.remaining[k] == 0
+        if finished:
+            record = {"op": self.op, "n": self.plan_ids[k], "ok": self.first_error[k] is None}
+            if self.first_error[k]:
+                record["error"] = self.first_error[k]
+            self.journal.write(record)
+
+    def ok(self, k: int) -> bool:
+        return self.first_error[k] is None
+
+
+def import_item(path: str, files=()):
+    """ImportMedia argument for a clip path: the path itself, or a frame-range dict for a sequence."""
+    pattern = parse_sequence(path)
+    if pattern is None or path in files:
+        return path
+    frames = [pattern.frame(os.path.basename(f)) for f in files]
+    frames = [n for n in frames if n is not None]
+    if not frames:
+        return pattern.printf_path()
+    return {"FilePath": pattern.printf_path(), "StartIndex": min(frames), "EndIndex": max(frames)}
+
+
+def find_bin(media_pool, root_folder, bin_path: str):
+    """Folder for a "Master/Sub/Day 1" bin path; missing bins are re-created where possible."""
+    folder = root_folder
+    for part in [p for p in bin_path.split("/")[1:] if p]:
+        try:
+            subs = folder.GetSubFolders() or {}
+            nxt = next((sf for sf in subs.values() if sf.GetName() == part), None)
+            if nxt is None:
+                nxt = media_pool.AddSubFolder(folder, part)
+        except Exception:
+            nxt = None
+        if not nxt:
+            break
+        folder = nxt
+    return folder
+
+
+# --- Cleanup Plans ---
+
+PLAN_FORMAT = "drmediacleaner-plan"
+PLAN_VERSION = 1
+
+
+def default_plan_path() -> str:
+    """Where the GUI keeps the plan of its last dry run."""
+    return os.path.join(config_dir(), "last-plan.json")
+
+
+def write_json_atomic(value, path: str):
+    """Writes JSON through a temporary file, so readers never see half a file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(value, f, indent=2)
+    os.replace(tmp, path)
+
+
+def write_plan(plan: dict, path: str):
+    """Writes a plan atomically, so an interrupted write never leaves half a plan to apply."""
+    write_json_atomic(plan, path)
+
+
+def read_plan(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        plan = json.load(f)
+    if not isinstance(plan, dict) or plan.get("format") != PLAN_FORMAT:
+        raise ValueError(f"Not a cleanup plan: {path}")
+    if plan.get("version", 0) > PLAN_VERSION:
+        raise ValueError(f"Plan was written by a newer version of this tool: {path}")
+    return plan
+
+
+# --- Scan & Clean Engine ---
+
+ACTION_MOVE = "move"
+ACTION_TRASH = "trash"
+FILE_KINDS = ("video", "audio", "image", "other")
+STREAM_CHUNK_SIZE = 10000 # Media Pool clips settled per batch of existence checks
+SCAN_FULL = "full"        # Walk every timeline
+SCAN_FAST = "fast"        # Trust Usage; verify only clips that would be deleted
+
+
+class ResolveConnectionError(Exception):
+    """Raised when the scripting API cannot reach a running DaVinci Resolve."""
+
+
+def peak_memory_mb():
+    """Peak resident memory of this process in MiB, or None where it can't be read."""
+    try:
+        if IS_WINDOWS:
+            import ctypes
+
+            class ProcessMemoryCounters(ctypes.Structure):
+                _fields_ = [("cb", ctypes.c_ulong), ("PageFaultCount", ctypes.c_ulong)] + [
+                    (name, ctypes.c_size_t) for name in (
+                        "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage",
+                        "QuotaPagedPoolUsage", "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage",
+                        "PagefileUsage", "PeakPagefileUsage")]
+            counters = ProcessMemoryCounters()
+            counters.cb = ctypes.sizeof(counters)
+            kernel32 = ctypes.windll.kernel32
+            kernel32.GetCurrentProcess.restype = ctypes.c_void_p
+            psapi = ctypes.windll.psapi
+            psapi.GetProcessMemoryInfo.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_ulong]
+            if not psapi.GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+                return None
+            return counters.PeakWorkingSetSize / (1024 * 1024)
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS, KiB elsewhere
+        return peak / (1024 * 1024) if IS_MAC else peak / 1024
+    except Exception:
+        return None
+
+
+def connect_resolve():
+    """Opens a new scripting handle to the running Resolve (None if it is not reachable)."""
+    global DaVinciResolveScript
+    if DaVinciResolveScript is None:
+        try:
+            import DaVinciResolveScript as module
+        except Exception:
+            raise ResolveConnectionError(
+                "Could not import DaVinciResolveScript. Check scripting module path or ensure Resolve is installed.")
+        DaVinciResolveScript = module
+    return DaVinciResolveScript.scriptapp("Resolve")
+
+
+SESSION_IDLE_HANDLES = 8  # Spare timeline-scan connections kept between scans
+
+
+class ResolveSession:
+    """Scripting connections kept across scans, so a re-scan skips the connection setup.
+
+    handle() returns the main handle after a liveness check (one GetProjectManager
+    round-trip) and reconnects if Resolve dropped it. Extra handles for the
+    concurrent timeline scan are lent with checkout() and returned with checkin().
+    Projects are always fetched fresh; on a project switch the spare handles are
+    dropped so timeline workers reconnect against the new project.
+    """
+
+    def __init__(self, connect=None, resolve=None):
+        self._connect = connect or connect_resolve
+        self._resolve = resolve
+        self._idle = []
+        self._lock = threading.Lock()
+        self.project_key = None
+        self.connects = 0
+        self.reuses = 0
+
+    @staticmethod
+    def _alive(handle) -> bool:
+        try:
+            return bool(handle.GetProjectManager())
+        except Exception:
+            return False
+
+    def _open(self):
+        handle = self._connect()
+        if handle:
+            with self._lock:
+                self.connects += 1
+        return handle
+
+    def handle(self):
+        """The main Resolve handle, or None if Resolve can't be reached."""
+        if self._resolve is not None and self._alive(self._resolve):
+            self.reuses += 1
+            return self._resolve
+        self._resolve = self._open()
+        return self._resolve
+
+    def checkout(self):
+        """A handle for one timeline-scan worker: a live spare if there is one, else a new connection."""
+        while True:
+            with self._lock:
+                handle = self._idle.pop() if self._idle else None
+            if handle is None:
+                return self._open()
+            if self._alive(handle):
+                with self._lock:
+                    self.reuses += 1
+                return handle
+
+    def checkin(self, handle):
+        with self._lock:
+            if handle and len(self._idle) < SESSION_IDLE_HANDLES:
+                self._idle.append(handle)
+
+    def note_project(self, key: str) -> bool:
+        """Records the project being scanned; True if it differs from the previous scan's."""
+        switched = self.project_key is not None and key != self.project_key
+        if switched:
+            with self._lock:
+                self._idle.clear()
+        self.project_key = key
+        return switched
+
+
+class ScanOptions:
+    """Everything a scan-and-clean run needs from the user, independent of any UI."""
+
+    def __init__(self, dry_run: bool = False, action: str = ACTION_TRASH, folder_name: str = "Unused",
+                 include=None, delete_batch_size: int = DELETE_BATCH_SIZE,
+                 trash_batch_size: int = TRASH_BATCH_SIZE, move_workers: int = MOVE_WORKERS,
+                 move_per_volume: int = MOVE_PER_VOLUME, use_cache: bool = True,
+                 cache_path: str = None, timeline_workers: int = TIMELINE_WORKERS,
+                 find_orphans: bool = False, orphan_roots=(), find_duplicates: bool = False,
+                 plan_path: str = None, profile_path: str = None, trace_path: str = None,
+                 strategy: str = SCAN_FULL):
+        self.dry_run = bool(dry_run)
+        self.action = action
+        self.folder_name = (folder_name or "").strip()
+        self.include = dict(include) if include is not None else {k: True for k in FILE_KINDS}
+        self.delete_batch_size = delete_batch_size
+        self.trash_batch_size = trash_batch_size
+        self.move_workers = move_workers
+        self.move_per_volume = move_per_volume
+        self.use_cache = bool(use_cache)
+        self.cache_path = cache_path
+        self.timeline_workers = timeline_workers
+        self.find_orphans = bool(find_orphans)
+        # Searched instead of the Media Pool's own folders when given
+        self.orphan_roots = tuple(r for r in orphan_roots or () if r)
+        self.find_duplicates = bool(find_duplicates)
+        # Findings are written here as a plan file for apply()
+        self.plan_path = plan_path
+        # Stage timings and per-method API latencies; profiling is off unless one is set
+        self.profile_path = profile_path
+        self.trace_path = trace_path
+        self.strategy = strategy
+
+    @property
+    def profile(self) -> bool:
+        return bool(self.profile_path or self.trace_path)
+
+    def to_dict(self) -> dict:
+        return {
+            "dry_run": self.dry_run,
+            "action": self.action,
+            "folder_name": self.folder_name,
+            "include": dict(self.include),
+            "use_cache": self.use_cache,
+            "find_orphans": self.find_orphans,
+            "orphan_roots": list(self.orphan_roots),
+            "find_duplicates": self.find_duplicates,
+            "strategy": self.strategy,
+        }
+
+
+class CleanerEngine:
+    """The scan-and-clean pipeline, free of any Tk dependency.
+
+    `log(msg)` receives progress lines and `confirm(title, message)` gates the
+    destructive phase; without one, every destructive step is refused. run()
+    returns a JSON-serialisable report. `connect()` opens a new Resolve handle;
+    the concurrent timeline scan calls it once per worker.
+    Pass a long-lived `session` to reuse connections across engines (the GUI does).
+    """
+
+    def __init__(self, options: ScanOptions, log=None, confirm=None, resolve=None,
+                 scan_cache: ProjectScanCache = None, log_list=None, connect=None,
+                 session: ResolveSession = None):
+        self.options = options
+        self.session = session or ResolveSession(connect, resolve)
+        self.log = log or (lambda msg: None)
+        self.log_list = log_list or self._log_list_lines
+        self.confirm = confirm or (lambda title, message: False)
+        self.scan_cache = scan_cache
+        self.cache_db = None
+
+        # Resolve handles
+        self.resolve = None
+        self.project = None
+        self.media_pool = None
+        self.api_calls = None
+        self.walker = None
+        self.index = None
+        self.stat_cache = None
+        self._folders = None
+        self._bins = None
+        self._pool_usage = 0
+        self.strategy = None
+        self.sizes = {}
+        self.journal = None
+        self._journal_ids = {}
+        self._journal_project = None
+        self.profiler = Profiler() if options.profile else None
+
+    def _stage(self, name: str, **args):
+        """Context manager timing one stage; a shared no-op when profiling is off."""
+        if self.profiler is None:
+            return _NO_PROFILE
+        return self.profiler.stage(name, **args)
+
+    @profiled("compounds", items=len)
+    def _discover_compound_children(self, mpi, props=None):
+        try:
+            found = set(self.walker.paths_for_item(mpi, props, all_sources=True))
+        except Exception:
+            found = set()
+        try:
+            for prop in ("Children", "ChildClips", "Clips"):
+                try:
+                    val = props.get(prop) if props is not None else mpi.GetClipProperty(prop)
+                except Exception:
+                    val = None
+                if not val:
+                    continue
+                if isinstance(val, str):
+                    parts = [p.strip() for p in val.replace(";", ",").split(",") if p.strip()]
+                    for p in parts:
+                        if self.stat_cache.exists(p):
+                            found.add(os.path.normpath(p))
+                elif isinstance(val, (list, tuple, set)):
+                    for el in val:
+                        try:
+                            if hasattr(el, "GetClipProperty"):
+                                fp = el.GetClipProperty("File Path")
+                                if fp:
+                                    found.add(os.path.normpath(fp))
+                            elif isinstance(el, str) and self.stat_cache.exists(el):
+                                found.add(os.path.normpath(el))
+                        except Exception:
+                            pass
+        except Exception:
+            pass
+        try:
+            if hasattr(mpi, "GetMetadata"):
+                md = mpi.GetMetadata() or {}
+                for k, v in md.items():
+                    if isinstance(v, str) and self.stat_cache.exists(v):
+                        found.add(os.path.normpath(v))
+        except Exception:
+            pass
+        return found
+
+    def _new_report(self) -> dict:
+        return {
+            "version": APP_VERSION,
+            "status": "error",
+            "project": None,
+            "options": self.options.to_dict(),
+            "unused": [],
+            "missing": [],
+            "orphans": [],
+            "duplicates": [],
+            "reclaimable": None,
+            "summary": None,
+        }
+
+    def _connect(self):
+        """Connects (through the call-counting proxy) and returns the ProjectManager."""
+        self.log("INFO: Checking DaVinci Resolve scripting preferences...")
+        self.api_calls = ApiCallCounter(timed=self.profiler is not None)
+        with self._stage("connect"):
+            resolve = self.session.handle()
+        if not resolve:
+            raise ResolveConnectionError(
+                "Could not connect to DaVinci Resolve. Ensure Resolve is running and External Scripting enabled.")
+        self.resolve = CountingProxy(resolve, self.api_calls)
+        self.stat_cache = StatCache()
+        if self.options.use_cache and self.cache_db is None:
+            try:
+                self.cache_db = ScanCacheDB(self.options.cache_path)
+            except Exception as e:
+                self.log(f"WARNING: Scan cache unavailable, scanning everything: {e}")
+        return self.resolve.GetProjectManager()
+
+    def _project_key(self) -> str:
+        return project_identity(self.project)
+
+    def _acts_on_results(self) -> bool:
+        """True when this run's findings get moved or deleted, now or by a later apply."""
+        return not self.options.dry_run or bool(self.options.plan_path)
+
+    def _list_timelines(self) -> list:
+        timelines = []
+        idx = 1
+        while True:
+            tl = self.project.GetTimelineByIndex(idx)
+            if not tl:
+                break
+            try:
+                name = tl.GetName()
+            except Exception:
+                name = ""
+            timelines.append((tl, name))
+            idx += 1
+        return timelines
+
+    @profiled("scan", items=lambda scan: scan.clip_count)
+    def _scan_project(self, cache_key=None) -> ProjectScan:
+        """Timeline walk, then one streaming Media Pool pass; returns the used set and candidates.
+
+        Clips are classified as the Media Pool walk yields them: used, online clips are
+        dropped on the spot and only possible unused/missing clips are kept, as compact
+        records without scripting proxies.
+        """
+        self.media_pool = self.project.GetMediaPool()
+        root_folder = self.media_pool.GetRootFolder()
+        project_name = self.project.GetName()
+        timelines = self._list_timelines()
+        self._folders = None
+
+        fingerprint = None
+        if self.scan_cache is not None and cache_key is not None:
+            fingerprint = (self.options.strategy, media_pool_fingerprint(root_folder),
+                           tuple(timeline_fingerprint(tl) for tl, _ in timelines))
+            cached = self.scan_cache.get(cache_key, fingerprint)
+            if cached is not None and self._acts_on_results():
+                # The fingerprint only counts items, so a swapped clip goes unnoticed;
+                # anything that will be moved or deleted comes from a fresh scan
+                self.log(f"INFO: Project unchanged since last scan; rescanning before acting on it: {project_name}")
+                cached = None
+            if (cached is not None and (cached.pool_paths is not None or not self.options.find_orphans)
+                    and (cached.pool_files is not None or not self.options.find_duplicates)):
+                self.log(f"INFO: Project unchanged since last scan; reusing cached results: {project_name}")
+                if self.options.strategy == SCAN_FAST:
+                    self._strategy_totals()
+                self.index = MediaPoolIndex()
+                records = self._refresh_reused_candidates(cached)
+                self.stat_cache.prefill([rec.path for rec in records],
+                                        clip_types={rec.path: rec.ctype for rec in records})
+                return ProjectScan(cached.name, cached.used_paths, records, cached=True,
+                                   clip_count=cached.clip_count, pool_paths=cached.pool_paths,
+                                   pool_files=cached.pool_files, bins=cached.bins)
+
+        self.log(f"INFO: Current project: {project_name}")
+        db = self.cache_db
+        project_key = self._project_key() if db is not None else ""
+        if db is not None:
+            db.timeline_hits = db.timeline_misses = db.folder_hits = db.folder_misses = 0
+
+        # Timelines first, so the Media Pool pass can settle each clip as it arrives.
+        # A fast scan skips this and verifies the Media Pool's Usage counts afterwards.
+        fast = self.options.strategy == SCAN_FAST
+        self.index = MediaPoolIndex()
+        for tl, name in timelines:
+            self.index.add_timeline(tl, name)
+        self.walker = TimelineWalker(self.project, self.index, log=self.log)
+        used_paths = PathStore()
+        seen_timelines = None
+        if not fast:
+            seen_timelines = self._walk_all_timelines(timelines, used_paths, db, project_key)
+
+        self._folders = []
+        try:
+            root_name = root_folder.GetName() or "Master"
+        except Exception:
+            root_name = "Master"
+        self._bins = []
+        pool_paths = PathStore() if self.options.find_orphans else None
+        pool_files = set() if self.options.find_duplicates else None
+        containers = [] if fast else None
+        candidates, clip_count = self._stream_media_pool(root_folder, used_paths, db, project_key,
+                                                         pool_paths, pool_files, containers)
+        self.log(f"INFO: Total eligible clips in Media Pool: {clip_count}")
+        if fast:
+            stats = self._verify_usage(timelines, candidates, containers, used_paths, db, project_key)
+            seen_timelines = stats["seen_timelines"]
+            for rec in containers:
+                rec.clip = None
+            self._note_strategy(stats, len(timelines))
+        self.log(f"INFO: Stat cache: {self.stat_cache.listings} directory listings "
+                 f"({self.stat_cache.stats} individual stats); {len(candidates)} possible unused/missing clips kept")
+        if db is not None:
+            if seen_timelines is not None:
+                db.prune_timelines(project_key, seen_timelines)
+            db.commit()
+            self.log(f"INFO: Scan cache: {db.timeline_hits}/{db.timeline_hits + db.timeline_misses} timelines "
+                     f"and {db.folder_hits}/{db.folder_hits + db.folder_misses} Media Pool folders reused")
+        self.log(f"INFO: Total used clip file paths (including Usage & compound discovery): {len(used_paths)}")
+
+        bins = [root_name + path for path in self._bins]
+        scan = ProjectScan(project_name, used_paths, candidates, clip_count=clip_count,
+                           pool_paths=pool_paths, pool_files=pool_files, bins=bins)
+        if fingerprint is not None:
+            self.scan_cache.put(cache_key, fingerprint,
+                                ProjectScan(project_name, scan.used_paths, list(candidates), clip_count=clip_count,
+                                            pool_paths=pool_paths, pool_files=pool_files, bins=bins))
+        return scan
+
+    def _refresh_reused_candidates(self, cached: ProjectScan) -> list:
+        """Re-reads a reused scan's candidates from the live Media Pool; returns those still present.
+
+        The project fingerprint only counts items per track, so swapping a clip onto a
+        timeline leaves it unchanged. Each candidate gets the _refresh_cached_record
+        check: one now in use (Usage > 0) is protected, and one gone from the Media
+        Pool is dropped.
+        """
+        self._resolve_clips(cached.records)
+        records = []
+        refreshed = gone = 0
+        for rec in cached.records:
+            if rec.clip is None:
+                gone += 1
+                continue
+            refreshed += self._refresh_cached_record(rec)
+            rec.clip = None
+            if rec.usage > 0:
+                cached.used_paths.add(rec.path)
+            records.append(rec)
+        if refreshed or gone:
+            self.log(f"INFO: Reused scan: {refreshed} clips changed and {gone} left the Media Pool since it was made")
+        return records
+
+    def _protect_compound(self, rec: ClipRecord, used_paths: PathStore):
+        try:
+            protected = self._discover_compound_children(rec.clip, rec.props)
+        except Exception:
+            protected = set()
+        if protected:
+            used_paths.update(protected)
+            self.log(f"INFO: Protected {len(protected)} clips inside compound: {rec.name or '<compound>'}")
+
+    def _walk_all_timelines(self, timelines, used_paths: PathStore, db, project_key) -> list:
+        """Adds every timeline's used paths; returns the cache keys seen.
+
+        Dry runs take unchanged timelines from the scan cache. The fingerprint only
+        counts items, so it misses a clip replaced or swapped for another and edits
+        inside compound clips; runs whose results are acted on walk every timeline
+        and only refresh the cache.
+        """
+        seen_timelines = []
+        pending = []
+        reuse = not self._acts_on_results()
+        for idx, (tl, name) in enumerate(timelines, 1):
+            tl_key = tl_fp = None
+            if db is not None:
+                tl_key = _unique_key(tl, "tl")
+                tl_fp = fingerprint_digest(timeline_fingerprint(tl))
+                cached_paths = db.get_timeline(project_key, tl_key, tl_fp) if tl_key and reuse else None
+                if cached_paths is not None:
+                    used_paths.update(cached_paths)
+                    seen_timelines.append(tl_key)
+                    continue
+            pending.append((idx, tl, name, tl_key, tl_fp))
+
+        walked = self._walk_timelines(pending)
+        for idx, tl, name, tl_key, tl_fp in pending:
+            paths = walked[idx]
+            used_paths.update(paths)
+            if tl_key:
+                db.put_timeline(project_key, tl_key, tl_fp, paths)
+                seen_timelines.append(tl_key)
+        del walked
+        self.log(f"INFO: Timeline walk: {self.walker.timelines_walked} timelines walked, "
+                 f"{self.walker.cache_hits} memoised reuses, {self.walker.cycles} cycles skipped")
+        return seen_timelines
+
+    @profiled("media_pool", items=lambda result: result[1])
+    def _stream_media_pool(self, root_folder, used_paths: PathStore, db, project_key,
+                           pool_paths: PathStore = None, pool_files: set = None,
+                           deferred: list = None) -> tuple[list, int]:
+        """Consumes iter_media_pool; grows used_paths and returns (candidate records, file clip count).
+
+        Compounds are resolved as they appear and Usage > 0 protects a path at once.
+        File clips are settled in chunks so each chunk's existence checks share
+        directory listings; a candidate kept here may still be protected by a later
+        clip, which the final _classify against the complete used set takes care of.
+        With a `deferred` list (fast scan) compounds are collected there, proxies
+        included, instead of being walked, and every record goes into the index.
+        """
+        include = self.options.include
+        candidates = []
+        chunk = []
+        clip_count = containers = usage_protected = refreshed = 0
+        self._pool_usage = 0
+
+        def settle():
+            with self._stage("stat") as span:
+                self.stat_cache.prefill([rec.path for rec in chunk],
+                                        clip_types={rec.path: rec.ctype for rec in chunk})
+                span.items = len(chunk)
+            for rec in chunk:
+                if rec.path in used_paths and self.stat_cache.exists(rec.path):
+                    self.stat_cache.discard(rec.path)
+                else:
+                    candidates.append(rec)
+            chunk.clear()
+
+        for rec in iter_media_pool(root_folder, db, project_key, self.index, self._folders, self._bins):
+            self._pool_usage += rec.usage
+            if deferred is not None:
+                self.index.add(rec)
+            if rec.is_container:
+                containers += 1
+                if deferred is not None:
+                    deferred.append(rec)
+                else:
+                    self._protect_compound(rec, used_paths)
+                continue
+            if not rec.path:
+                continue
+            clip_count += 1
+            if pool_paths is not None:
+                pool_paths.add(rec.path)
+            if pool_files is not None:
+                pool_files.add(rec.path)
+            if rec.cached and rec.path not in used_paths and include.get(rec.kind, True):
+                refreshed += self._refresh_cached_record(rec)
+            if rec.usage > 0:
+                usage_protected += 1
+                used_paths.add(rec.path)
+            rec.clip = None
+            chunk.append(rec)
+            if len(chunk) >= STREAM_CHUNK_SIZE:
+                settle()
+        settle()
+
+        self.api_calls.clip_count += clip_count + containers
+        if refreshed:
+            self.log(f"INFO: Refreshed {refreshed} cached clip records that changed since the last scan")
+        if usage_protected:
+            self.log(f"INFO: Protected {usage_protected} clips (Usage > 0).")
+        return candidates, clip_count
+
+    @profiled("verify", items=lambda stats: stats["verified_clips"])
+    def _verify_usage(self, timelines, candidates, containers, used_paths: PathStore, db, project_key) -> dict:
+        """Fast scan: checks the clips Usage calls unused instead of walking timelines up front.
+
+        Only clips that would be deleted are suspects: wanted kind, online, and no
+        used clip sharing the path. Without any, no timeline is walked at all. The
+        scripting API has no lookup from a clip to the timelines using it, and a
+        suspect is only cleared once every timeline has been seen, so with suspects
+        all timelines go through _walk_all_timelines (parallel workers, and the scan
+        cache on dry runs). Then the inner timelines of compound, Fusion and multicam
+        clips are walked, stopping once every suspect has turned up. Suspects found
+        in use are logged as Usage disagreements and kept. `seen_timelines` in the
+        result holds the scan cache keys, None if the timelines were not walked.
+        """
+        include = self.options.include
+        suspects = {}
+        for rec in candidates:
+            if rec.path not in used_paths and include.get(rec.kind, True) and self.stat_cache.exists(rec.path):
+                suspects.setdefault(rec.path, rec)
+        stats = {"verified_clips": len(suspects), "timelines_walked": 0, "containers_walked": 0,
+                 "usage_disagreements": 0, "seen_timelines": None}
+        if not suspects:
+            return stats
+
+        stats["seen_timelines"] = self._walk_all_timelines(timelines, used_paths, db, project_key)
+        stats["timelines_walked"] = len(timelines)
+        placed = [f"{rec.name or '<unnamed>'}: {p}" for p, rec in suspects.items() if p in used_paths]
+        if placed:
+            stats["usage_disagreements"] = len(placed)
+            self.log_list("WARNING: Usage is 0 but the clip is on a timeline (kept):", placed)
+
+        on_timelines = {p for p in suspects if p in used_paths}
+        remaining = [p for p in suspects if p not in used_paths]
+        for rec in containers:
+            if not remaining:
+                break
+            stats["containers_walked"] += 1
+            self._protect_compound(rec, used_paths)
+            remaining = [p for p in remaining if p not in used_paths]
+        nested = [f"{rec.name or '<unnamed>'}: {p}" for p, rec in suspects.items()
+                  if p in used_paths and p not in on_timelines]
+        if nested:
+            stats["usage_disagreements"] += len(nested)
+            self.log_list("INFO: Usage is 0 but the clip is used inside a compound, Fusion or multicam "
+                          "clip (kept):", nested)
+        return stats
+
+    def _strategy_totals(self) -> dict:
+        """The report's fast-scan totals, started on first use."""
+        if self.strategy is None:
+            self.strategy = {"requested": SCAN_FAST, "used": SCAN_FAST, "timelines": 0, "verified_clips": 0,
+                             "timelines_walked": 0, "containers_walked": 0, "usage_disagreements": 0,
+                             "api_calls_saved": 0}
+        return self.strategy
+
+    def _note_strategy(self, stats: dict, timelines: int):
+        """Adds one project's fast-scan verification to self.strategy and logs it.
+
+        Calls only count as saved when no timeline had to be walked; they are then
+        estimated from what the full walk would have cost: about two calls per
+        timeline placement (GetMediaPoolItem, GetUniqueId), which Usage counts,
+        plus three per timeline.
+        """
+        saved = 0 if stats["timelines_walked"] else 2 * self._pool_usage + 3 * timelines
+        if stats["timelines_walked"]:
+            self.log(f"INFO: Scan strategy: fast, but {stats['verified_clips']} clips Usage calls unused were "
+                     f"checked on all {timelines} timelines and {stats['containers_walked']} compound clips "
+                     f"(no API calls saved)")
+        else:
+            self.log(f"INFO: Scan strategy: fast (Usage trusted; no clip to verify, {timelines} timelines "
+                     f"skipped, ~{saved} API calls saved)")
+        total = self._strategy_totals()
+        total["timelines"] += timelines
+        for key in ("verified_clips", "timelines_walked", "containers_walked", "usage_disagreements"):
+            total[key] += stats[key]
+        total["api_calls_saved"] += saved
+
+    @profiled("timelines", items=len)
+    def _walk_timelines(self, pending) -> dict:
+        """{timeline index: used paths} for (index, timeline, name, ...) entries.
+
+        Uses a TimelineScanPool when more than one worker is configured and there is
+        more than one timeline; any worker failure falls back to the serial walk.
+        """
+        workers = min(self.options.timeline_workers or 1, len(pending))
+        if workers > 1:
+            pool = TimelineScanPool(self.session.checkout, self.walker, self._project_key(), workers,
+                                    self.profiler, release=self.session.checkin)
+            self.log(f"INFO: Scanning {len(pending)} timelines (including compounds) "
+                     f"on {workers} scripting connections")
+            started = time.perf_counter()
+            try:
+                walked = pool.scan([(entry[0], entry[2]) for entry in pending])
+            except Exception as e:
+                self.log(f"WARNING: Concurrent timeline scan unavailable ({e}); scanning serially.")
+            else:
+                self.log(f"INFO: Concurrent scan: {pool.units} tracks on {pool.connections} connections "
+                         f"in {time.perf_counter() - started:.2f}s")
+                return walked
+            finally:
+                self.api_calls.merge(pool.api_calls)
+
+        walked = {}
+        for idx, tl, name, _, _ in pending:
+            if name:
+                self.log(f"INFO: Scanning timeline (including compounds): {name}")
+            else:
+                self.log("INFO: Scanning unnamed timeline (including compounds)")
+            with self._stage("timeline", timeline=name) as span:
+                walked[idx] = self.walker.paths_for_timeline(tl)
+                span.items = len(walked[idx])
+        return walked
+
+    def _refresh_cached_record(self, rec: ClipRecord) -> int:
+        """Re-reads live properties of a cached record that looks unused; 1 if it changed.
+
+        Folder fingerprints only track clip IDs, so a relinked clip or one newly placed
+        in a timeline with an unchanged fingerprint would otherwise keep a stale path or
+        Usage. Only would-be candidates pay the extra call.
+        """
+        if rec.clip is None:
+            return 0
+        live = ClipRecord(rec.clip, fetch_clip_properties(rec.clip), rec.uid)
+        if live.path == rec.path and live.usage == rec.usage and live.kind == rec.kind:
+            return 0
+        rec.path, rec.usage, rec.kind, rec.ctype = live.path, live.usage, live.kind, live.ctype
+        return 1
+
+    @profiled("classify", items=lambda result: len(result[0]) + len(result[1]))
+    def _classify(self, records, used_paths) -> tuple[list, list]:
+        include = self.options.include
+        unused_clips = []
+        missing_clips = []
+        for rec in records:
+            if not include[rec.kind]:
+                continue
+            if not self.stat_cache.exists(rec.path):
+                missing_clips.append((rec, rec.path))
+            elif rec.path not in used_paths:
+                unused_clips.append((rec, rec.path))
+        return unused_clips, missing_clips
+
+    @profiled("orphans", items=lambda result: len(result[0]))
+    def _find_orphans(self, pool_paths: PathStore, used_paths: PathStore) -> tuple[list, dict]:
+        """Media files on disk that neither the Media Pool nor any timeline refers to.
+
+        Searches the user's orphan_roots with their subfolders, or else only the
+        folders Media Pool files sit in, not below them: one clip imported from the
+        Desktop must not make everything under it an orphan. Drive and volume roots
+        and the home folder are refused either way. Frames of pool image sequences
+        are not orphans; the move-to folder and Resolve's proxy, optimized media and
+        cache folders (RESOLVE_MANAGED_DIRS) are skipped.
+        Returns ([(record, path)], {path: size in bytes}).
+        """
+        opts = self.options
+        extensions = media_extensions_for(opts.include)
+        if not extensions:
+            return [], {}
+        recursive = bool(opts.orphan_roots)
+        if recursive:
+            candidates = opts.orphan_roots
+        else:
+            candidates = sorted({os.path.normpath(os.path.abspath(d)) for d in pool_paths.directories()})
+        roots = []
+        # Refused before collapsing, so a broad root does not swallow the folders inside it
+        for root in candidates:
+            if is_broad_root(root):
+                self.log(f"WARNING: Not searching a drive root or home folder for orphans: {root}")
+            elif os.path.isdir(root):
+                roots.append(root)
+            elif recursive:
+                self.log(f"WARNING: Orphan search folder not found: {root}")
+        if recursive:
+            roots = collapse_roots(roots)
+        if not roots:
+            return [], {}
+        sequences = {}
+        for p in pool_paths:
+            # Pool paths may be case-folded; a looser match only hides files, never adds them
+            pattern = parse_sequence(p, ignore_case=True)
+            if pattern is not None:
+                sequences.setdefault(pattern.directory, []).append(pattern)
+
+        def is_frame(directory, name):
+            patterns = sequences.get(directory)
+            return patterns is not None and any(pattern.match(name) for pattern in patterns)
+
+        self.log(f"INFO: Searching {len(roots)} folders{'' if recursive else ' (not their subfolders)'} "
+                 f"for orphan media files...")
+
+        def unreadable(directory, e):
+            self.log(f"WARNING: Could not read folder {directory}: {e}")
+
+        orphans = []
+        sizes = {}
+        skip_dirs = RESOLVE_MANAGED_DIRS + ((opts.folder_name,) if opts.folder_name else ())
+        for path, size, kind in walk_media_files(roots, extensions, skip_dirs, is_frame if sequences else None,
+                                                 on_error=unreadable, recursive=recursive):
+            if path in pool_paths or path in used_paths:
+                continue
+            rec = ClipRecord(None, {"Clip Name": os.path.basename(path), "Type": ORPHAN_CLIP_TYPES[kind],
+                                    "File Path": path})
+            orphans.append((rec, rec.path))
+            sizes[rec.path] = size
+        orphans.sort(key=lambda item: item[1])
+        return orphans, sizes
+
+    def _log_orphans(self, report, orphans, sizes):
+        total = sum(sizes.values())
+        report["orphans"] = [dict(self._report_entry(rec), size=sizes[path]) for rec, path in orphans]
+        report["orphan_bytes"] = total
+        self.log_list(f"INFO: Orphan media files on disk (not in the Media Pool): {len(orphans)}",
+                      [p for _, p in orphans])
+        if orphans:
+            self.log(f"INFO: Reclaimable from orphan files: {format_bytes(total)}")
+
+    @profiled("duplicates")
+    def _find_duplicates(self, report, pool_files, used_paths: PathStore):
+        """Reports groups of Media Pool files with identical content (analysis only)."""
+        files = [p for p in pool_files if parse_sequence(p) is None]
+        self.log(f"INFO: Checking {len(files)} Media Pool files for duplicate content...")
+        self.stat_cache.prefill(files)
+        finder = DuplicateFinder(self.cache_db, log=self.log)
+        groups = finder.find({p: self.stat_cache.stat(p) for p in files})
+        if self.cache_db is not None:
+            self.cache_db.commit()
+        total = sum(size * (len(paths) - 1) for size, _, paths in groups)
+        report["duplicates"] = [{"size": size, "hash": digest, "paths": paths,
+                                 "used": [p in used_paths for p in paths],
+                                 "reclaimable": size * (len(paths) - 1)} for size, digest, paths in groups]
+        report["duplicate_bytes"] = total
+        self.log(f"INFO: Hashing: {finder.partial_hashed} partial and {finder.full_hashed} full hashes computed, "
+                 f"{finder.cache_hits} reused from cache")
+        self.log_list(f"INFO: Duplicate file groups found: {len(groups)}",
+                      [f"{format_bytes(size)} x{len(paths)}: {' | '.join(paths)}" for size, _, paths in groups])
+        if groups:
+            self.log(f"INFO: Reclaimable by relinking duplicates to one copy: {format_bytes(total)}")
+
+    @profiled("space", items=lambda space: space.files)
+    def _reclaimable_space(self, report, entries, orphans=(), orphan_sizes=None) -> SpaceReport:
+        """Totals the size of every unused file and orphan into report["reclaimable"].
+
+        `entries` are (record, path, bins) for unused clips. Sizes come from the stat
+        cache the scan already filled; only sequence frames are stat'ed here, once each.
+        """
+        space = SpaceReport()
+        for rec, path, bins in entries:
+            size = self.sizes[path] = self.stat_cache.size(path)
+            seq = self.stat_cache.sequence(path)
+            bin_path = bins[rec.folder] if 0 <= rec.folder < len(bins) else "(unknown bin)"
+            space.add(path, size, rec.kind, bin_path, len(seq) if seq is not None else 1)
+        for rec, path in orphans:
+            size = self.sizes[path] = orphan_sizes[path]
+            space.add(path, size, rec.kind)
+        for entry in report["unused"]:
+            entry["size"] = self.sizes.get(entry["path"], 0)
+        reclaimable = report["reclaimable"] = space.to_dict()
+        if space.files:
+            by_type = ", ".join(f"{r['key']} {format_bytes(r['bytes'])}" for r in reclaimable["by_type"])
+            self.log(f"INFO: Reclaimable space: {format_bytes(space.bytes)} in {space.files} files ({by_type})")
+            self.log_list("INFO: Largest folders by reclaimable space:",
+                          [f"{format_bytes(r['bytes'])} in {r['files']} files: {r['key']}"
+                           for r in reclaimable["by_directory"][:SPACE_REPORT_TOP]])
+        return space
+
+    def _log_list_lines(self, header: str, items):
+        self.log(header)
+        for item in items:
+            self.log(f" - {item}")
+
+    def _log_findings(self, unused_clips, missing_clips):
+        self.log_list(f"INFO: Unused clips found: {len(unused_clips)}", [p for _, p in unused_clips])
+        self.log_list(f"INFO: Missing clips found: {len(missing_clips)}", [p for _, p in missing_clips])
+
+    def _confirm_clean(self, report, unused_count, missing_count, orphan_count: int = 0,
+                       sweep: bool = False) -> bool:
+        """Shared stop points before anything is changed; sets report status when stopping."""
+        if not unused_count and not missing_count and not orphan_count:
+            self.log("INFO: No unused or missing media found.")
+            report["status"] = "nothing_to_do"
+            return False
+
+        if self.options.dry_run:
+            self.log("INFO: Dry Run - no changes will be made.")
+            report["status"] = "dry_run"
+            return False
+
+        action_label = "Move to folder" if self.options.action == ACTION_MOVE else f"Delete to {TRASH_NAME}"
+        message = f"{action_label} {unused_count} unused files and remove {missing_count} missing clips."
+        if orphan_count:
+            # Orphans are only checked against the scanned projects' Media Pools
+            scope = ("no project in this sweep uses them, but projects outside it still might" if sweep
+                     else "this project does not use them, but other projects still might")
+            message += f"\n\nAlso {action_label.lower()} {orphan_count} orphan files found on disk ({scope})."
+        proceed = self.confirm("Confirm Clean", f"{message}\n\nProceed?")
+        if not proceed:
+            self.log("INFO: Operation cancelled by user.")
+            report["status"] = "cancelled"
+            return False
+        return True
+
+    @profiled("files", items=lambda result: len(result[0]))
+    def _act_on_files(self, unused_clips, clips_for=None) -> tuple[list, dict, int]:
+        """Moves or trashes unused files; returns (handled records, per-type summary, errors).
+
+        An image-sequence clip stands for all of its frames: they are moved or trashed
+        in the same batches as single files, and the clip only counts as handled when
+        every frame was. With a journal open, every clip's plan is made durable before
+        the first file is touched and a done record follows as its last file finishes;
+        clips_for(rec, path) gives the Media Pool identities recorded with each plan.
+        """
+        opts = self.options
+        errors = 0
+        summary = {"video":0, "audio":0, "image":0, "other":0}
+        handled = []
+        pending = []
+
+        for rec, path in unused_clips:
+            # The one deliberate re-stat (a sequence is re-listed): it may have changed since the scan
+            if self.stat_cache.restat(path, rec.ctype) is None:
+                self.log(f"WARNING: File not found (skipping): {path}")
+                errors += 1
+                continue
+            summary[rec.kind] += 1
+            # Moved / trashed below in parallel or batched operations
+            files = self.stat_cache.member_paths(path)
+            if opts.action == ACTION_MOVE:
+                dest_dir = os.path.join(os.path.dirname(path), opts.folder_name)
+                jobs = [(src, os.path.join(dest_dir, os.path.basename(src))) for src in files]
+            else:
+                jobs = [(src, None) for src in files]
+            pending.append((rec, path, jobs))
+
+        flat = [job for _, _, jobs in pending for job in jobs]
+        file_done = None
+        if self.journal is not None:
+            plan_ids = [self._journal_plan(rec, path, jobs, clips_for(rec, path) if clips_for else [])
+                        for rec, path, jobs in pending]
+            self.journal.sync()
+            owner = [k for k, (_, _, jobs) in enumerate(pending) for _ in jobs]
+            file_done = _PlanProgress(self.journal, "done", plan_ids, owner).file_done
+
+        def settle(results, done, failed):
+            nonlocal errors
+            results = iter(results)
+            for rec, path, jobs in pending:
+                # zip() takes exactly len(jobs) results: `jobs` is exhausted first
+                errs = [(src, err) for (src, _), (ok, err) in zip(jobs, results) if not ok]
+                label = path if len(jobs) == 1 else f"{path} ({len(jobs)} files)"
+                if not errs:
+                    self.log(done(label, path))
+                    handled.append(rec)
+                    continue
+                for src, err in errs:
+                    self.log(failed(src, err))
+                errors += 1
+
+        if pending and opts.action == ACTION_MOVE:
+            def report_copy(src, copied, total):
+                pct = 100.0 * copied / total if total else 100.0
+                self.log(f"COPYING: {src} ({pct:.0f}%)")
+            mover = MoveExecutor(opts.move_workers, opts.move_per_volume, progress=report_copy)
+            settle(mover.move_all(flat, on_done=file_done),
+                   lambda label, path: f"MOVED: {label} -> {os.path.join(os.path.dirname(path), opts.folder_name)}",
+                   lambda src, err: f"ERROR: Processing {src}: {err}")
+            self.log(f"INFO: Moves: {mover.renamed} renamed in place, {mover.copied} copied across volumes")
+        elif pending:
+            results = send_to_trash_batch([src for src, _ in flat], opts.trash_batch_size, on_done=file_done)
+            settle(results, lambda label, path: f"DELETED: {label} to {TRASH_NAME}",
+                   lambda src, err: f"ERROR: {TRASH_NAME} failed for {src}: {err}")
+        return handled, summary, errors
+
+    # --- Journal bookkeeping ---
+
+    def _open_journal(self, report, project, sweep: bool = False):
+        try:
+            self.journal = CleanupJournal.create(self.options.action, project, self.options.folder_name, sweep)
+        except OSError as e:
+            self.log(f"WARNING: Cleanup journal unavailable; this run can't be undone: {e}")
+            return
+        self._journal_ids = {}
+        report["journal"] = self.journal.path
+        self.log(f"INFO: Journal: {self.journal.path}")
+
+    def _journal_plan(self, rec, path, jobs, clips, kind: str = "file") -> int:
+        n = len(self._journal_ids)
+        self._journal_ids[id(rec)] = n
+        self.journal.write({"op": "plan", "n": n, "kind": kind, "path": path, "size": self.sizes.get(path, 0),
+                            "files": [[src, dst] for src, dst in jobs], "clips": clips})
+        return n
+
+    def _journal_offline(self, missing_clips, identity):
+        """Plans the removal of offline clips, so a resumed run can finish it."""
+        if self.journal is None:
+            return
+        for rec, path in missing_clips:
+            self._journal_plan(rec, path, [], [identity(rec)], kind="offline")
+        self.journal.sync()
+
+    @staticmethod
+    def _clip_identity(rec: ClipRecord, project: str, folder, bins) -> dict:
+        return {"project": project, "folder": list(folder) if folder is not None else None, "uid": rec.uid,
+                "name": rec.name, "bin": bins[rec.folder] if 0 <= rec.folder < len(bins) else ""}
+
+    def _resolve_clips(self, records):
+        """Finds live clip proxies for compact records, searching the bin each was seen in first."""
+        wanted = {rec.uid: rec for rec in records if rec.uid}
+        if not wanted:
+            return
+        by_folder = {}
+        if self._folders:
+            for rec in wanted.values():
+                if 0 <= rec.folder < len(self._folders):
+                    by_folder.setdefault(rec.folder, set()).add(rec.uid)
+        for folder_no, uids in by_folder.items():
+            for uid, clip in find_clips_by_uid(self._folders[folder_no], uids, recursive=False).items():
+                wanted.pop(uid).clip = clip
+        if wanted:
+            # Cached scans, or clips moved to another bin since the scan
+            for uid, clip in find_clips_by_uid(self.media_pool.GetRootFolder(), wanted).items():
+                wanted[uid].clip = clip
+
+    @profiled("pool_removal", items=lambda result: result[0])
+    def _remove_from_pool(self, to_remove, missing_records) -> tuple[int, int]:
+        """Batched removal of clips from self.media_pool; returns (removed, errors)."""
+        self._resolve_clips([rec for rec in to_remove if rec.clip is None])
+        errors = 0
+        unresolved = [rec for rec in to_remove if rec.clip is None]
+        for rec in unresolved:
+            self.log(f"WARNING: Clip no longer in Media Pool: {rec.path}")
+            errors += 1
+        to_remove = [rec for rec in to_remove if rec.clip is not None]
+
+        missing_ids = {id(rec) for rec in missing_records}
+        removed, failed = delete_clips_batched(self.media_pool, to_remove,
+                                               self.options.delete_batch_size, log=self.log)
+        for rec in removed:
+            if self.journal is not None:
+                n = self._journal_ids.get(id(rec), self._journal_ids.get(rec.path))
+                self.journal.write({"op": "removed", "n": n, "project": self._journal_project, "uid": rec.uid})
+            if self.index is not None:
+                self.index.remove(rec)
+            if id(rec) in missing_ids:
+                self.log(f"REMOVED offline clip from Media Pool: {rec.path}")
+        for rec in failed:
+            if id(rec) in missing_ids:
+                self.log(f"WARNING: Failed to remove offline clip: {rec.path}")
+            else:
+                self.log(f"WARNING: Failed to remove clip from Media Pool: {rec.path}")
+            errors += 1
+        return len(removed), errors
+
+    def _finish_summary(self, report, summary, processed, removed_from_pool, errors, handled_bytes: int = 0):
+        self.log("\n=== SUMMARY ===")
+        self.log(f"Video files: {summary['video']}")
+        self.log(f"Audio files: {summary['audio']}")
+        self.log(f"Image/Graphics files: {summary['image']}")
+        self.log(f"Other files: {summary['other']}")
+        self.log(f"Total processed: {processed} ({format_bytes(handled_bytes)}), "
+                 f"removed from pool: {removed_from_pool}, errors: {errors}")
+        report["summary"] = dict(summary, processed=processed, bytes=handled_bytes,
+                                 removed_from_pool=removed_from_pool, errors=errors)
+        report["status"] = "ok"
+
+    def _options_valid(self, report) -> bool:
+        if self.options.action == ACTION_MOVE and not self.options.folder_name:
+            self.log("WARNING: Unused folder name cannot be empty.")
+            report["status"] = "invalid_options"
+            return False
+        return True
+
+    def _end_report(self, report):
+        if self.journal is not None:
+            try:
+                self.journal.write({"op": "end", "status": report.get("status"), "summary": report.get("summary")})
+                self.journal.close()
+            except Exception as e:
+                self.log(f"WARNING: Could not finish journal {self.journal.path}: {e}")
+            self.journal = None
+        if self.cache_db is not None:
+            try:
+                self.cache_db.close()
+            except Exception:
+                pass
+            self.cache_db = None
+        self._log_api_calls()
+        if self.api_calls:
+            report["api_calls"] = {"total": self.api_calls.total, "by_method": dict(self.api_calls.calls)}
+        if self.profiler is not None:
+            self._write_profile(report)
+        peak = peak_memory_mb()
+        if peak is not None:
+            self.log(f"INFO: Peak memory: {peak:.0f} MB")
+            report["peak_memory_mb"] = round(peak, 1)
+
+    def run(self) -> dict:
+        """Runs one scan (and, unless dry run / cancelled, the clean-up); returns the report."""
+        report = self._new_report()
+        try:
+            if not self._options_valid(report):
+                return report
+            pm = self._connect()
+            self.project = pm.GetCurrentProject()
+            if not self.project:
+                self.log("WARNING: No project open.")
+                report["status"] = "no_project"
+                return report
+            if self.session.note_project(self._project_key()):
+                self.log("INFO: Project switched since the last scan; timeline workers reconnect.")
+
+            scan = self._scan_project()
+            report["project"] = scan.name
+            report["strategy"] = self.strategy or {"requested": self.options.strategy, "used": SCAN_FULL}
+            unused_clips, missing_clips = self._classify(scan.records, scan.used_paths)
+            report["unused"] = [self._report_entry(rec) for rec, _ in unused_clips]
+            report["missing"] = [self._report_entry(rec) for rec, _ in missing_clips]
+            self._log_findings(unused_clips, missing_clips)
+            # Clips sharing a file (shared media) are one file job and one plan that
+            # carries every clip's identity, as in a sweep
+            clips_by_path = {}
+            unique_unused = []
+            for rec, path in unused_clips:
+                if path not in clips_by_path:
+                    clips_by_path[path] = []
+                    unique_unused.append((rec, path))
+                clips_by_path[path].append(rec)
+            orphans = []
+            if self.options.find_orphans:
+                orphans, sizes = self._find_orphans(scan.pool_paths, scan.used_paths)
+                self._log_orphans(report, orphans, sizes)
+            if self.options.find_duplicates:
+                self._find_duplicates(report, scan.pool_files, scan.used_paths)
+            self._reclaimable_space(report, [(rec, path, scan.bins) for rec, path in unique_unused],
+                                    orphans, sizes if orphans else None)
+
+            def identity(rec):
+                return self._clip_identity(rec, scan.name, None, scan.bins)
+
+            def identities(path):
+                return [identity(rec) for rec in clips_by_path[path]]
+            if self.options.plan_path:
+                self._save_plan(report, scan.name, False,
+                                [(rec, path, identities(path)) for rec, path in unique_unused],
+                                [(rec, path, identity(rec)) for rec, path in missing_clips], orphans)
+
+            if not self._confirm_clean(report, len(unique_unused), len(missing_clips), len(orphans)):
+                return report
+
+            orphan_ids = {id(rec) for rec, _ in orphans}
+            self._open_journal(report, scan.name)
+            self._journal_project = scan.name
+            self._journal_offline(missing_clips, identity)
+            handled, summary, errors = self._act_on_files(
+                unique_unused + orphans, lambda rec, path: [] if id(rec) in orphan_ids else identities(path))
+            handled_paths = {rec.path for rec in handled if id(rec) not in orphan_ids}
+            if self.journal is not None:
+                # Every clip of a handled file maps to the one plan for that path
+                for rec in handled:
+                    self._journal_ids[rec.path] = self._journal_ids[id(rec)]
+            # Only clips whose files were actually moved/trashed, plus offline clips;
+            # orphan files have no clip to remove
+            missing_records = [rec for rec, _ in missing_clips]
+            to_remove = [rec for rec, path in unused_clips if path in handled_paths] + missing_records
+            removed_from_pool, remove_errors = self._remove_from_pool(to_remove, missing_records)
+            self._finish_summary(report, summary, len(handled), removed_from_pool, errors + remove_errors,
+                                 sum(self.sizes.get(rec.path, 0) for rec in handled))
+
+        except ResolveConnectionError:
+            raise
+        except Exception as e:
+            self.log(f"FATAL ERROR: {e}")
+            report["error"] = str(e)
+        finally:
+            self._end_report(report)
+        return report
+
+    def run_sweep(self, project_names=None, folder_path=(), recursive: bool = True) -> dict:
+        """Scans several projects and cleans only media that is unused in all of them.
+
+        The used-path set is the union over every selected project, so a file that is
+        unused in one project but used in another is never touched. Each project's
+        clips are removed from its own Media Pool and the project is saved.
+        """
+        report = self._new_report()
+        report["projects"] = []
+        pm = None
+        original = None
+        try:
+            if not self._options_valid(report):
+                return report
+            pm = self._connect()
+            current = pm.GetCurrentProject()
+            if current:
+                original = current.GetName()
+                # Switching projects below must not lose unsaved work in the open one
+                pm.SaveProject()
+
+            entries = list_database_projects(pm, tuple(folder_path), recursive)
+            if project_names:
+                wanted = set(project_names)
+                entries = [e for e in entries if e[1] in wanted]
+            if not entries:
+                self.log("WARNING: No matching projects found in the Project Manager.")
+                report["status"] = "no_project"
+                return report
+            self.log(f"INFO: Sweeping {len(entries)} projects")
+
+            scans = []
+            global_used = PathStore()
+            global_pool = PathStore() if self.options.find_orphans else None
+            global_files = set() if self.options.find_duplicates else None
+            for folder, name in entries:
+                label = "/".join(folder + (name,))
+                self.project = open_database_project(pm, folder, name)
+                if not self.project:
+                    self.log(f"WARNING: Could not load project: {label}")
+                    continue
+                scan = self._scan_project(cache_key=(folder, name))
+                scans.append((folder, name, scan))
+                global_used.update(scan.used_paths)
+                if global_pool is not None:
+                    global_pool.update(scan.pool_paths)
+                if global_files is not None:
+                    global_files.update(scan.pool_files)
+                report["projects"].append({"project": label, "clips": scan.clip_count,
+                                           "used_paths": len(scan.used_paths), "cached": scan.cached})
+            self.log(f"INFO: Used file paths across all swept projects: {len(global_used)}")
+            report["strategy"] = self.strategy or {"requested": self.options.strategy, "used": SCAN_FULL}
+
+            unused_by_path = {}
+            clips_by_path = {}
+            per_project = []
+            all_missing = 0
+            for folder, name, scan in scans:
+                label = "/".join(folder + (name,))
+                unused_clips, missing_clips = self._classify(scan.records, global_used)
+                per_project.append((folder, name, unused_clips, missing_clips, scan.bins))
+                all_missing += len(missing_clips)
+                for rec, path in unused_clips:
+                    unused_by_path.setdefault(path, (rec, scan.bins))
+                    clips_by_path.setdefault(path, []).append(self._clip_identity(rec, name, folder, scan.bins))
+                    report["unused"].append(dict(self._report_entry(rec), project=label))
+                for rec, _ in missing_clips:
+                    report["missing"].append(dict(self._report_entry(rec), project=label))
+            unique_unused = [(rec, path) for path, (rec, _) in unused_by_path.items()]
+            self._log_findings(unique_unused, [(None, m["path"]) for m in report["missing"]])
+            orphans = []
+            if global_pool is not None:
+                # Orphaned only if no swept project imports the file
+                orphans, sizes = self._find_orphans(global_pool, global_used)
+                self._log_orphans(report, orphans, sizes)
+            if global_files is not None:
+                self._find_duplicates(report, global_files, global_used)
+            self._reclaimable_space(report, [(rec, path, bins) for path, (rec, bins) in unused_by_path.items()],
+                                    orphans, sizes if orphans else None)
+            if self.options.plan_path:
+                self._save_plan(report, None, True,
+                                [(rec, path, clips_by_path[path]) for rec, path in unique_unused],
+                                [(rec, path, self._clip_identity(rec, name, folder, bins))
+                                 for folder, name, _, missing_clips, bins in per_project
+                                 for rec, path in missing_clips], orphans)
+
+            if not self._confirm_clean(report, len(unique_unused), all_missing, len(orphans), sweep=True):
+                return report
+
+            self._open_journal(report, None, sweep=True)
+            for folder, name, _, missing_clips, bins in per_project:
+                self._journal_offline(missing_clips, lambda rec: self._clip_identity(rec, name, folder, bins))
+            # Orphan paths are in no Media Pool, so the per-project removal below never matches them
+            handled, summary, errors = self._act_on_files(unique_unused + orphans,
+                                                          lambda rec, path: clips_by_path.get(path, []))
+            handled_paths = {rec.path for rec in handled}
+            if self.journal is not None:
+                # Every project's clip for a handled file maps to the one plan for that path
+                for rec in handled:
+                    self._journal_ids[rec.path] = self._journal_ids[id(rec)]
+            removed_from_pool = 0
+            for folder, name, unused_clips, missing_clips, _ in per_project:
+                missing_records = [rec for rec, _ in missing_clips]
+                to_remove = [rec for rec, path in unused_clips if path in handled_paths] + missing_records
+                if not to_remove:
+                    continue
+                self.project = open_database_project(pm, folder, name)
+                if not self.project:
+                    self.log(f"ERROR: Could not reload project to remove clips: {name}")
+                    errors += len(to_remove)
+                    continue
+                self.media_pool = self.project.GetMediaPool()
+                # Folder proxies from the scan died with the project load
+                self.index = None
+                self._folders = None
+                self.log(f"INFO: Removing {len(to_remove)} clips from project: {name}")
+                self._journal_project = name
+                removed, remove_errors = self._remove_from_pool(to_remove, missing_records)
+                removed_from_pool += removed
+                errors += remove_errors
+                pm.SaveProject()
+            self._finish_summary(report, summary, len(handled), removed_from_pool, errors,
+                                 sum(self.sizes.get(rec.path, 0) for rec in handled))
+
+        except ResolveConnectionError:
+            raise
+        except Exception as e:
+            self.log(f"FATAL ERROR: {e}")
+            report["error"] = str(e)
+        finally:
+            if pm is not None and original:
+                try:
+                    pm.GotoRootFolder()
+                    found = [e for e in list_database_projects(pm) if e[1] == original]
+                    if found:
+                        open_database_project(pm, found[0][0], original)
+                except Exception:
+                    self.log(f"WARNING: Could not reopen original project: {original}")
+            self._end_report(report)
+        return report
+
+    # --- Plan / apply ---
+
+    def _plan_entry(self, rec: ClipRecord, path: str, clips) -> dict:
+        st = self.stat_cache.stat(path)
+        entry = {"path": path, "name": rec.name, "type": rec.ctype, "size": self.sizes.get(path, 0),
+                 "mtime": st.st_mtime_ns if st is not None else None, "clips": clips}
+        seq = self.stat_cache.sequence(path)
+        if seq is not None:
+            entry["frames"] = len(seq)
+        return entry
+
+    def _save_plan(self, report, project, sweep: bool, unused, missing, orphans):
+        """Writes the findings as a plan file that apply() executes without rescanning.
+
+        `unused` holds (record, path, clip identities), `missing` (record, path, identity).
+        """
+        path = self.options.plan_path
+        # The orphan walk only kept sizes
+        self.stat_cache.prefill([p for _, p in orphans], clip_types={p: rec.ctype for rec, p in orphans})
+        plan = {
+            "format": PLAN_FORMAT,
+            "version": PLAN_VERSION,
+            "app_version": APP_VERSION,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "project": project,
+            "sweep": sweep,
+            "action": self.options.action,
+            "folder_name": self.options.folder_name,
+            "unused": [self._plan_entry(rec, p, clips) for rec, p, clips in unused],
+            "missing": [{"path": p, "name": rec.name, "type": rec.ctype, "clips": [clip]} for rec, p, clip in missing],
+            "orphans": [self._plan_entry(rec, p, []) for rec, p in orphans],
+        }
+        try:
+            write_plan(plan, path)
+        except OSError as e:
+            self.log(f"WARNING: Could not write plan {path}: {e}")
+            return
+        report["plan"] = path
+        self.log(f"INFO: Plan written to {path}")
+
+    def _plan_entry_changed(self, entry: dict):
+        """Why a planned file may no longer be acted on, or None if it still matches the plan.
+
+        Single files must keep their size and modification time; a sequence its frame
+        count and the modification time of its first frame.
+        """
+        st = self.stat_cache.stat(entry["path"])
+        if st is None:
+            return "File is gone"
+        seq = self.stat_cache.sequence(entry["path"])
+        if entry.get("frames") is not None:
+            if seq is None or len(seq) != entry["frames"]:
+                return "Frames were added or removed since the plan was made"
+        elif st.st_size != entry["size"]:
+            return "File size changed since the plan was made"
+        if st.st_mtime_ns != entry["mtime"]:
+            return "File was modified since the plan was made"
+        return None
+
+    def apply(self, plan_path: str) -> dict:
+        """Executes a plan file from an earlier run without rescanning; returns the report.
+
+        Every planned file is re-validated with one stat against the plan, and offline
+        clips must still be offline; anything else is skipped. The rest goes through
+        the same journaled move/trash and Media Pool removal as a normal run, using the
+        action and move folder recorded in the plan.
+        """
+        report = self._new_report()
+        report["plan"] = plan_path
+        report["skipped"] = []
+        try:
+            plan = read_plan(plan_path)
+            self.options.action = plan["action"]
+            self.options.folder_name = plan["folder_name"]
+            if not self._options_valid(report):
+                return report
+            report["project"] = plan["project"]
+            pm = self._connect()
+            self.log(f"INFO: Applying plan {plan_path} made {plan['created']} "
+                     f"({plan['project'] or 'multi-project sweep'})")
+            entries = plan["unused"] + plan["orphans"] + plan["missing"]
+            self.stat_cache.prefill([e["path"] for e in entries],
+                                    clip_types={e["path"]: (e["type"] or "").lower() for e in entries})
+
+            def skip(entry, reason):
+                self.log(f"WARNING: {reason} (skipping): {entry['path']}")
+                report["skipped"].append({"path": entry["path"], "reason": reason})
+
+            clips_by_path = {}
+            unused, orphans = [], []
+            for key, found in (("unused", unused), ("orphans", orphans)):
+                for entry in plan[key]:
+                    reason = self._plan_entry_changed(entry)
+                    if reason:
+                        skip(entry, reason)
+                        continue
+                    rec = ClipRecord(None, {"Clip Name": entry["name"], "Type": entry["type"],
+                                            "File Path": entry["path"]})
+                    self.sizes[rec.path] = entry["size"]
+                    clips_by_path[rec.path] = entry["clips"]
+                    found.append((rec, rec.path))
+            missing = []
+            for entry in plan["missing"]:
+                if self.stat_cache.exists(entry["path"]):
+                    skip(entry, "Media is back online")
+                    continue
+                clip = entry["clips"][0]
+                rec = ClipRecord(None, {"Clip Name": entry["name"], "Type": entry["type"],
+                                        "File Path": entry["path"]}, clip["uid"])
+                missing.append((rec, rec.path, clip))
+
+            report["unused"] = [dict(self._report_entry(rec), size=self.sizes[path]) for rec, path in unused]
+            report["missing"] = [self._report_entry(rec) for rec, _, _ in missing]
+            self._log_findings(unused, [(rec, path) for rec, path, _ in missing])
+            if orphans:
+                self.log_list(f"INFO: Orphan media files on disk (not in the Media Pool): {len(orphans)}",
+                              [path for _, path in orphans])
+            if report["skipped"]:
+                self.log(f"WARNING: {len(report['skipped'])} planned entries changed and will be skipped")
+            if not self._confirm_clean(report, len(unused), len(missing), len(orphans), sweep=plan["sweep"]):
+                return report
+
+            identities = {id(rec): clip for rec, _, clip in missing}
+            self._open_journal(report, plan["project"], plan["sweep"])
+            self._journal_offline([(rec, path) for rec, path, _ in missing], lambda rec: identities[id(rec)])
+            handled, summary, errors = self._act_on_files(unused + orphans, lambda rec, path: clips_by_path[path])
+
+            by_project = {}
+            for rec in handled:
+                for clip in clips_by_path[rec.path]:
+                    clip_rec = ClipRecord(None, {"Clip Name": clip["name"], "File Path": rec.path}, clip["uid"])
+                    if self.journal is not None:
+                        self._journal_ids[id(clip_rec)] = self._journal_ids[id(rec)]
+                    by_project.setdefault(self._project_of(clip), []).append(clip_rec)
+            for rec, _, clip in missing:
+                by_project.setdefault(self._project_of(clip), []).append(rec)
+            removed_from_pool, remove_errors = self._remove_from_projects(pm, by_project, set(identities))
+            self._finish_summary(report, summary, len(handled), removed_from_pool, errors + remove_errors,
+                                 sum(self.sizes.get(rec.path, 0) for rec in handled))
+
+        except ResolveConnectionError:
+            raise
+        except Exception as e:
+            self.log(f"FATAL ERROR: {e}")
+            report["error"] = str(e)
+        finally:
+            self._end_report(report)
+        return report
+
+    # --- Undo / resume ---
+
+    def _journal_report(self, journal_path) -> tuple[dict, JournalState]:
+        """Report skeleton plus the parsed journal (the latest one when no path is given)."""
+        report = {"version": APP_VERSION, "status": "error", "journal": None, "errors": 0}
+        path = journal_path or latest_journal()
+        if not path:
+            self.log("WARNING: No cleanup journal found.")
+            report["status"] = "no_journal"
+            return report, None
+        report["journal"] = path
+        self.log(f"INFO: Journal: {path}")
+        return report, read_journal(path)
+
+    def _find_project(self, pm, project: str, folder):
+        """Loads a journaled project: by Project Manager folder if known, else by name."""
+        current = pm.GetCurrentProject()
+        if current and folder is None and current.GetName() == project:
+            return current
+        if current:
+            # Loading another project must not lose unsaved work in the open one
+            pm.SaveProject()
+        if folder is not None:
+            return open_database_project(pm, tuple(folder), project)
+        for f, name in list_database_projects(pm):
+            if name == project:
+                return open_database_project(pm, f, name)
+        return None
+
+    def undo(self, journal_path: str = None) -> dict:
+        """Reverses a move-mode cleanup from its journal.
+
+        Files are moved back in parallel (a file counts as moved while its destination
+        exists and its source does not), then the clips the cleanup removed are
+        re-imported into their original bins with batched ImportMedia calls. Undone
+        plans are journaled, so an interrupted undo can simply be run again.
+        """
+        report = {"version": APP_VERSION, "status": "error"}
+        journal = None
+        try:
+            report, state = self._journal_report(journal_path)
+            if state is None:
+                return report
+            report.update(restored=0, reimported=0)
+            if state.action != ACTION_MOVE:
+                self.log(f"WARNING: That cleanup sent files to {TRASH_NAME}; restore them from there.")
+                report["status"] = "not_undoable"
+                return report
+
+            plans = [plan for n, plan in sorted(state.plans.items()) if plan["files"] and n not in state.undone]
+            jobs, owner = [], []
+            for k, plan in enumerate(plans):
+                for src, dst in plan["files"]:
+                    if dst and os.path.exists(dst) and not os.path.exists(src):
+                        jobs.append((dst, src))
+                        owner.append(k)
+            if not jobs:
+                self.log("INFO: Nothing to undo: no moved files are left in their move folders.")
+                report["status"] = "nothing_to_do"
+                return report
+            if not self.confirm("Confirm Undo", f"Move {len(jobs)} files back to their original folders "
+                                                f"and re-import the clips that were removed. Proceed?"):
+                self.log("INFO: Undo cancelled by user.")
+                report["status"] = "cancelled"
+                return report
+
+            journal = CleanupJournal(report["journal"])
+            progress = _PlanProgress(journal, "undone", [plan["n"] for plan in plans], owner)
+            results = MoveExecutor(self.options.move_workers, self.options.move_per_volume)\
+                .move_all(jobs, on_done=progress.file_done)
+            for (dst, src), (ok, err) in zip(jobs, results):
+                if ok:
+                    report["restored"] += 1
+                else:
+                    self.log(f"ERROR: Could not move back {dst}: {err}")
+                    report["errors"] += 1
+            for directory in {os.path.dirname(dst) for dst, _ in jobs}:
+                try:
+                    os.rmdir(directory)  # Only succeeds once the move folder is empty
+                except OSError:
+                    pass
+            moved_back = set(owner)
+            restored = [plan for k, plan in enumerate(plans) if k in moved_back and progress.ok(k)]
+            for plan in restored:
+                self.log(f"RESTORED: {plan['path']}")
+
+            to_import = {}
+            for plan in restored:
+                files = [src for src, _ in plan["files"]]
+                for clip in plan["clips"]:
+                    if (clip["project"], clip["uid"]) in state.removed:
+                        to_import.setdefault(self._project_of(clip), {}).setdefault(clip["bin"], []).append(
+                            import_item(plan["path"], files))
+            if to_import:
+                try:
+                    report["reimported"], errors = self._reimport(to_import)
+                    report["errors"] += errors
+                except ResolveConnectionError as e:
+                    self.log(f"ERROR: Files were restored but not re-imported: {e}")
+                    report["errors"] += sum(len(items) for bins in to_import.values() for items in bins.values())
+            self.log(f"INFO: Undo: {report['restored']} files moved back, {report['reimported']} clips re-imported, "
+                     f"{report['errors']} errors")
+            report["status"] = "ok"
+        except Exception as e:
+            self.log(f"FATAL ERROR: {e}")
+            report["error"] = str(e)
+        finally:
+            if journal is not None:
+                journal.close()
+            self._end_report(report)
+        return report
+
+    @staticmethod
+    def _project_of(clip: dict) -> tuple:
+        """(project name, Project Manager folder or None) of a journaled or planned clip identity."""
+        return clip["project"], tuple(clip["folder"]) if clip["folder"] is not None else None
+
+    def _remove_from_projects(self, pm, by_project: dict, missing_ids=(),
+                              journal_gone: bool = False) -> tuple[int, int]:
+        """Removes clips from the Media Pool of each {(project, folder): [records]} and saves it.
+
+        The records only carry a unique ID and path; live clips are looked up by ID.
+        With `journal_gone`, clips that are already gone are journaled as removed: a
+        resumed run may have been interrupted between a removal and its record.
+        """
+        removed = errors = 0
+        for (project, folder), records in by_project.items():
+            self.project = self._find_project(pm, project, folder)
+            if not self.project:
+                self.log(f"ERROR: Could not load project to remove clips: {project}")
+                errors += len(records)
+                continue
+            self.media_pool = self.project.GetMediaPool()
+            self.index = None
+            self._folders = None
+            self._journal_project = project
+            if journal_gone:
+                self._resolve_clips(records)
+                for rec in records:
+                    if rec.clip is None:
+                        self.log(f"INFO: Already removed from Media Pool: {rec.path}")
+                        self.journal.write({"op": "removed", "n": self._journal_ids[id(rec)],
+                                            "project": project, "uid": rec.uid})
+                records = [rec for rec in records if rec.clip is not None]
+            self.log(f"INFO: Removing {len(records)} clips from project: {project}")
+            count, remove_errors = self._remove_from_pool(records, [rec for rec in records if id(rec) in missing_ids])
+            removed += count
+            errors += remove_errors
+            pm.SaveProject()
+        return removed, errors
+
+    @profiled("reimport", items=lambda result: result[0])
+    def _reimport(self, to_import: dict) -> tuple[int, int]:
+        """ImportMedia per {(project, folder): {bin: [items]}}; returns (clips imported, failures)."""
+        pm = self._connect()
+        imported = errors = 0
+        for (project, folder), bins in to_import.items():
+            wanted = sum(len(items) for items in bins.values())
+            proj = self._find_project(pm, project, folder)
+            if not proj:
+                self.log(f"ERROR: Could not load project to re-import clips: {project}")
+                errors += wanted
+                continue
+            media_pool = proj.GetMediaPool()
+            root_folder = media_pool.GetRootFolder()
+            for bin_path, items in bins.items():
+                media_pool.SetCurrentFolder(find_bin(media_pool, root_folder, bin_path))
+                added = 0
+                for i in range(0, len(items), IMPORT_BATCH_SIZE):
+                    batch = items[i:i + IMPORT_BATCH_SIZE]
+                    try:
+                        added += len(media_pool.ImportMedia(batch) or [])
+                    except Exception as e:
+                        self.log(f"WARNING: ImportMedia failed: {e}")
+                errors += len(items) - added
+                imported += added
+                self.log(f"INFO: Re-imported {added} of {len(items)} clips into {project}: {bin_path or '(root)'}")
+            pm.SaveProject()
+        return imported, errors
+
+    def resume(self, journal_path: str = None) -> dict:
+        """Finishes an interrupted cleanup from its journal, without rescanning.
+
+        Planned files not handled yet are moved or trashed now (one whose source is
+        already gone counts as handled), then every clip whose files were handled,
+        and every planned offline clip, is removed from its project's Media Pool.
+        """
+        report = {"version": APP_VERSION, "status": "error"}
+        try:
+            report, state = self._journal_report(journal_path)
+            if state is None:
+                return report
+            report.update(processed=0, removed_from_pool=0)
+            handled = {n for n, ok in state.done.items() if ok}
+            todo, jobs, owner = [], [], []
+            for n, plan in sorted(state.plans.items()):
+                if plan["kind"] != "file" or n in state.done:
+                    continue
+                left = [(src, dst) for src, dst in plan["files"] if os.path.exists(src)]
+                if not left:
+                    handled.add(n)
+                    continue
+                for job in left:
+                    jobs.append(job)
+                    owner.append(len(todo))
+                todo.append(plan)
+            offline = [plan for plan in state.plans.values() if plan["kind"] == "offline"]
+            to_remove = [(plan, clip) for plan in offline + [state.plans[n] for n in handled]
+                         for clip in plan["clips"] if (clip["project"], clip["uid"]) not in state.removed]
+            if not jobs and not to_remove:
+                self.log("INFO: That cleanup ran to completion; nothing to resume." if state.ended
+                         else "INFO: Nothing left to resume.")
+                report["status"] = "nothing_to_do"
+                return report
+            action_label = "Move" if state.action == ACTION_MOVE else f"Delete to {TRASH_NAME}"
+            if not self.confirm("Confirm Resume", f"{action_label} {len(jobs)} remaining files and remove "
+                                                  f"{len(to_remove)} clips from the Media Pool. Proceed?"):
+                self.log("INFO: Resume cancelled by user.")
+                report["status"] = "cancelled"
+                return report
+
+            # Connected before any file is touched: without Resolve the clips could not be removed
+            pm = self._connect()
+            self.journal = CleanupJournal(report["journal"])
+            self._journal_ids = {}
+            if jobs:
+                progress = _PlanProgress(self.journal, "done", [plan["n"] for plan in todo], owner)
+                if state.action == ACTION_MOVE:
+                    results = MoveExecutor(self.options.move_workers, self.options.move_per_volume)\
+                        .move_all(jobs, on_done=progress.file_done)
+                else:
+                    results = send_to_trash_batch([src for src, _ in jobs], self.options.trash_batch_size,
+                                                  on_done=progress.file_done)
+                for (src, _), (ok, err) in zip(jobs, results):
+                    if not ok:
+                        self.log(f"ERROR: Processing {src}: {err}")
+                for k, plan in enumerate(todo):
+                    if progress.ok(k):
+                        if state.action == ACTION_MOVE:
+                            self.log(f"MOVED: {plan['path']} -> {os.path.dirname(plan['files'][0][1])}")
+                        else:
+                            self.log(f"DELETED: {plan['path']}")
+                        report["processed"] += 1
+                        to_remove.extend((plan, clip) for clip in plan["clips"])
+                    else:
+                        report["errors"] += 1
+
+            if to_remove:
+                by_project = {}
+                offline_ids = set()
+                for plan, clip in to_remove:
+                    rec = ClipRecord(None, {"Clip Name": clip["name"], "File Path": plan["path"]}, clip["uid"])
+                    self._journal_ids[id(rec)] = plan["n"]
+                    if plan["kind"] == "offline":
+                        offline_ids.add(id(rec))
+                    by_project.setdefault(self._project_of(clip), []).append(rec)
+                removed, errors = self._remove_from_projects(pm, by_project, offline_ids, journal_gone=True)
+                report["removed_from_pool"] += removed
+                report["errors"] += errors
+            self.log(f"INFO: Resume: {report['processed']} files handled, "
+                     f"{report['removed_from_pool']} clips removed from the Media Pool, {report['errors']} errors")
+            report["status"] = "ok"
+        except ResolveConnectionError:
+            raise
+        except Exception as e:
+            self.log(f"FATAL ERROR: {e}")
+            report["error"] = str(e)
+        finally:
+            self._end_report(report)
+        return report
+
+    def _report_entry(self, rec: ClipRecord) -> dict:
+        entry = {"name": rec.name, "uid": rec.uid, "path": rec.path, "kind": rec.kind}
+        seq = self.stat_cache.sequence(rec.path) if self.stat_cache is not None else None
+        if seq is not None:
+            entry["files"] = len(seq)
+        return entry
+
+    def _write_profile(self, report):
+        """Logs stage times and the slowest API methods; writes the JSON profile and Chrome trace."""
+        profile = report["profile"] = self.profiler.to_dict(self.api_calls)
+        top = [f"{name} {st['seconds']:.2f}s" + (f" ({st['items']})" if st["items"] else "")
+               for name, st in profile["stages"].items()]
+        self.log(f"INFO: Stage times: {', '.join(top)}")
+        timed = [(name, m) for name, m in profile.get("api", {}).get("by_method", {}).items() if "p95_ms" in m]
+        if timed:
+            slowest = sorted(timed, key=lambda kv: kv[1]["total_ms"], reverse=True)[:5]
+            self.log("INFO: Slowest API methods (total / p50 / p95): " + ", ".join(
+                f"{name} {m['total_ms']:.0f} / {m['p50_ms']:.2f} / {m['p95_ms']:.2f} ms" for name, m in slowest))
+        for path, data, label in ((self.options.profile_path, profile, "Profile"),
+                                  (self.options.trace_path, self.profiler.chrome_trace(self.api_calls), "Trace")):
+            if not path:
+                continue
+            try:
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=1 if label == "Profile" else None)
+                self.log(f"INFO: {label} written to {path}")
+            except OSError as e:
+                self.log(f"WARNING: Could not write {label.lower()} {path}: {e}")
+
+    def _log_api_calls(self):
+        if not self.api_calls or not self.api_calls.total:
+            return
+        top = sorted(self.api_calls.calls.items(), key=lambda kv: kv[1], reverse=True)[:5]
+        breakdown = ", ".join(f"{name}={n}" for name, n in top)
+        if not self.api_calls.clip_count:
+            self.log(f"INFO: Scripting API calls this run: {self.api_calls.total} ({breakdown})")
+            return
+        per_clip = self.api_calls.total / self.api_calls.clip_count
+        self.log(f"INFO: Scripting API calls this run: {self.api_calls.total} "
+                 f"for {self.api_calls.clip_count} clips ({per_clip:.1f}/clip; {breakdown})")
+
+
+# --- Update Checker ---
+
+UPDATE_URL_ENV = "DRMEDIACLEANER_UPDATE_URL"  # Overrides the release metadata URL (mirrors, local test servers)
+UPDATE_TIMEOUT = 10                           # Seconds to connect and per blocking read
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+DOWNLOAD_PROGRESS_STEP = 10                   # Percent between download progress callbacks
+
+
+class UpdateError(Exception):
+    """Raised when release metadata or an update download can't be fetched or verified."""
+
+
+def update_url() -> str:
+    return os.environ.get(UPDATE_URL_ENV) or GITHUB_API_LATEST
+
+
+def update_cache_path() -> str:
+    """Release metadata and its ETag from the last successful check."""
+    return os.path.join(config_dir(), "update-cache.json")
+
+
+def _open_url(url: str, headers: dict):
+    """urlopen with the system certificates, retried unverified when they are missing
+    (the python.org macOS build ships without them until Install Certificates runs)."""
+    import ssl
+    import urllib.error
+    import urllib.request
+    request = urllib.request.Request(url, headers={"User-Agent": f"DRMediaCleaner/{APP_VERSION}", **headers})
+    try:
+        return urllib.request.urlopen(request, timeout=UPDATE_TIMEOUT, context=ssl.create_default_context())
+    except urllib.error.URLError as e:
+        if "CERTIFICATE_VERIFY_FAILED" not in str(e):
+            raise
+        return urllib.request.urlopen(request, timeout=UPDATE_TIMEOUT, context=ssl._create_unverified_context())
+
+
+def fetch_latest_release(url: str = None, cache_path: str = None) -> tuple[dict, bool]:
+    """Latest release metadata as (release, changed).
+
+    The request carries the cached ETag, so when nothing was published since the
+    last check the server answers 304 without a body and the cached metadata is
+    returned with changed=False.
+    """
+    import urllib.error
+    url = url or update_url()
+    cache_path = cache_path or update_cache_path()
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("url") != url or not isinstance(cached.get("release"), dict):
+            cached = None
+    except (OSError, ValueError, AttributeError):
+        cached = None
+
+    headers = {"Accept": "application/vnd.github+json"}
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    try:
+        with _open_url(url, headers) as resp:
+            release = json.loads(resp.read().decode("utf-8"))
+            etag = resp.headers.get("ETag")
+    except urllib.error.HTTPError as e:
+        e.close()
+        if e.code == 304 and cached:
+            return cached["release"], False
+        raise UpdateError(f"HTTP {e.code} {e.reason}") from e
+    except (OSError, ValueError) as e:  # URLError, timeouts, resets, bad JSON
+        raise UpdateError(str(getattr(e, "reason", e))) from e
+    if not isinstance(release, dict):
+        raise UpdateError("Unexpected release metadata")
+    if etag:
+        try:
+            write_json_atomic({"url": url, "etag": etag, "release": release}, cache_path)
+        except OSError:
+            pass  # The next check just downloads the metadata again
+    return release, True
 
-APP_VERSION = "2.0.0"
-GITHUB_API_LATEST = "https://api.github.com/repos/groovelanddesigns/davinciresolveunusedmediacleaner/releases/latest"
 
-# OS Detection
-IS_WINDOWS = sys.platform.startswith('win')
-IS_MAC = sys.platform.startswith('darwin')
+def release_version(release: dict) -> str:
+    return (release.get("tag_name") or "").lstrip("v").strip()
 
-# Dynamic UI & Paths based on OS
-if IS_WINDOWS:
-    TRASH_NAME = "Recycle Bin"
-    RESOLVE_MODULE_PATH = r"C:\ProgramData\Blackmagic Design\DaVinci Resolve\Support\Developer\Scripting\Modules"
-    import ctypes
-    from ctypes.wintypes import HWND, LPCWSTR, UINT
-elif IS_MAC:
-    TRASH_NAME = "Trash"
-    RESOLVE_MODULE_PATH = "/Library/Application Support/Blackmagic Design/DaVinci Resolve/Developer/Scripting/Modules"
-else:
-    TRASH_NAME = "Trash"
-    RESOLVE_MODULE_PATH = "" # Linux fallback if needed
 
-if RESOLVE_MODULE_PATH and RESOLVE_MODULE_PATH not in sys.path and os.path.isdir(RESOLVE_MODULE_PATH):
-    sys.path.append(RESOLVE_MODULE_PATH)
+def version_tuple(v: str) -> tuple:
+    return tuple(int(p) for p in v.split(".") if p.isdigit())
 
-try:
-    import DaVinciResolveScript
-except Exception:
-    print("ERROR: Could not import DaVinciResolveScript. Check scripting module path or ensure Resolve is installed.")
-    sys.exit(1)
 
+def is_newer_version(latest: str, current: str = APP_VERSION) -> bool:
+    latest_t, current_t = version_tuple(latest), version_tuple(current)
+    if latest_t and current_t:
+        return latest_t > current_t
+    return latest > current
 
-# --- OS-Specific Trash Implementations ---
 
-def move_to_recycle_bin_win(path: str) -> tuple[bool, str]:
-    if not IS_WINDOWS: return False, "Not Windows"
-    class SHFILEOPSTRUCT(ctypes.Structure):
-        _fields_ = [
-            ("hwnd", HWND),
-            ("wFunc", UINT),
-            ("pFrom", LPCWSTR),
-            ("pTo", LPCWSTR),
-            ("fFlags", ctypes.c_uint),
-            ("fAnyOperationsAborted", ctypes.c_bool),
-            ("hNameMappings", ctypes.c_void_p),
-            ("lpszProgressTitle", LPCWSTR),
-        ]
-    FO_DELETE = 3
-    FOF_ALLOWUNDO = 0x0040
-    FOF_NOCONFIRMATION = 0x0010
-    FOF_SILENT = 0x0004
-    flags = FOF_ALLOWUNDO | FOF_NOCONFIRMATION | FOF_SILENT
-    pfrom = os.path.abspath(path) + "\0\0"
-    op = SHFILEOPSTRUCT()
-    op.hwnd = None
-    op.wFunc = FO_DELETE
-    op.pFrom = pfrom
-    op.pTo = None
-    op.fFlags = flags
-    op.fAnyOperationsAborted = False
-    op.hNameMappings = None
-    op.lpszProgressTitle = None
-    ret = ctypes.windll.shell32.SHFileOperationW(ctypes.byref(op))
-    return (ret == 0, "" if ret == 0 else f"SHFileOperationW returned code {ret}")
+def pick_release_asset(release: dict):
+    """The release zip for this OS as (name, url, size), or None.
 
-def move_to_trash_mac(path: str) -> tuple[bool, str]:
-    if not IS_MAC: return False, "Not macOS"
+    The macOS build has "macOS" in its file name; Windows takes the other zip.
+    """
+    for a in release.get("assets", []) or []:
+        name = a.get("name") or ""
+        url = a.get("browser_download_url")
+        lower = name.lower()
+        if not name or not url:
+            continue
+        if not (lower.endswith(".zip") and "python" not in lower and "drmediacleaner" in lower):
+            continue
+        if (IS_MAC and "macos" in lower) or (IS_WINDOWS and "macos" not in lower):
+            return name, url, a.get("size") or None
+    return None
+
+
+def download_update(url: str, dst: str, expected_size: int = None, progress=None) -> str:
+    """Streams url into dst + ".part" and renames it to dst once complete; returns dst.
+
+    A .part file left by an interrupted download is resumed with a Range request
+    (a server that ignores the range sends the whole file and it starts over). The
+    size is checked against `expected_size`, or the length the server announced,
+    before the rename; a short file is kept for the next attempt to resume.
+    progress(done_bytes, total_bytes) is called every DOWNLOAD_PROGRESS_STEP percent.
+    """
+    import urllib.error
+    part = dst + ".part"
     try:
-        abs_path = os.path.abspath(path)
-        escaped_path = abs_path.replace('\\', '\\\\').replace('"', '\\"')
-        script = f'tell application "Finder" to move POSIX file "{escaped_path}" to trash'
-        result = subprocess.run(['osascript', '-e', script], capture_output=True, text=True)
-        if result.returncode == 0:
-            return True, ""
-        else:
-            return False, result.stderr.strip() or "Unknown AppleScript error"
-    except Exception as e:
-        return False, str(e)
+        offset = os.path.getsize(part)
+    except OSError:
+        offset = 0
+    if expected_size and offset > expected_size:
+        os.unlink(part)
+        offset = 0
 
-def send_to_trash(path: str) -> tuple[bool, str]:
-    """Router function to send to the correct native trash."""
-    if IS_WINDOWS:
-        return move_to_recycle_bin_win(path)
-    elif IS_MAC:
-        return move_to_trash_mac(path)
-    else:
-        return False, "Unsupported OS for native trash implementation."
+    total = expected_size
+    try:
+        resp = _open_url(url, {"Range": f"bytes={offset}-"} if offset else {})
+    except urllib.error.HTTPError as e:
+        e.close()
+        if e.code != 416 or not offset:
+            raise UpdateError(f"HTTP {e.code} {e.reason}") from e
+        resp = None  # Range starts at the end: the .part file may already be complete
+        if not total:
+            os.unlink(part)
+            raise UpdateError("Could not verify the partial download; it will restart on the next try") from e
+    except OSError as e:
+        raise UpdateError(str(getattr(e, "reason", e))) from e
+
+    if resp is not None:
+        with resp:
+            if resp.status == 206:
+                m = re.match(r"bytes (\d+)-\d+/(\d+|\*)", resp.headers.get("Content-Range") or "")
+                if not m or int(m.group(1)) != offset:
+                    raise UpdateError("Server resumed the download at the wrong offset")
+                if not total and m.group(2) != "*":
+                    total = int(m.group(2))
+                mode = "ab"
+            else:
+                offset = 0
+                length = resp.headers.get("Content-Length")
+                if not total and length and length.isdigit():
+                    total = int(length)
+                mode = "wb"
+            done = offset
+            next_report = done + (total or 0) * DOWNLOAD_PROGRESS_STEP // 100
+            try:
+                with open(part, mode) as out:
+                    while True:
+                        chunk = resp.read(DOWNLOAD_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        out.write(chunk)
+                        done += len(chunk)
+                        if progress and total and done >= next_report:
+                            progress(done, total)
+                            next_report = done + total * DOWNLOAD_PROGRESS_STEP // 100
+            except Exception as e:  # Resets, timeouts and IncompleteRead all leave a resumable .part
+                raise UpdateError(f"Download interrupted after {done} bytes ({e}); "
+                                  f"it resumes on the next try") from e
+
+    size = os.path.getsize(part)
+    if total and size != total:
+        if size > total or resp is None:
+            os.unlink(part)
+        raise UpdateError(f"Downloaded {size} of {total} bytes; it resumes on the next try")
+    os.replace(part, dst)
+    return dst
 
 
 # --- Main Application ---
 
+LOG_DRAIN_MS = 100         # How often the Tk main loop drains queued log lines
+LOG_MAX_LINES = 5000       # Lines kept in the log widget; the log file has everything
+LOG_LIST_PREVIEW = 50      # Paths shown per list before collapsing into the log file
+
+def _import_tk():
+    """Loads tkinter on first use so headless runs never import it."""
+    global tk, Tk, Button, Checkbutton, IntVar, Text, Scrollbar, END
+    global Label, Entry, messagebox, Radiobutton, DISABLED, NORMAL
+    global Toplevel, ttk, filedialog
+    import tkinter as tk
+    from tkinter import (
+        Tk, Button, Checkbutton, IntVar, Text, Scrollbar, END,
+        Label, Entry, messagebox, Radiobutton, DISABLED, NORMAL,
+        Toplevel, ttk, filedialog
+    )
+
+
 class UnusedMediaCleanerGUI:
-    def __init__(self, root: Tk):
+    def __init__(self, root: "Tk"):
         self.root = root
         self.root.title("DaVinci Resolve Unused Media Cleaner")
         self.root.geometry("980x780")
@@ -130,6 +4312,12 @@ class UnusedMediaCleanerGUI:
         Label(root, text="Options:").pack(anchor='w', padx=10, pady=(10, 5))
         Checkbutton(root, text="Dry Run (no move/delete or Media Pool removal)", variable=self.dry_run_var)\
             .pack(anchor='w', padx=20)
+        self.sweep_var = IntVar(value=0)
+        Checkbutton(root, text="All projects in database (only clean media unused by every project)",
+                    variable=self.sweep_var).pack(anchor='w', padx=20)
+        self.use_cache_var = IntVar(value=1)
+        Checkbutton(root, text="Reuse cached results for unchanged timelines and bins",
+                    variable=self.use_cache_var).pack(anchor='w', padx=20)
 
         Label(root, text="Action for unused media:").pack(anchor='w', padx=10, pady=(12, 0))
         Radiobutton(root, text="Move to folder", variable=self.action_var, value=1,
@@ -154,8 +4342,25 @@ class UnusedMediaCleanerGUI:
         Checkbutton(root, text="Graphics / Images", variable=self.include_images).pack(anchor='w', padx=20)
         Checkbutton(root, text="Other file types", variable=self.include_other).pack(anchor='w', padx=20)
 
+        self.orphans_var = IntVar(value=0)
+        Checkbutton(root, text="Also find orphan media files on disk (not in the Media Pool)",
+                    variable=self.orphans_var).pack(anchor='w', padx=10, pady=(12, 0))
+        row = tk.Frame(root)
+        row.pack(anchor='w', padx=20, pady=(2, 5), fill='x')
+        Label(row, text="Search folders (';'-separated, blank = Media Pool folders only):").pack(side='left')
+        self.orphan_roots_entry = Entry(row, width=40)
+        self.orphan_roots_entry.pack(side='left', padx=6)
+        self.duplicates_var = IntVar(value=0)
+        Checkbutton(root, text="Report duplicate files (same content imported from several places)",
+                    variable=self.duplicates_var).pack(anchor='w', padx=10)
+        self.fast_var = IntVar(value=0)
+        Checkbutton(root, text="Fast scan (trust Resolve's Usage counts; check only clips to be removed)",
+                    variable=self.fast_var).pack(anchor='w', padx=10)
+
         self.scan_button = Button(root, text="Scan & Clean Unused Media", command=self.start_scan, height=2)
-        self.scan_button.pack(pady=12)
+        self.scan_button.pack(pady=(12, 4))
+        self.apply_button = Button(root, text="Apply Last Dry Run", command=self.start_apply, state=DISABLED)
+        self.apply_button.pack(pady=(0, 12))
 
         # Log area (expandable)
         self.log_text = Text(root, wrap='word', height=8)
@@ -167,16 +4372,36 @@ class UnusedMediaCleanerGUI:
         # Footer fixed at bottom (always visible)
         footer = tk.Frame(root)
         footer.pack(side='bottom', fill='x', padx=10, pady=8)
-        Button(footer, text="Check for Updates", command=self.check_for_updates).pack(side='left')
+        self.update_button = Button(footer, text="Check for Updates", command=self.check_for_updates)
+        self.update_button.pack(side='left')
+        Button(footer, text="Open Full Log", command=self.open_log_file).pack(side='left', padx=6)
+        self.space_button = Button(footer, text="Space Report", command=self.show_space_report, state=DISABLED)
+        self.space_button.pack(side='left')
+        self.undo_button = Button(footer, text="Undo Last Cleanup", command=self.start_undo)
+        self.undo_button.pack(side='left', padx=6)
         
         # version label bottom-right
         ver_label = Label(footer, text=f"v{APP_VERSION}", anchor='e', fg='gray')
         ver_label.pack(side='right')
 
-        # Resolve handles
-        self.resolve = None
-        self.project = None
-        self.media_pool = None
+        # Worker threads never touch Tk: log lines and UI calls are queued for the main loop
+        self._log_queue = queue.Queue()
+        self._ui_calls = queue.Queue()
+        self._log_file = None
+        self._log_file_path = None
+        self._log_lock = threading.Lock()
+        self.root.after(LOG_DRAIN_MS, self._drain_queues)
+
+        self.engine = None
+        self.last_report = None
+        self.scan_cache = ProjectScanCache()
+        # Connected on the first scan and reused by every later one
+        self.session = ResolveSession()
+        self.delete_batch_size = DELETE_BATCH_SIZE
+        self.trash_batch_size = TRASH_BATCH_SIZE
+        self.move_workers = MOVE_WORKERS
+        self.move_per_volume = MOVE_PER_VOLUME
+        self.timeline_workers = TIMELINE_WORKERS
 
     def _toggle_folder_entry(self):
         if self.action_var.get() == 2:
@@ -185,482 +4410,282 @@ class UnusedMediaCleanerGUI:
             self.unused_folder_entry.config(state=NORMAL)
 
     def log(self, msg: str):
-        self.log_text.insert(END, msg + "\n")
-        self.log_text.see(END)
-        self.root.update_idletasks()
+        """Thread-safe: streams to the log file and queues the line for the widget."""
+        self._write_log_file(msg)
+        self._log_queue.put(msg)
 
-    def start_scan(self):
-        self.scan_button.config(state="disabled")
-        self.log_text.delete('1.0', END)
-        threading.Thread(target=self.scan_and_clean, daemon=True).start()
+    def log_list(self, header: str, items):
+        """Logs a path list in full to the file, but only a preview to the widget."""
+        items = list(items)
+        self._write_log_file(header)
+        for item in items:
+            self._write_log_file(f" - {item}")
+        lines = [header] + [f" - {item}" for item in items[:LOG_LIST_PREVIEW]]
+        if len(items) > LOG_LIST_PREVIEW:
+            lines.append(f"   ... {len(items) - LOG_LIST_PREVIEW} more (see Open Full Log)")
+        for line in lines:
+            self._log_queue.put(line)
 
-    def _collect_filepaths_from_timeline(self, timeline, out_set, depth=0):
-        if not timeline or depth > 8:
-            return
-        for track_type in ("video", "audio"):
-            try:
-                if not hasattr(timeline, "GetTrackCount") or not callable(timeline.GetTrackCount):
-                    continue
-                track_count = timeline.GetTrackCount(track_type) or 0
-            except Exception:
-                track_count = 0
-            for ti in range(1, track_count + 1):
-                try:
-                    items = timeline.GetItemsInTrack(track_type, ti) or {}
-                except Exception:
-                    items = {}
-                for _, item in items.items():
-                    try:
-                        mpi = item.GetMediaPoolItem()
-                    except Exception:
-                        mpi = None
-                    if not mpi:
-                        continue
-                    try:
-                        fp = mpi.GetClipProperty("File Path")
-                    except Exception:
-                        fp = None
-                    if fp and os.path.exists(fp):
-                        out_set.add(os.path.normpath(fp))
+    def _write_log_file(self, msg: str):
+        with self._log_lock:
+            if self._log_file is not None:
+                self._log_file.write(msg + "\n")
 
-                    try:
-                        ctype = (mpi.GetClipProperty("Type") or "").lower()
-                    except Exception:
-                        ctype = ""
-                    if any(x in ctype for x in ("compound", "fusion", "multicam", "timeline")):
-                        inner = None
-                        for attr in ("GetTimeline", "GetSourceTimeline"):
-                            try:
-                                fn = getattr(mpi, attr, None)
-                                if callable(fn):
-                                    inner = fn()
-                                else:
-                                    inner = fn
-                                if inner:
-                                    break
-                            except Exception:
-                                inner = None
-                        if not inner:
-                            try:
-                                inner = self.project.GetTimelineByName(mpi.GetName())
-                            except Exception:
-                                inner = None
-                        if inner:
-                            self._collect_filepaths_from_timeline(inner, out_set, depth + 1)
-
-    def _discover_compound_children(self, mpi):
-        found = set()
-        for attr in ("GetTimeline", "GetSourceTimeline"):
+    def _open_run_log(self):
+        with self._log_lock:
+            if self._log_file is not None:
+                self._log_file.close()
+                self._log_file = None
             try:
-                fn = getattr(mpi, attr, None)
-                if callable(fn):
-                    tl = fn()
-                else:
-                    tl = fn
-                if tl:
-                    self._collect_filepaths_from_timeline(tl, found)
-            except Exception:
-                pass
-        try:
-            for prop in ("Children", "ChildClips", "Clips"):
-                try:
-                    val = mpi.GetClipProperty(prop)
-                except Exception:
-                    val = None
-                if not val:
-                    continue
-                if isinstance(val, str):
-                    parts = [p.strip() for p in val.replace(";", ",").split(",") if p.strip()]
-                    for p in parts:
-                        if os.path.exists(p):
-                            found.add(os.path.normpath(p))
-                elif isinstance(val, (list, tuple, set)):
-                    for el in val:
-                        try:
-                            if hasattr(el, "GetClipProperty"):
-                                fp = el.GetClipProperty("File Path")
-                                if fp:
-                                    found.add(os.path.normpath(fp))
-                            elif isinstance(el, str) and os.path.exists(el):
-                                found.add(os.path.normpath(el))
-                        except Exception:
-                            pass
-        except Exception:
-            pass
-        try:
-            if hasattr(mpi, "GetMetadata"):
-                md = mpi.GetMetadata() or {}
-                for k, v in md.items():
-                    if isinstance(v, str) and os.path.exists(v):
-                        found.add(os.path.normpath(v))
-        except Exception:
-            pass
-        return found
+                log_dir = os.path.join(config_dir(), "logs")
+                os.makedirs(log_dir, exist_ok=True)
+                self._log_file_path = os.path.join(log_dir, time.strftime("run-%Y%m%d-%H%M%S.log"))
+                self._log_file = open(self._log_file_path, "w", encoding="utf-8", buffering=1)
+            except OSError:
+                self._log_file_path = None
 
-    def _find_media_pool_item_by_name(self, name):
-        if not self.media_pool:
-            return None
-        try:
-            root = self.media_pool.GetRootFolder()
-        except Exception:
-            return None
-        stack = [root]
-        while stack:
-            folder = stack.pop()
-            try:
-                clips = folder.GetClips() or {}
-            except Exception:
-                clips = {}
-            for _, c in clips.items():
-                try:
-                    if c.GetName() == name:
-                        return c
-                except Exception:
-                    pass
-            try:
-                subs = folder.GetSubFolders() or {}
-                for _, sf in subs.items():
-                    stack.append(sf)
-            except Exception:
-                pass
-        return None
+    def _close_run_log(self):
+        with self._log_lock:
+            if self._log_file is not None:
+                self._log_file.close()
+                self._log_file = None
 
-    def scan_and_clean(self):
+    def open_log_file(self):
+        path = self._log_file_path
+        if not path or not os.path.exists(path):
+            messagebox.showinfo("Log File", "No log file has been written yet.")
+            return
         try:
-            folder_name = self.unused_folder_entry.get().strip()
-            if self.action_var.get() == 1 and not folder_name:
-                self.log("WARNING: Unused folder name cannot be empty.")
-                self.scan_button.config(state="normal")
-                return
-
-            self.log("INFO: Checking DaVinci Resolve scripting preferences...")
-            self.resolve = DaVinciResolveScript.scriptapp("Resolve")
-            if not self.resolve:
-                messagebox.showerror("Connection Failed",
-                    "Could not connect to DaVinci Resolve. Ensure Resolve is running and External Scripting enabled.")
-                self.scan_button.config(state="normal")
-                return
+            if IS_WINDOWS:
+                os.startfile(path)
+            else:
+                import subprocess
+                subprocess.Popen(["open" if IS_MAC else "xdg-open", path])
+        except Exception as e:
+            messagebox.showinfo("Log File", f"Full log: {path}\n({e})")
 
-            pm = self.resolve.GetProjectManager()
-            self.project = pm.GetCurrentProject()
-            if not self.project:
-                self.log("WARNING: No project open.")
-                self.scan_button.config(state="normal")
-                return
+    def _drain_queues(self):
+        """Runs on the Tk main loop: applies queued UI calls and appends log lines in one batch."""
+        while True:
+            try:
+                fn, args, kwargs, done, result = self._ui_calls.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                result.append(fn(*args, **kwargs))
+            except Exception as e:
+                result.append(e)
+            done.set()
 
-            self.media_pool = self.project.GetMediaPool()
-            root_folder = self.media_pool.GetRootFolder()
+        lines = []
+        while len(lines) < LOG_MAX_LINES:
+            try:
+                lines.append(self._log_queue.get_nowait())
+            except queue.Empty:
+                break
+        if lines:
+            self.log_text.insert(END, "\n".join(lines) + "\n")
+            excess = int(self.log_text.index("end-1c").split(".")[0]) - 1 - LOG_MAX_LINES
+            if excess > 0:
+                self.log_text.delete("1.0", f"{excess + 1}.0")
+            self.log_text.see(END)
+        self.root.after(LOG_DRAIN_MS, self._drain_queues)
 
-            all_file_clips = []
-            def gather_file_clips(folder):
-                clips = folder.GetClips() or {}
-                for _, c in clips.items():
-                    try:
-                        ctype = (c.GetClipProperty("Type") or "").lower()
-                    except Exception:
-                        ctype = ""
-                    if any(x in ctype for x in ("compound", "fusion", "multicam", "timeline")):
-                        continue
-                    try:
-                        fp = c.GetClipProperty("File Path")
-                    except Exception:
-                        fp = None
-                    if fp:
-                        all_file_clips.append(c)
-                for _, sf in (folder.GetSubFolders() or {}).items():
-                    gather_file_clips(sf)
-            gather_file_clips(root_folder)
-
-            self.log(f"INFO: Current project: {self.project.GetName()}")
-            self.log(f"INFO: Total eligible clips in Media Pool: {len(all_file_clips)}")
-
-            used_paths = set()
-            idx = 1
-            while True:
-                tl = self.project.GetTimelineByIndex(idx)
-                if not tl:
-                    break
-                try:
-                    self.log(f"INFO: Scanning timeline (including compounds): {tl.GetName()}")
-                except Exception:
-                    self.log("INFO: Scanning unnamed timeline (including compounds)")
-                self._collect_filepaths_from_timeline(tl, used_paths)
-                idx += 1
+    def _on_main(self, fn, *args, **kwargs):
+        """Runs fn on the Tk main thread and returns its result (blocks a worker thread)."""
+        if threading.current_thread() is threading.main_thread():
+            return fn(*args, **kwargs)
+        done = threading.Event()
+        result = []
+        self._ui_calls.put((fn, args, kwargs, done, result))
+        done.wait()
+        if isinstance(result[0], Exception):
+            raise result[0]
+        return result[0]
 
-            usage_protected = set()
-            for clip in all_file_clips:
-                try:
-                    usage = clip.GetClipProperty("Usage")
-                except Exception:
-                    usage = None
-                try:
-                    if usage is not None and str(usage).isdigit() and int(usage) > 0:
-                        fp = clip.GetClipProperty("File Path")
-                        if fp:
-                            usage_protected.add(os.path.normpath(fp))
-                except Exception:
-                    pass
-            if usage_protected:
-                used_paths.update(usage_protected)
-                self.log(f"INFO: Protected {len(usage_protected)} clips (Usage > 0).")
+    def start_scan(self):
+        self.scan_button.config(state="disabled")
+        self.apply_button.config(state="disabled")
+        self.log_text.delete('1.0', END)
+        self._open_run_log()
+        # Tk variables are read here, on the main thread, before the worker starts
+        threading.Thread(target=self.scan_and_clean, daemon=True,
+                         args=(self._build_options(), bool(self.sweep_var.get()))).start()
 
-            def protect_from_compounds(folder):
-                clips = folder.GetClips() or {}
-                for _, c in clips.items():
-                    try:
-                        ctype = (c.GetClipProperty("Type") or "").lower()
-                    except Exception:
-                        ctype = ""
-                    if any(x in ctype for x in ("compound", "fusion", "multicam", "timeline")):
-                        try:
-                            protected = self._discover_compound_children(c)
-                        except Exception:
-                            protected = set()
-                        if protected:
-                            used_paths.update(protected)
-                            try:
-                                cname = c.GetName()
-                            except Exception:
-                                cname = "<compound>"
-                            self.log(f"INFO: Protected {len(protected)} clips inside compound: {cname}")
-                for _, sf in (folder.GetSubFolders() or {}).items():
-                    protect_from_compounds(sf)
-            protect_from_compounds(root_folder)
-
-            self.log(f"INFO: Total used clip file paths (including Usage & compound discovery): {len(used_paths)}")
-
-            final_candidates = []
-            for clip in all_file_clips:
-                try:
-                    ctype = (clip.GetClipProperty("Type") or "").lower()
-                except Exception:
-                    ctype = ""
-                is_video = "video" in ctype
-                is_audio = "audio" in ctype
-                is_image = ctype in ("still", "image")
-                is_other = not (is_video or is_audio or is_image)
-                if is_video and not self.include_video.get():
-                    continue
-                if is_audio and not self.include_audio.get():
-                    continue
-                if is_image and not self.include_images.get():
-                    continue
-                if is_other and not self.include_other.get():
-                    continue
-                final_candidates.append(clip)
+    def start_apply(self):
+        self.scan_button.config(state="disabled")
+        self.apply_button.config(state="disabled")
+        self.log_text.delete('1.0', END)
+        self._open_run_log()
+        options = self._build_options()
+        options.dry_run = False
+        threading.Thread(target=self.apply_last_plan, daemon=True, args=(options,)).start()
 
-            unused_clips = []
-            missing_clips = []
-            for clip in final_candidates:
-                try:
-                    fp = clip.GetClipProperty("File Path")
-                except Exception:
-                    fp = None
-                if not fp:
-                    continue
-                norm = os.path.normpath(fp)
-                if not os.path.exists(norm):
-                    missing_clips.append((clip, norm))
-                elif norm not in used_paths:
-                    unused_clips.append((clip, norm))
-
-            self.log(f"INFO: Unused clips found: {len(unused_clips)}")
-            for _, p in unused_clips:
-                self.log(f" - {p}")
-            self.log(f"INFO: Missing clips found: {len(missing_clips)}")
-            for _, p in missing_clips:
-                self.log(f" - {p}")
-
-            if not unused_clips and not missing_clips:
-                self.log("INFO: No unused or missing media found.")
-                self.scan_button.config(state="normal")
-                return
+    def apply_last_plan(self, options: ScanOptions):
+        """Cleans up what the last dry run found, re-validating each file instead of rescanning."""
+        confirm = lambda title, message: self._on_main(messagebox.askyesno, title, message)
+        self.engine = CleanerEngine(options, log=self.log, confirm=confirm, log_list=self.log_list,
+                                    session=self.session)
+        try:
+            self.last_report = self.engine.apply(default_plan_path())
+        except ResolveConnectionError as e:
+            self._on_main(messagebox.showerror, "Connection Failed", str(e))
+        finally:
+            self._close_run_log()
+        self._on_main(self.scan_button.config, state="normal")
 
-            if self.dry_run_var.get():
-                self.log("INFO: Dry Run - no changes will be made.")
-                self.scan_button.config(state="normal")
-                return
+    def start_undo(self):
+        self.scan_button.config(state="disabled")
+        self.undo_button.config(state="disabled")
+        self.log_text.delete('1.0', END)
+        self._open_run_log()
+        threading.Thread(target=self.undo_last, daemon=True, args=(self._build_options(),)).start()
 
-            action_label = "Move to folder" if self.action_var.get() == 1 else f"Delete to {TRASH_NAME}"
-            proceed = messagebox.askyesno("Confirm Clean",
-                                          f"{action_label} {len(unused_clips)} unused files and remove {len(missing_clips)} missing clips. Proceed?")
-            if not proceed:
-                self.log("INFO: Operation cancelled by user.")
-                self.scan_button.config(state="normal")
-                return
+    def undo_last(self, options: ScanOptions):
+        """Reverses the most recent move-mode cleanup (files back, clips re-imported)."""
+        confirm = lambda title, message: self._on_main(messagebox.askyesno, title, message)
+        self.engine = CleanerEngine(options, log=self.log, confirm=confirm, session=self.session)
+        try:
+            self.engine.undo()
+        finally:
+            self._close_run_log()
+        self._on_main(self.scan_button.config, state="normal")
+        self._on_main(self.undo_button.config, state="normal")
 
-            moved_or_deleted = 0
-            removed_from_pool = 0
-            errors = 0
-            summary = {"video":0, "audio":0, "image":0, "other":0}
+    def _build_options(self) -> ScanOptions:
+        return ScanOptions(
+            dry_run=self.dry_run_var.get(),
+            action=ACTION_MOVE if self.action_var.get() == 1 else ACTION_TRASH,
+            folder_name=self.unused_folder_entry.get(),
+            include={
+                "video": self.include_video.get(),
+                "audio": self.include_audio.get(),
+                "image": self.include_images.get(),
+                "other": self.include_other.get(),
+            },
+            delete_batch_size=self.delete_batch_size,
+            trash_batch_size=self.trash_batch_size,
+            move_workers=self.move_workers,
+            move_per_volume=self.move_per_volume,
+            timeline_workers=self.timeline_workers,
+            use_cache=self.use_cache_var.get(),
+            find_orphans=self.orphans_var.get(),
+            orphan_roots=[r.strip() for r in self.orphan_roots_entry.get().split(";")],
+            find_duplicates=self.duplicates_var.get(),
+            plan_path=default_plan_path() if self.dry_run_var.get() else None,
+            strategy=SCAN_FAST if self.fast_var.get() else SCAN_FULL,
+        )
 
-            for clip, path in unused_clips:
-                if not os.path.exists(path):
-                    self.log(f"WARNING: File not found (skipping): {path}")
-                    errors += 1
-                    continue
-                try:
-                    ctype = (clip.GetClipProperty("Type") or "").lower()
-                except Exception:
-                    ctype = ""
-                if "video" in ctype:
-                    summary["video"] += 1
-                elif "audio" in ctype:
-                    summary["audio"] += 1
-                elif ctype in ("still", "image"):
-                    summary["image"] += 1
-                else:
-                    summary["other"] += 1
+    def scan_and_clean(self, options: ScanOptions, sweep: bool = False):
+        confirm = lambda title, message: self._on_main(messagebox.askyesno, title, message)
+        self.engine = CleanerEngine(options, log=self.log, confirm=confirm, scan_cache=self.scan_cache,
+                                    log_list=self.log_list, session=self.session)
+        try:
+            if sweep:
+                self.last_report = self.engine.run_sweep()
+            else:
+                self.last_report = self.engine.run()
+        except ResolveConnectionError as e:
+            self._on_main(messagebox.showerror, "Connection Failed", str(e))
+        finally:
+            self._close_run_log()
+        self._on_main(self.scan_button.config, state="normal")
+        planned = self.last_report and self.last_report.get("status") == "dry_run" and self.last_report.get("plan")
+        self._on_main(self.apply_button.config, state="normal" if planned else "disabled")
+        if self.last_report and self.last_report.get("reclaimable"):
+            self._on_main(self.space_button.config, state="normal")
 
-                try:
-                    if self.action_var.get() == 1:
-                        parent = os.path.dirname(path)
-                        dest_dir = os.path.join(parent, folder_name)
-                        os.makedirs(dest_dir, exist_ok=True)
-                        shutil.move(path, os.path.join(dest_dir, os.path.basename(path)))
-                        self.log(f"MOVED: {path} -> {dest_dir}")
-                    else:
-                        # Unified trash function call here
-                        ok, err = send_to_trash(path)
-                        if ok:
-                            self.log(f"DELETED: {path} to {TRASH_NAME}")
-                        else:
-                            self.log(f"ERROR: {TRASH_NAME} failed for {path}: {err}")
-                            errors += 1
-                            continue
+    def show_space_report(self):
+        """Top-N reclaimable space per type, volume, bin and folder from the last scan."""
+        reclaimable = (self.last_report or {}).get("reclaimable")
+        if not reclaimable:
+            return
+        win = Toplevel(self.root)
+        win.title("Reclaimable Space")
+        win.geometry("820x460")
+        Label(win, text=f"Reclaimable: {format_bytes(reclaimable['bytes'])} in {reclaimable['files']} files")\
+            .pack(anchor='w', padx=10, pady=(10, 4))
+        tabs = ttk.Notebook(win)
+        tabs.pack(fill='both', expand=True, padx=10)
+        for group, title in SPACE_GROUPS:
+            frame = tk.Frame(tabs)
+            tree = ttk.Treeview(frame, columns=("key", "size", "files"), show="headings")
+            tree.heading("key", text=title)
+            tree.heading("size", text="Size")
+            tree.heading("files", text="Files")
+            tree.column("key", width=540)
+            tree.column("size", width=110, anchor='e')
+            tree.column("files", width=80, anchor='e')
+            for row in reclaimable[f"by_{group}"][:SPACE_REPORT_TOP]:
+                tree.insert("", END, values=(row["key"], format_bytes(row["bytes"]), row["files"]))
+            bar = Scrollbar(frame, command=tree.yview)
+            tree.config(yscrollcommand=bar.set)
+            bar.pack(side='right', fill='y')
+            tree.pack(fill='both', expand=True)
+            tabs.add(frame, text=title)
 
-                    moved_or_deleted += 1
-                    try:
-                        if self.media_pool.DeleteClips([clip]):
-                            removed_from_pool += 1
-                    except Exception:
-                        pass
-                except Exception as e:
-                    self.log(f"ERROR: Processing {path}: {e}")
-                    errors += 1
-
-            for clip, path in missing_clips:
+        def export():
+            path = filedialog.asksaveasfilename(parent=win, defaultextension=".csv",
+                                                filetypes=[("CSV", "*.csv"), ("JSON", "*.json")])
+            if path:
                 try:
-                    if self.media_pool.DeleteClips([clip]):
-                        removed_from_pool += 1
-                        self.log(f"REMOVED offline clip from Media Pool: {path}")
-                    else:
-                        self.log(f"WARNING: Failed to remove offline clip: {path}")
-                        errors += 1
-                except Exception as e:
-                    self.log(f"ERROR: Removing offline clip {path}: {e}")
-                    errors += 1
-
-            self.log("\n=== SUMMARY ===")
-            self.log(f"Video files: {summary['video']}")
-            self.log(f"Audio files: {summary['audio']}")
-            self.log(f"Image/Graphics files: {summary['image']}")
-            self.log(f"Other files: {summary['other']}")
-            self.log(f"Total processed: {moved_or_deleted}, removed from pool: {removed_from_pool}, errors: {errors}")
+                    write_space_report(reclaimable, path)
+                except OSError as e:
+                    messagebox.showerror("Export Failed", str(e), parent=win)
+        Button(win, text="Export...", command=export).pack(anchor='e', padx=10, pady=8)
 
-        except Exception as e:
-            self.log(f"FATAL ERROR: {e}")
+    def check_for_updates(self):
+        """Checks and downloads on a worker thread; dialogs run on the main loop via _on_main."""
+        self.update_button.config(state="disabled")
+        threading.Thread(target=self._update_worker, daemon=True).start()
 
-        self.scan_button.config(state="normal")
+    def _update_worker(self):
+        try:
+            self._check_and_download_update()
+        finally:
+            self._on_main(self.update_button.config, state="normal")
 
-    def check_for_updates(self):
+    def _check_and_download_update(self):
         try:
-            # Attempt to connect normally first
-            ctx = ssl.create_default_context()
-            with urllib.request.urlopen(GITHUB_API_LATEST, timeout=10, context=ctx) as resp:
-                data = json.loads(resp.read().decode("utf-8"))
-        except urllib.error.URLError as e:
-            # If macOS SSL certs are missing, fallback to unverified context
-            if "CERTIFICATE_VERIFY_FAILED" in str(e):
-                try:
-                    ctx = ssl._create_unverified_context()
-                    with urllib.request.urlopen(GITHUB_API_LATEST, timeout=10, context=ctx) as resp:
-                        data = json.loads(resp.read().decode("utf-8"))
-                except Exception as inner_e:
-                    messagebox.showwarning("Update Check Failed", f"Could not check for updates: {inner_e}")
-                    return
-            else:
-                messagebox.showwarning("Update Check Failed", f"Could not check for updates: {e}")
-                return
-        except Exception as e:
-            messagebox.showwarning("Update Check Failed", f"Could not check for updates: {e}")
+            release, _ = fetch_latest_release()
+        except UpdateError as e:
+            self._on_main(messagebox.showwarning, "Update Check Failed", f"Could not check for updates: {e}")
             return
 
-        latest_tag = (data.get("tag_name") or "").lstrip("v").strip()
-        assets = data.get("assets", []) or []
-        download_asset = None
-        for a in assets:
-            name = (a.get("name") or "").lower()
-            url = a.get("browser_download_url")
-            
-            if not name or not url:
-                continue
-                
-            # Filter out anything that isn't our core zip files
-            if not (name.endswith(".zip") and "python" not in name and "drmediacleaner" in name):
-                continue
-                
-            # OS-Specific Logic based on your file naming convention
-            if IS_MAC:
-                # Mac users ONLY download the file with "macOS" in the name
-                if "macOS" in name:
-                    download_asset = (name, url)
-                    break
-            elif IS_WINDOWS:
-                # Windows users ONLY download the file WITHOUT "macOS" in the name
-                if "macOS" not in name:
-                    download_asset = (name, url)
-                    break
-
+        latest_tag = release_version(release)
         if not latest_tag:
-            messagebox.showwarning("Update Check", "Could not determine latest release info.")
+            self._on_main(messagebox.showwarning, "Update Check", "Could not determine latest release info.")
             return
-
-        def version_tuple(v):
-            parts = [p for p in v.split(".") if p.isdigit()]
-            return tuple(int(p) for p in parts)
-
-        try:
-            if version_tuple(latest_tag) <= version_tuple(APP_VERSION):
-                messagebox.showinfo("Up to Date", f"You are running the latest version ({APP_VERSION}).")
-                return
-        except Exception:
-            if latest_tag <= APP_VERSION:
-                messagebox.showinfo("Up to Date", f"You are running the latest version ({APP_VERSION}).")
-                return
-
-        if not download_asset:
-            messagebox.showwarning("Update Available", f"New version {latest_tag} available but no suitable zip found.")
+        if not is_newer_version(latest_tag):
+            self._on_main(messagebox.showinfo, "Up to Date", f"You are running the latest version ({APP_VERSION}).")
             return
 
-        name, url = download_asset
-        if not messagebox.askyesno("Download Update", f"New version {latest_tag} available.\nDownload {name} to your Downloads folder?"):
+        asset = pick_release_asset(release)
+        if not asset:
+            self._on_main(messagebox.showwarning, "Update Available",
+                          f"New version {latest_tag} available but no suitable zip found.")
+            return
+        name, url, size = asset
+        if not self._on_main(messagebox.askyesno, "Download Update",
+                             f"New version {latest_tag} available.\nDownload {name} to your Downloads folder?"):
             return
 
+        def report(done, total):
+            self.log(f"DOWNLOADING: {name} ({100.0 * done / total:.0f}%)")
         try:
             downloads = os.path.join(os.path.expanduser("~"), "Downloads")
             os.makedirs(downloads, exist_ok=True)
-            dst = os.path.join(downloads, os.path.basename(url))
-            
-            # Using urlopen + shutil instead of urlretrieve to handle SSL contexts properly
-            try:
-                download_ctx = ssl.create_default_context()
-                with urllib.request.urlopen(url, context=download_ctx) as response, open(dst, 'wb') as out_file:
-                    shutil.copyfileobj(response, out_file)
-            except urllib.error.URLError as e:
-                if "CERTIFICATE_VERIFY_FAILED" in str(e):
-                    download_ctx = ssl._create_unverified_context()
-                    with urllib.request.urlopen(url, context=download_ctx) as response, open(dst, 'wb') as out_file:
-                        shutil.copyfileobj(response, out_file)
-                else:
-                    raise e
-                    
-            messagebox.showinfo("Downloaded", f"Update downloaded to:\n{dst}")
-        except Exception as e:
-            messagebox.showerror("Download Failed", f"Failed to download update: {e}")
-
+            self.log(f"INFO: Downloading {name}...")
+            dst = download_update(url, os.path.join(downloads, os.path.basename(url)), size, progress=report)
+        except (UpdateError, OSError) as e:
+            self.log(f"ERROR: Update download failed: {e}")
+            self._on_main(messagebox.showerror, "Download Failed", f"Failed to download update: {e}")
+            return
+        self.log(f"INFO: Update downloaded to {dst}")
+        self._on_main(messagebox.showinfo, "Downloaded", f"Update downloaded to:\n{dst}")
 
-if __name__ == "__main__":
+def run_gui():
+    _import_tk()
     root = Tk()
     app = UnusedMediaCleanerGUI(root)
     app._toggle_folder_entry()
@@ -683,3 +4708,163 @@ if __name__ == "__main__":
     # ---------------------------------
 
     root.mainloop()
+
+
+# --- Command-Line Entry Point ---
+
+def build_arg_parser():
+    import argparse
+    parser = argparse.ArgumentParser(
+        prog="Unused Media Cleaner",
+        description="Find unused and missing media in the current DaVinci Resolve project. "
+                    "Without --headless the GUI is opened.")
+    parser.add_argument("--headless", action="store_true",
+                        help="Run the scan without the GUI (no display or tkinter needed)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Report only; no move/delete or Media Pool removal")
+    parser.add_argument("--action", choices=(ACTION_MOVE, ACTION_TRASH), default=ACTION_TRASH,
+                        help=f"What to do with unused files (default: {ACTION_TRASH})")
+    parser.add_argument("--folder-name", default="Unused",
+                        help="Folder name for moved files (default: Unused)")
+    parser.add_argument("--types", default=",".join(FILE_KINDS),
+                        help="Comma-separated file types to process: video,audio,image,other")
+    parser.add_argument("--report", metavar="PATH",
+                        help="Write a JSON report of the run to PATH ('-' for stdout)")
+    parser.add_argument("--space-report", metavar="PATH",
+                        help="Write reclaimable space per type, volume, bin and folder to PATH (.csv or .json)")
+    parser.add_argument("-y", "--yes", action="store_true",
+                        help="Do not ask for confirmation before moving/deleting")
+    parser.add_argument("--all-projects", action="store_true",
+                        help="Sweep every project in the Project Manager database; only media "
+                             "unused in all of them is cleaned")
+    parser.add_argument("--projects", metavar="NAMES",
+                        help="Comma-separated project names to sweep (implies a multi-project sweep)")
+    parser.add_argument("--project-folder", metavar="PATH", default="",
+                        help="Limit the sweep to this Project Manager folder, e.g. 'Clients/2025'")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ignore the on-disk scan cache and rescan every timeline and folder")
+    parser.add_argument("--cache-path", metavar="PATH",
+                        help="Scan cache database location (default: per-user config directory)")
+    parser.add_argument("--delete-batch-size", type=int, default=DELETE_BATCH_SIZE,
+                        help="Clips per Media Pool DeleteClips call")
+    parser.add_argument("--trash-batch-size", type=int, default=TRASH_BATCH_SIZE,
+                        help="Files per native trash operation")
+    parser.add_argument("--move-workers", type=int, default=MOVE_WORKERS,
+                        help="Concurrent file moves")
+    parser.add_argument("--timeline-workers", type=int, default=TIMELINE_WORKERS,
+                        help="Scripting connections used to scan timelines (1 = serial)")
+    parser.add_argument("--strategy", choices=(SCAN_FULL, SCAN_FAST), default=SCAN_FULL,
+                        help="'fast' trusts Resolve's Usage counts and only walks the timelines when "
+                             "a clip would be deleted, to verify it (default: full)")
+    parser.add_argument("--orphans", action="store_true",
+                        help="Also find media files on disk that are not in the Media Pool at all")
+    parser.add_argument("--root", metavar="PATH", action="append", default=[],
+                        help="Folder to search for orphan files, with its subfolders (repeatable; "
+                             "default: only the folders the Media Pool's files are in). Implies --orphans")
+    parser.add_argument("--duplicates", action="store_true",
+                        help="Report Media Pool files with identical content and the space relinking would free")
+    parser.add_argument("--plan", metavar="PATH",
+                        help="Scan without changing anything and write the findings to a plan file "
+                             "for --apply (implies --dry-run)")
+    parser.add_argument("--apply", metavar="PATH",
+                        help="Clean up exactly what a plan file lists, without rescanning. Files "
+                             "changed since the plan are skipped. Implies --headless")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="Write per-stage timings and per-method API call latencies to PATH (JSON)")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="Write a Chrome trace of the run's stages to PATH (chrome://tracing, Perfetto)")
+    parser.add_argument("--undo", metavar="JOURNAL", nargs="?", const="last",
+                        help="Move the files of a move-mode cleanup back and re-import its clips "
+                             "(default: the latest journal). Implies --headless")
+    parser.add_argument("--resume", metavar="JOURNAL", nargs="?", const="last",
+                        help="Finish an interrupted cleanup from its journal (default: the latest). "
+                             "Implies --headless")
+    return parser
+
+
+def run_cli(args) -> int:
+    kinds = {k.strip().lower() for k in args.types.split(",") if k.strip()}
+    unknown = kinds.difference(FILE_KINDS)
+    if unknown:
+        print(f"ERROR: Unknown file type(s): {', '.join(sorted(unknown))}", file=sys.stderr)
+        return 2
+
+    # With --report - stdout carries only the JSON report; everything else goes to stderr
+    out = sys.stderr if args.report == "-" else sys.stdout
+
+    def confirm(title, message):
+        if args.yes:
+            return True
+        if not sys.stdin or not sys.stdin.isatty():
+            print("WARNING: Not confirmed; re-run with --yes to apply changes non-interactively.", file=out)
+            return False
+        print(f"{message} [y/N] ", end="", file=out, flush=True)
+        return input().strip().lower() in ("y", "yes")
+
+    options = ScanOptions(
+        dry_run=args.dry_run or bool(args.plan),
+        action=args.action,
+        folder_name=args.folder_name,
+        include={k: k in kinds for k in FILE_KINDS},
+        delete_batch_size=args.delete_batch_size,
+        trash_batch_size=args.trash_batch_size,
+        move_workers=args.move_workers,
+        timeline_workers=args.timeline_workers,
+        use_cache=not args.no_cache,
+        cache_path=args.cache_path,
+        find_orphans=args.orphans or bool(args.root),
+        orphan_roots=args.root,
+        find_duplicates=args.duplicates,
+        plan_path=args.plan,
+        profile_path=args.profile,
+        trace_path=args.trace,
+        strategy=args.strategy,
+    )
+    log = lambda msg: print(msg, file=out)
+    engine = CleanerEngine(options, log=log, confirm=confirm)
+    sweep = args.all_projects or args.projects or args.project_folder
+    try:
+        if args.apply:
+            report = engine.apply(args.apply)
+        elif args.undo:
+            report = engine.undo(None if args.undo == "last" else args.undo)
+        elif args.resume:
+            report = engine.resume(None if args.resume == "last" else args.resume)
+        elif sweep:
+            names = [n.strip() for n in (args.projects or "").split(",") if n.strip()]
+            folder = tuple(part for part in args.project_folder.split("/") if part)
+            report = engine.run_sweep(names or None, folder)
+        else:
+            report = engine.run()
+    except ResolveConnectionError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 2
+
+    if args.report == "-":
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    elif args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"INFO: Report written to {args.report}")
+    if args.space_report and report.get("reclaimable"):
+        write_space_report(report["reclaimable"], args.space_report)
+        log(f"INFO: Space report written to {args.space_report}")
+    return 0 if report["status"] in ("ok", "dry_run", "nothing_to_do") else 1
+
+
+def main(argv=None) -> int:
+    if argv is not None and not argv:
+        # Launched from Workspace > Scripts: straight to the GUI without building the parser
+        run_gui()
+        return 0
+    args = build_arg_parser().parse_args(argv)
+    if args.headless or args.apply or args.undo or args.resume:
+        return run_cli(args)
+    run_gui()
+    return 0
+
+
+if __name__ == "__main__":
+    # Resolve's embedded interpreter may not define sys.argv
+    sys.exit(main(getattr(sys, "argv", [""])[1:]))
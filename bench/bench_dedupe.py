@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Duplicate detection benchmark: staged size/partial/full hashing vs hashing everything.
+
+    python bench/bench_dedupe.py --files 400 --size-mb 8 --duplicates 0.1
+
+Files get a handful of shared sizes (as camera clips of one format do), so most
+size collisions are settled by the head/tail hash. Rows: full hash of every
+file, staged detection with a cold hash cache, and again with a warm cache.
+All three must find the same groups.
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fake_resolve  # noqa: E402
+
+
+def make_files(root, count, size, dup_ratio, seed):
+    rng = random.Random(seed)
+    sizes = [size - k * 4096 for k in range(4)]
+    files = []
+    for i in range(count):
+        path = os.path.join(root, f"clip_{i:05d}.mov")
+        if files and rng.random() < dup_ratio:
+            with open(rng.choice(files), "rb") as src, open(path, "wb") as dst:
+                dst.write(src.read())
+        else:
+            with open(path, "wb") as f:
+                f.write(rng.randbytes(rng.choice(sizes)))
+        files.append(path)
+    return {p: os.stat(p) for p in files}
+
+
+def hash_everything(files):
+    groups = {}
+    for path, st in files.items():
+        h = hashlib.blake2b(digest_size=20)
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        groups.setdefault((st.st_size, h.hexdigest()), []).append(path)
+    return sorted(sorted(paths) for paths in groups.values() if len(paths) > 1)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=400)
+    parser.add_argument("--size-mb", type=float, default=8)
+    parser.add_argument("--duplicates", type=float, default=0.1, help="Share of files copied from another")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    cleaner = fake_resolve.load_cleaner()
+    workers = args.workers or cleaner.HASH_WORKERS
+    with tempfile.TemporaryDirectory() as tmp:
+        files = make_files(tmp, args.files, int(args.size_mb * 2**20), args.duplicates, args.seed)
+        total_mb = sum(st.st_size for st in files.values()) / 2**20
+        print(f"{len(files)} files, {total_mb:.0f} MB, {workers} hash workers")
+        print(f"{'method':<20} {'seconds':>8} {'partial':>8} {'full':>6} {'cached':>7} {'groups':>7}")
+
+        started = time.perf_counter()
+        expected = hash_everything(files)
+        print(f"{'hash everything':<20} {time.perf_counter() - started:>8.2f} {0:>8} {len(files):>6} "
+              f"{0:>7} {len(expected):>7}")
+
+        db = cleaner.ScanCacheDB(os.path.join(tmp, "cache.sqlite3"))
+        for label in ("staged (cold cache)", "staged (warm cache)"):
+            finder = cleaner.DuplicateFinder(db, workers=workers)
+            started = time.perf_counter()
+            groups = finder.find(files)
+            db.commit()
+            elapsed = time.perf_counter() - started
+            found = sorted(paths for _, _, paths in groups)
+            if found != expected:
+                print(f"ERROR: {label} found different duplicate groups")
+                return 1
+            print(f"{label:<20} {elapsed:>8.2f} {finder.partial_hashed:>8} {finder.full_hashed:>6} "
+                  f"{finder.cache_hits:>7} {len(groups):>7}")
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
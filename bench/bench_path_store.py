@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Used-path store benchmark: PathStore vs a plain set of path strings.
+
+    python bench/bench_path_store.py --paths 100000,1000000
+
+Paths mimic archive media: a long volume/client/project/day/camera prefix shared
+by a few hundred clips each. Both structures are built from freshly created
+strings (as they arrive from the scripting API) and probed with a 50/50 mix of
+used and unused paths, again as fresh strings.
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fake_resolve  # noqa: E402
+
+PREFIX = "/Volumes/ARCHIVE_RAID_07/Clients/Groveland Productions/2025 Documentary Series"
+
+
+def make_path(i: int, clips_per_dir: int) -> str:
+    d = i // clips_per_dir
+    return os.path.normpath(f"{PREFIX}/Episode {d // 40:02d}/Day {d // 8 % 5 + 1:02d}/"
+                            f"CAM_{'ABCDEFGH'[d % 8]}/A{d:04d}C{i % clips_per_dir:03d}_250101_R1AB.mov")
+
+
+def measure(factory, paths_n, clips_per_dir):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    store = factory()
+    for i in range(paths_n):
+        store.add(make_path(i, clips_per_dir))
+    build = time.perf_counter() - started
+    gc.collect()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    probes = [make_path(i * 2, clips_per_dir) for i in range(paths_n)]  # half beyond the used range
+    started = time.perf_counter()
+    hits = sum(1 for p in probes if p in store)
+    lookup = time.perf_counter() - started
+    return store, build, memory, lookup, hits
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--paths", default="100000,1000000", help="Comma-separated used-path counts")
+    parser.add_argument("--clips-per-dir", type=int, default=250)
+    args = parser.parse_args(argv)
+
+    cleaner = fake_resolve.load_cleaner()
+    variants = (
+        ("set", set),
+        ("PathStore", lambda: cleaner.PathStore(ignores_case=lambda d: False)),
+        ("PathStore (folding)", lambda: cleaner.PathStore(ignores_case=lambda d: True)),
+    )
+    print(f"{'paths':>9} {'structure':<20} {'MB':>8} {'B/path':>7} {'build s':>8} {'lookup s':>9} {'ns/lookup':>10}")
+    for n in (int(x) for x in args.paths.split(",")):
+        for label, factory in variants:
+            store, build, memory, lookup, hits = measure(factory, n, args.clips_per_dir)
+            if hits != n // 2 + n % 2:
+                print(f"ERROR: {label} found {hits} of {n // 2 + n % 2} used paths")
+                return 1
+            if label == "PathStore" and not store.directories():
+                print("ERROR: PathStore reports no directories")
+                return 1
+            print(f"{n:>9} {label:<20} {memory / 2**20:>8.1f} {memory / n:>7.0f} {build:>8.2f} "
+                  f"{lookup:>9.2f} {lookup / n * 1e9:>10.0f}")
+            del store
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Scale benchmark for the scan pipeline on synthetic projects.
+
+    python bench/bench_scale.py                         # 1k, 10k and 100k clips
+    python bench/bench_scale.py --sizes 1000,10000 --json results.json
+    python bench/bench_scale.py --baseline results.json # exit 1 on a regression
+
+Each size runs in its own process (so peak RSS is per size) and does a full
+dry-run scan against the simulated backend with media materialised on disk.
+Reported: wall time, per-stage time, scripting API calls and peak memory.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fake_resolve  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+STAGES = (
+    ("media_pool", "CleanerEngine", "_stream_media_pool"),
+    ("stat", "StatCache", "prefill"),
+    ("timelines", "CleanerEngine", "_walk_timelines"),
+    ("compounds", "CleanerEngine", "_discover_compound_children"),
+    ("classify", "CleanerEngine", "_classify"),
+)
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _timed(owner, name, totals, stage):
+    original = getattr(owner, name)
+
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            totals[stage] = totals.get(stage, 0.0) + time.perf_counter() - started
+    setattr(owner, name, wrapper)
+
+
+def run_one(args, clips: int) -> dict:
+    cleaner = fake_resolve.load_cleaner()
+    totals = {}
+    for stage, owner, name in STAGES:
+        _timed(cleaner if owner == "module" else getattr(cleaner, owner), name, totals, stage)
+    rss_start = peak_rss_mb()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        media = os.path.join(tmp, "media")
+        project, files = fake_resolve.generate_project(
+            clips=clips, folder_depth=args.folder_depth, shared_ratio=args.shared,
+            compounds=args.compounds if args.compounds is not None else max(1, clips // 500),
+            compound_depth=args.compound_depth, media_root=media, seed=args.seed)
+        fake_resolve.materialize(files, media, media)
+        backend = fake_resolve.Backend([project], latency=args.latency)
+        rss_built = peak_rss_mb()
+
+        options = cleaner.ScanOptions(dry_run=True, use_cache=False, timeline_workers=args.timeline_workers,
+                                      cache_path=os.path.join(tmp, "cache.sqlite3"))
+        engine = cleaner.CleanerEngine(options, connect=backend.connect)
+        started = time.perf_counter()
+        report = engine.run()
+        wall = time.perf_counter() - started
+        rss_end = peak_rss_mb()
+
+    return {
+        "clips": clips,
+        "status": report["status"],
+        "wall_s": round(wall, 3),
+        "stages_s": {k: round(v, 3) for k, v in totals.items()},
+        "api_calls": engine.api_calls.total,
+        "api_calls_per_clip": round(engine.api_calls.total / clips, 2),
+        "unused": len(report["unused"]),
+        "missing": len(report["missing"]),
+        "peak_rss_mb": round(rss_end, 1) if rss_end is not None else None,
+        "scan_rss_mb": round(rss_end - max(rss_start, rss_built), 1) if rss_end is not None else None,
+    }
+
+
+def compare(results, baseline, tolerance) -> list:
+    """Regression messages: slower than baseline by more than `tolerance`, or more API calls."""
+    base = {r["clips"]: r for r in baseline}
+    problems = []
+    for r in results:
+        b = base.get(r["clips"])
+        if not b:
+            continue
+        if r["wall_s"] > b["wall_s"] * (1 + tolerance):
+            problems.append(f"{r['clips']} clips: wall time {r['wall_s']}s vs baseline {b['wall_s']}s")
+        if r["api_calls"] > b["api_calls"]:
+            problems.append(f"{r['clips']} clips: {r['api_calls']} API calls vs baseline {b['api_calls']}")
+        if r["unused"] != b["unused"] or r["missing"] != b["missing"]:
+            problems.append(f"{r['clips']} clips: findings changed "
+                            f"({r['unused']}/{r['missing']} vs {b['unused']}/{b['missing']} unused/missing)")
+    return problems
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated clip counts")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per API round-trip")
+    parser.add_argument("--timeline-workers", type=int, default=1)
+    parser.add_argument("--folder-depth", type=int, default=3)
+    parser.add_argument("--shared", type=float, default=0.05, help="Share of clips re-importing a used file")
+    parser.add_argument("--compounds", type=int, default=None, help="Compound clips (default: clips/500)")
+    parser.add_argument("--compound-depth", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", metavar="PATH", help="Write results to PATH")
+    parser.add_argument("--baseline", metavar="PATH", help="Compare against an earlier --json file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed wall-time slowdown")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_one(args, args.child)))
+        return 0
+
+    passthrough = list(argv if argv is not None else sys.argv[1:])
+    results = []
+    print(f"{'clips':>8} {'wall s':>8} {'pool':>9} {'timelines':>10} {'compounds':>10} "
+          f"{'API calls':>10} {'/clip':>6} {'peak MB':>8}")
+    for clips in (int(n) for n in args.sizes.split(",")):
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), *passthrough, "--child", str(clips)],
+                             capture_output=True, text=True)
+        if out.returncode != 0:
+            print(out.stderr, file=sys.stderr)
+            return 2
+        r = json.loads(out.stdout.strip().splitlines()[-1])
+        results.append(r)
+        st = r["stages_s"]
+        peak = f"{r['peak_rss_mb']:>8.1f}" if r["peak_rss_mb"] is not None else f"{'n/a':>8}"
+        print(f"{clips:>8} {r['wall_s']:>8.2f} {st.get('media_pool', 0):>9.2f} {st.get('timelines', 0):>10.2f} "
+              f"{st.get('compounds', 0):>10.2f} {r['api_calls']:>10} {r['api_calls_per_clip']:>6} {peak}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            problems = compare(results, json.load(f), args.tolerance)
+        for p in problems:
+            print(f"REGRESSION: {p}")
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Startup and re-scan benchmark: module load time and connection reuse.
+
+    python bench/bench_startup.py
+    python bench/bench_startup.py --script old.py   # compare another revision's load time
+
+Load: the script is executed in fresh interpreters, as Resolve does from
+Workspace > Scripts, and the time to run the module body is measured along with
+which optional heavy modules it pulled in.
+Re-scan: consecutive dry-run scans of one synthetic project, each opening its own
+connections versus sharing one ResolveSession, with `--connect-latency` seconds
+charged per scripting handle opened. The first scan opens every handle either
+way, so it is reported on its own; "later" is the mean of the scans after it,
+with the handles each of them opened. The defaults keep a scan short enough
+that the connection cost shows; with larger projects the scan itself dominates.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fake_resolve  # noqa: E402
+
+HEAVY_MODULES = ("urllib.request", "ssl", "http.client", "subprocess", "ctypes", "multiprocessing",
+                 "sqlite3", "csv", "argparse", "tkinter")
+
+LOAD_SNIPPET = """
+import importlib.util, json, sys, time
+started = time.perf_counter()
+spec = importlib.util.spec_from_file_location("unused_media_cleaner", sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+elapsed = time.perf_counter() - started
+print(json.dumps({"ms": elapsed * 1000, "loaded": [m for m in sys.argv[2:] if m in sys.modules]}))
+"""
+
+
+def measure_load(script: str, runs: int) -> tuple[list, list]:
+    times = []
+    loaded = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", LOAD_SNIPPET, script, *HEAVY_MODULES],
+                             capture_output=True, text=True, check=True)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        times.append(result["ms"])
+        loaded = result["loaded"]
+    return times, loaded
+
+
+def measure_rescans(cleaner, args) -> list:
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        media = os.path.join(tmp, "media")
+        project, files = fake_resolve.generate_project(clips=args.clips, timelines=args.timelines,
+                                                       media_root=media, seed=1)
+        fake_resolve.materialize(files, media, media)
+        for label, shared in (("fresh connections", False), ("shared session", True)):
+            backend = fake_resolve.Backend([project], latency=args.latency, connect_latency=args.connect_latency)
+            session = cleaner.ResolveSession(backend.connect) if shared else None
+            times = []
+            connects = []
+            for _ in range(args.scans):
+                opened = len(backend.connections)
+                options = cleaner.ScanOptions(dry_run=True, use_cache=False, timeline_workers=args.timeline_workers)
+                engine = cleaner.CleanerEngine(options, connect=backend.connect, session=session)
+                started = time.perf_counter()
+                report = engine.run()
+                times.append(time.perf_counter() - started)
+                connects.append(len(backend.connections) - opened)
+                if report["status"] not in ("dry_run", "nothing_to_do"):
+                    raise RuntimeError(f"scan failed: {report.get('error') or report['status']}")
+            rows.append((label, times, connects))
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--script", default=fake_resolve.SCRIPT_PATH, help="Script whose load time is measured")
+    parser.add_argument("--runs", type=int, default=15, help="Fresh interpreters for the load measurement")
+    parser.add_argument("--scans", type=int, default=5, help="Consecutive scans per re-scan variant")
+    parser.add_argument("--clips", type=int, default=500)
+    parser.add_argument("--timelines", type=int, default=8)
+    parser.add_argument("--timeline-workers", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.0001, help="Seconds per API round-trip")
+    parser.add_argument("--connect-latency", type=float, default=0.15, help="Seconds per handle opened")
+    args = parser.parse_args(argv)
+
+    times, loaded = measure_load(args.script, args.runs)
+    print(f"load: median {statistics.median(times):.1f} ms, min {min(times):.1f} ms over {args.runs} runs "
+          f"({os.path.basename(args.script)})")
+    print(f"      optional modules loaded at import: {', '.join(loaded) or 'none'}")
+
+    fake_resolve.SCRIPT_PATH = os.path.abspath(args.script)
+    cleaner = fake_resolve.load_cleaner()
+    if not hasattr(cleaner, "ResolveSession"):
+        return 0
+    print(f"{'re-scan':<18} {'first s':>8} {'connects':>9} {'later s':>8} {'connects':>9}")
+    for label, scan_times, connects in measure_rescans(cleaner, args):
+        later = statistics.mean(scan_times[1:]) if len(scan_times) > 1 else 0.0
+        later_connects = statistics.mean(connects[1:]) if len(connects) > 1 else 0
+        print(f"{label:<18} {scan_times[0]:>8.2f} {connects[0]:>9} {later:>8.2f} {later_connects:>9.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Scan strategy benchmark: full timeline walk vs the fast Usage-trusting scan.
+
+    python bench/bench_strategy.py --sizes 1000,10000 --latency 0.0002
+    python bench/bench_strategy.py --used-ratio 1      # nothing unused: no timeline is walked
+    python bench/bench_strategy.py --stale 0.01        # some used clips report Usage 0
+
+Each size is scanned (no cache) on the same synthetic project of --timelines
+timelines: a full and a fast dry run, a fast scan writing a plan, and last a
+real fast run in move mode. Reported: wall time, scripting API calls, the
+strategy actually used, and the fast scan's own estimate of the calls it saved
+next to the measured difference. The fast scan only saves calls when Usage
+leaves no clip to verify (--used-ratio 1); otherwise it walks every timeline
+and reports no saving. Every fast run must find the same unused and missing
+media as the full walk, also with --stale (that share of used clips report
+Usage 0); clips it lists that the full walk does not are counted as wrong.
+The real run's API calls include the Media Pool removal, so no saving is
+shown for it.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fake_resolve  # noqa: E402
+
+
+def make_stale(project, share, seed):
+    """Zeroes Usage on `share` of the placed file clips, as a stale Usage count would."""
+    rng = random.Random(seed)
+    stack = [project.media_pool.root]
+    stale = 0
+    while stack:
+        folder = stack.pop()
+        for clip in folder.clips:
+            if clip.props["File Path"] and clip.props["Usage"] != "0" and rng.random() < share:
+                clip.props["Usage"] = "0"
+                stale += 1
+        stack.extend(folder.subfolders)
+    return stale
+
+
+def scan(cleaner, backend, args, strategy, dry_run=True, **options):
+    options = cleaner.ScanOptions(dry_run=dry_run, use_cache=False, timeline_workers=args.timeline_workers,
+                                  strategy=strategy, **options)
+    engine = cleaner.CleanerEngine(options, connect=backend.connect, confirm=lambda title, message: True)
+    started = time.perf_counter()
+    report = engine.run()
+    wall = time.perf_counter() - started
+    if report["status"] not in ("ok", "dry_run", "nothing_to_do"):
+        raise RuntimeError(f"{strategy} scan failed: {report.get('error') or report['status']}")
+    return report, wall, engine.api_calls.total
+
+
+def paths(report, key):
+    return sorted(e["path"] for e in report[key])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000", help="Comma-separated clip counts")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per API round-trip")
+    parser.add_argument("--timelines", type=int, default=40, help="Timelines per project")
+    parser.add_argument("--timeline-workers", type=int, default=1)
+    parser.add_argument("--compounds", type=int, default=None, help="Compound clips (default: clips/500)")
+    parser.add_argument("--used-ratio", type=float, default=0.6, help="Share of clips placed on timelines")
+    parser.add_argument("--stale", type=float, default=0.0, help="Share of used clips reporting Usage 0")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    cleaner = fake_resolve.load_cleaner()
+    print(f"{'clips':>8} {'run':<10} {'used':<5} {'wall s':>7} {'API calls':>10} "
+          f"{'saved':>8} {'estimated':>10} {'unused':>7} {'wrong':>7}")
+    for clips in (int(n) for n in args.sizes.split(",")):
+        with tempfile.TemporaryDirectory() as tmp:
+            media = os.path.join(tmp, "media")
+            project, files = fake_resolve.generate_project(
+                clips=clips, compounds=args.compounds if args.compounds is not None else max(1, clips // 500),
+                timelines=args.timelines, used_ratio=args.used_ratio, media_root=media, seed=args.seed)
+            fake_resolve.materialize(files, media, media)
+            if args.stale:
+                make_stale(project, args.stale, args.seed)
+            backend = fake_resolve.Backend([project], latency=args.latency)
+
+            full, full_wall, full_calls = scan(cleaner, backend, args, "full")
+            print(f"{clips:>8} {'full':<10} {full['strategy']['used']:<5} {full_wall:>7.2f} {full_calls:>10} "
+                  f"{'':>8} {'':>10} {len(full['unused']):>7}")
+            runs = (("fast dry", {}), ("fast plan", {"plan_path": os.path.join(tmp, "plan.json")}),
+                    ("fast move", {"dry_run": False, "action": cleaner.ACTION_MOVE}))
+            for label, options in runs:
+                fast, fast_wall, fast_calls = scan(cleaner, backend, args, "fast", **options)
+                strategy = fast["strategy"]
+                wrong = len(set(paths(fast, "unused")) - set(paths(full, "unused")))
+                saved = full_calls - fast_calls if fast["status"] != "ok" else ""
+                print(f"{clips:>8} {label:<10} {strategy['used']:<5} {fast_wall:>7.2f} {fast_calls:>10} "
+                      f"{saved:>8} {strategy['api_calls_saved']:>10} {len(fast['unused']):>7} {wrong:>7}")
+                for key in ("unused", "missing"):
+                    if paths(full, key) != paths(fast, key):
+                        print(f"ERROR: {label} found different {key} media than the full walk")
+                        return 1
+                errors = (fast["summary"] or {}).get("errors")
+                if errors:
+                    print(f"ERROR: {label} reported {errors} errors")
+                    return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
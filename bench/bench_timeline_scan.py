@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Timeline scan benchmark: serial vs concurrent workers against the simulated backend.
+
+    python bench/bench_timeline_scan.py --timelines 150 --latency 0.001
+
+Every row runs a full dry-run scan of the same project; only the timeline stage
+changes between rows, and its used-path set must match the serial run.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fake_resolve  # noqa: E402
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--timelines", type=int, default=150)
+    parser.add_argument("--tracks", type=int, default=4)
+    parser.add_argument("--items", type=int, default=20, help="Items per track")
+    parser.add_argument("--clips", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.001, help="Seconds per API round-trip")
+    parser.add_argument("--workers", default="1,2,4,8", help="Comma-separated worker counts")
+    args = parser.parse_args(argv)
+
+    project = fake_resolve.build_timeline_heavy(args.timelines, args.tracks, args.items, args.clips)
+    backend = fake_resolve.Backend([project], latency=args.latency)
+    cleaner = fake_resolve.load_cleaner()
+
+    class TimedEngine(cleaner.CleanerEngine):
+        def _walk_timelines(self, pending):
+            started = time.perf_counter()
+            walked = super()._walk_timelines(pending)
+            self.walk_seconds = time.perf_counter() - started
+            self.walk_paths = frozenset().union(*walked.values()) if walked else frozenset()
+            return walked
+
+    print(f"{args.timelines} timelines x {args.tracks} tracks x {args.items} items, "
+          f"{args.clips} clips, {args.latency * 1000:.2f} ms per call")
+    print(f"{'workers':>7} {'walk s':>8} {'total s':>8} {'speedup':>8} {'API calls':>10}")
+    baseline = None
+    expected = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in (int(w) for w in args.workers.split(",")):
+            options = cleaner.ScanOptions(dry_run=True, use_cache=False, timeline_workers=workers,
+                                          cache_path=os.path.join(tmp, "cache.sqlite3"))
+            engine = TimedEngine(options, connect=backend.connect)
+            calls_before = backend.calls
+            started = time.perf_counter()
+            report = engine.run()
+            total = time.perf_counter() - started
+            if report["status"] not in ("dry_run", "nothing_to_do"):
+                print(f"ERROR: run with {workers} workers ended with status {report['status']}")
+                return 1
+            if expected is None:
+                expected = engine.walk_paths
+            elif engine.walk_paths != expected:
+                print(f"ERROR: {workers} workers found a different used-path set")
+                return 1
+            baseline = baseline or engine.walk_seconds
+            print(f"{workers:>7} {engine.walk_seconds:>8.2f} {total:>8.2f} "
+                  f"{baseline / engine.walk_seconds:>7.1f}x {backend.calls - calls_before:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
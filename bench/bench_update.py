@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+Update checker benchmark against a local stand-in for the GitHub releases API.
+
+    python bench/bench_update.py --size-mb 20 --cut 0.4
+
+The server publishes release metadata with an ETag and serves the release zip
+with Range support; the first download is cut off after `--cut` of the file.
+Rows: first metadata check (200), repeat check (304, no body), the interrupted
+download, its resume, and a plain full download for comparison. Bytes are what
+the server sent. The resumed file must match the original byte for byte.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fake_resolve  # noqa: E402
+
+ASSET_NAME = "DRMediaCleaner-v99.0.0.zip"
+
+
+class ReleaseServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, payload: bytes):
+        super().__init__(("127.0.0.1", 0), ReleaseHandler)
+        self.payload = payload
+        self.cut_next = None  # Bytes after which the next asset response is dropped
+        self.sent = 0
+        self.base = f"http://127.0.0.1:{self.server_address[1]}"
+        self.release = json.dumps({
+            "tag_name": "v99.0.0",
+            "assets": [{"name": ASSET_NAME, "size": len(payload),
+                        "browser_download_url": f"{self.base}/{ASSET_NAME}"}],
+        }).encode("utf-8")
+        self.etag = '"' + hashlib.sha1(self.release).hexdigest() + '"'
+
+
+class ReleaseHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _send(self, code, body=b"", headers=()):
+        self.send_response(code)
+        for key, value in headers:
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.sent += len(body)
+
+    def do_GET(self):
+        server = self.server
+        if self.path == "/releases/latest":
+            if self.headers.get("If-None-Match") == server.etag:
+                self.send_response(304)
+                self.send_header("ETag", server.etag)
+                self.end_headers()
+                return
+            self._send(200, server.release, [("ETag", server.etag), ("Content-Type", "application/json")])
+            return
+        if self.path != f"/{ASSET_NAME}":
+            self._send(404)
+            return
+
+        payload = server.payload
+        start = 0
+        m = re.match(r"bytes=(\d+)-$", self.headers.get("Range") or "")
+        if m:
+            start = int(m.group(1))
+            if start >= len(payload):
+                self._send(416, headers=[("Content-Range", f"bytes */{len(payload)}")])
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(payload) - 1}/{len(payload)}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(payload) - start))
+        self.end_headers()
+        body = payload[start:]
+        if server.cut_next is not None:
+            body, server.cut_next = body[:server.cut_next], None
+            self.close_connection = True
+        self.wfile.write(body)
+        server.sent += len(body)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=float, default=20)
+    parser.add_argument("--cut", type=float, default=0.4, help="Share of the first download sent before the drop")
+    args = parser.parse_args(argv)
+
+    cleaner = fake_resolve.load_cleaner()
+    payload = os.urandom(int(args.size_mb * 2**20))
+    server = ReleaseServer(payload)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"{server.base}/releases/latest"
+    print(f"{'step':<22} {'seconds':>8} {'server bytes':>13}  result")
+
+    def step(label, fn):
+        sent = server.sent
+        started = time.perf_counter()
+        try:
+            result = fn()
+            note = ("changed" if result[1] else "not modified") if isinstance(result, tuple) else "complete"
+        except cleaner.UpdateError as e:
+            result, note = None, f"UpdateError: {e}"
+        print(f"{label:<22} {time.perf_counter() - started:>8.3f} {server.sent - sent:>13}  {note}")
+        return result
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = os.path.join(tmp, "update-cache.json")
+            release, changed = step("check (no cache)", lambda: cleaner.fetch_latest_release(url, cache))
+            _, changed_again = step("check (cached ETag)", lambda: cleaner.fetch_latest_release(url, cache))
+            if not changed or changed_again:
+                print("ERROR: expected a full response, then 304 Not Modified")
+                return 1
+
+            asset = release["assets"][0]
+            dst = os.path.join(tmp, ASSET_NAME)
+            server.cut_next = int(len(payload) * args.cut)
+            step("download (dropped)", lambda: cleaner.download_update(asset["browser_download_url"], dst,
+                                                                        asset["size"]))
+            step("download (resumed)", lambda: cleaner.download_update(asset["browser_download_url"], dst,
+                                                                        asset["size"]))
+            with open(dst, "rb") as f:
+                if f.read() != payload:
+                    print("ERROR: resumed download differs from the original")
+                    return 1
+            os.unlink(dst)
+            step("download (full)", lambda: cleaner.download_update(asset["browser_download_url"], dst,
+                                                                     asset["size"]))
+    finally:
+        server.shutdown()
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,445 @@
+# -*- coding: utf-8 -*-
+"""
+Simulated DaVinci Resolve scripting backend for the benchmarks in this folder.
+
+Project data lives in plain Python objects shared by every connection. Each
+connection returned by Backend.connect() behaves like a scripting API handle:
+every method call is one round-trip that holds that connection for `latency`
+seconds, so calls on one handle are serialised just like the real IPC pipe,
+while separate handles overlap.
+
+generate_project() builds reproducible synthetic projects (bin depth, shared
+media, nested compounds, missing files) and materialize() writes their media
+as empty files so the filesystem side of a scan is exercised too.
+"""
+
+import importlib.util
+import itertools
+import os
+import random
+import threading
+import time
+
+SCRIPT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "Unused Media Cleaner.py")
+
+_ids = itertools.count(1)
+
+
+# --- Project Data ---
+
+class Clip:
+    def __init__(self, name, path, ctype="Video", usage=0, timeline=None):
+        self.uid = f"mpi-{next(_ids)}"
+        self.timeline = timeline
+        self.props = {"Clip Name": name, "File Path": path, "Type": ctype, "Usage": str(usage)}
+
+    def GetName(self):
+        return self.props["Clip Name"]
+
+    def GetUniqueId(self):
+        return self.uid
+
+    def GetClipProperty(self, key=None):
+        return dict(self.props) if key is None else self.props.get(key, "")
+
+    def GetMetadata(self):
+        return {}
+
+    def GetTimeline(self):
+        return self.timeline
+
+
+class TimelineItem:
+    def __init__(self, clip):
+        self.clip = clip
+
+    def GetMediaPoolItem(self):
+        return self.clip
+
+
+class Timeline:
+    def __init__(self, name, tracks):
+        self.uid = f"tl-{next(_ids)}"
+        self.name = name
+        self.tracks = tracks  # {"video": [[Clip, ...], ...], "audio": [...]}
+
+    def GetName(self):
+        return self.name
+
+    def GetUniqueId(self):
+        return self.uid
+
+    def GetStartFrame(self):
+        return 0
+
+    def GetEndFrame(self):
+        return 1000
+
+    def GetTrackCount(self, track_type):
+        return len(self.tracks.get(track_type, []))
+
+    def GetItemsInTrack(self, track_type, index):
+        return {i + 1: TimelineItem(c) for i, c in enumerate(self.tracks[track_type][index - 1])}
+
+
+class Folder:
+    def __init__(self, name, clips=(), subfolders=()):
+        self.uid = f"folder-{next(_ids)}"
+        self.name = name
+        self.clips = list(clips)
+        self.subfolders = list(subfolders)
+
+    def GetName(self):
+        return self.name
+
+    def GetUniqueId(self):
+        return self.uid
+
+    def GetClips(self):
+        return {i + 1: c for i, c in enumerate(self.clips)}
+
+    def GetSubFolders(self):
+        return {i + 1: f for i, f in enumerate(self.subfolders)}
+
+
+class MediaPool:
+    def __init__(self, root):
+        self.root = root
+        self.current = root
+
+    def GetRootFolder(self):
+        return self.root
+
+    def GetCurrentFolder(self):
+        return self.current
+
+    def SetCurrentFolder(self, folder):
+        self.current = folder
+        return True
+
+    def AddSubFolder(self, parent, name):
+        folder = Folder(name)
+        parent.subfolders.append(folder)
+        return folder
+
+    def ImportMedia(self, items):
+        """Adds a clip to the current folder for each file path that exists on disk.
+
+        Generated projects have no image sequences, so frame-range dicts are not simulated.
+        """
+        imported = []
+        for path in items:
+            if not isinstance(path, str) or not os.path.isfile(path):
+                continue
+            ext = os.path.splitext(path)[1].lower()
+            clip = Clip(os.path.basename(path), path, next((t for t, e, _ in CLIP_KINDS if e == ext), "Video"))
+            self.current.clips.append(clip)
+            imported.append(clip)
+        return imported
+
+    def DeleteClips(self, clips):
+        doomed = {c.uid for c in clips}
+        stack = [self.root]
+        while stack:
+            folder = stack.pop()
+            folder.clips = [c for c in folder.clips if c.uid not in doomed]
+            stack.extend(folder.subfolders)
+        return True
+
+
+class Project:
+    def __init__(self, name, root, timelines):
+        self.uid = f"proj-{next(_ids)}"
+        self.name = name
+        self.media_pool = MediaPool(root)
+        self.timelines = list(timelines)
+
+    def GetName(self):
+        return self.name
+
+    def GetUniqueId(self):
+        return self.uid
+
+    def GetMediaPool(self):
+        return self.media_pool
+
+    def GetTimelineCount(self):
+        return len(self.timelines)
+
+    def GetTimelineByIndex(self, index):
+        return self.timelines[index - 1] if 0 < index <= len(self.timelines) else None
+
+    def GetTimelineByName(self, name):
+        for tl in self.timelines:
+            if tl.name == name:
+                return tl
+        return None
+
+
+class ProjectManager:
+    def __init__(self, projects):
+        self.projects = list(projects)
+        self.current = self.projects[0] if self.projects else None
+
+    def GetCurrentProject(self):
+        return self.current
+
+    def LoadProject(self, name):
+        for p in self.projects:
+            if p.name == name:
+                self.current = p
+                return p
+        return None
+
+    def SaveProject(self):
+        return True
+
+    def GetProjectListInCurrentFolder(self):
+        return [p.name for p in self.projects]
+
+    def GetFolderListInCurrentFolder(self):
+        return []
+
+    def GotoRootFolder(self):
+        return True
+
+    def OpenFolder(self, name):
+        return False
+
+    def GotoParentFolder(self):
+        return True
+
+
+class ResolveApp:
+    def __init__(self, pm):
+        self.pm = pm
+
+    def GetProjectManager(self):
+        return self.pm
+
+
+# --- Simulated Connections ---
+
+class Connection:
+    """One scripting handle: a single pipe, so its calls never overlap."""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.calls = 0
+
+    def roundtrip(self):
+        with self.lock:
+            self.calls += 1
+            if self.latency:
+                time.sleep(self.latency)
+
+
+class Remote:
+    """Connection-bound reference to a backend object."""
+    __slots__ = ("_conn", "_obj")
+
+    def __init__(self, conn, obj):
+        self._conn = conn
+        self._obj = obj
+
+    def __getattr__(self, name):
+        attr = getattr(self._obj, name)
+        if not callable(attr):
+            return attr
+        conn = self._conn
+
+        def call(*args, **kwargs):
+            conn.roundtrip()
+            return _bind(conn, attr(*_unbind(args), **_unbind(kwargs)))
+        return call
+
+    def __bool__(self):
+        return True
+
+
+def _bind(conn, value):
+    if value is None or isinstance(value, (str, bytes, int, float, bool)):
+        return value
+    if isinstance(value, dict):
+        return {k: _bind(conn, v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_bind(conn, v) for v in value)
+    return Remote(conn, value)
+
+
+def _unbind(value):
+    if isinstance(value, Remote):
+        return value._obj
+    if isinstance(value, dict):
+        return {k: _unbind(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_unbind(v) for v in value)
+    return value
+
+
+class Backend:
+    """Shared project state plus a factory for latency-charged connections.
+
+    `connect_latency` is the cost of opening a handle (scriptapp() loading the
+    scripting library and handshaking with Resolve).
+    """
+
+    def __init__(self, projects, latency: float = 0.001, connect_latency: float = 0.0):
+        self.app = ResolveApp(ProjectManager(projects))
+        self.latency = latency
+        self.connect_latency = connect_latency
+        self.connections = []
+
+    def connect(self):
+        if self.connect_latency:
+            time.sleep(self.connect_latency)
+        conn = Connection(self.latency)
+        self.connections.append(conn)
+        return Remote(conn, self.app)
+
+    @property
+    def calls(self) -> int:
+        return sum(c.calls for c in self.connections)
+
+
+# --- Generators ---
+
+def build_timeline_heavy(timelines=150, tracks=4, items_per_track=20, clips=2000,
+                         media_root="/media/bench"):
+    """One project with many flat timelines drawing from a shared clip pool."""
+    pool = [Clip(f"clip_{i:06d}.mov", f"{media_root}/clip_{i:06d}.mov") for i in range(clips)]
+    root = Folder("Master", pool[: clips // 2], [Folder("Footage", pool[clips // 2:])])
+    tls = []
+    cursor = 0
+    for t in range(timelines):
+        video = []
+        for _ in range(tracks):
+            video.append([pool[(cursor + k) % clips] for k in range(items_per_track)])
+            cursor += items_per_track // 2 + 1
+        tls.append(Timeline(f"Timeline {t + 1:03d}", {"video": video, "audio": []}))
+    return Project("Bench", root, tls)
+
+
+CLIP_KINDS = (  # (Resolve Type, extension, share of clips)
+    ("Video + Audio", ".mov", 0.55),
+    ("Video", ".mp4", 0.15),
+    ("Audio", ".wav", 0.20),
+    ("Still", ".png", 0.08),
+    ("Generator", ".drfx", 0.02),
+)
+
+
+def generate_project(clips=1000, folder_depth=3, folder_fanout=3, timelines=None, tracks=4,
+                     used_ratio=0.6, shared_ratio=0.05, compounds=0, compound_depth=1,
+                     missing_ratio=0.02, media_root="/media/synthetic", seed=1, name="Synthetic"):
+    """A reproducible synthetic project.
+
+    - `clips` Media Pool file clips spread over a bin tree `folder_depth` levels deep
+    - `shared_ratio` of them re-import a file another clip already uses (shared media)
+    - `used_ratio` of the clips are placed on `timelines` timelines of `tracks` tracks
+    - `compounds` compound clips, each nesting `compound_depth` levels of inner timelines
+    - `missing_ratio` of the files are left off disk by materialize()
+
+    Usage is derived from actual placements, as Resolve reports it. Returns
+    (project, files) where files maps each file path to True if it should exist.
+    """
+    rng = random.Random(seed)
+    timelines = timelines or max(1, clips // 1000)
+
+    folders = [Folder("Master")]
+    level = folders[:]
+    for depth in range(folder_depth):
+        nxt = []
+        for parent in level:
+            for _ in range(folder_fanout):
+                sub = Folder(f"Bin {depth + 1}.{len(nxt) + 1}")
+                parent.subfolders.append(sub)
+                nxt.append(sub)
+        folders.extend(nxt)
+        level = nxt
+
+    weights = [w for _, _, w in CLIP_KINDS]
+    n_dirs = max(1, clips // 500)
+    files = {}
+    pool = []
+    for i in range(clips):
+        if pool and rng.random() < shared_ratio:
+            src = rng.choice(pool)
+            ctype, path = src.props["Type"], src.props["File Path"]
+        else:
+            ctype, ext, _ = rng.choices(CLIP_KINDS, weights)[0]
+            path = f"{media_root}/shoot_{i % n_dirs:03d}/clip_{i:06d}{ext}"
+            files[path] = rng.random() >= missing_ratio
+        clip = Clip(os.path.basename(path), path, ctype)
+        rng.choice(folders).clips.append(clip)
+        pool.append(clip)
+
+    used = rng.sample(pool, int(len(pool) * used_ratio))
+    placements = {}
+
+    def place(track, clip):
+        track.append(clip)
+        placements[clip.uid] = placements.get(clip.uid, 0) + 1
+
+    nested = []
+    for c in range(compounds):
+        inner = None
+        for depth in range(compound_depth, 0, -1):
+            track = []
+            for clip in rng.sample(used, min(len(used), 5)):
+                place(track, clip)
+            if inner is not None:
+                place(track, inner)
+            tl = Timeline(f"Compound {c + 1} L{depth}", {"video": [track], "audio": []})
+            inner = Clip(f"Compound {c + 1} L{depth}", "", "Compound", timeline=tl)
+            rng.choice(folders).clips.append(inner)
+        nested.append(inner)
+
+    tls = [Timeline(f"Timeline {t + 1:03d}", {"video": [[] for _ in range(tracks)], "audio": []})
+           for t in range(timelines)]
+    for i, clip in enumerate(used):
+        tl = tls[i % timelines]
+        place(tl.tracks["video"][rng.randrange(tracks)], clip)
+    for i, comp in enumerate(nested):
+        place(tls[i % timelines].tracks["video"][0], comp)
+
+    stack = [folders[0]]
+    while stack:
+        folder = stack.pop()
+        for clip in folder.clips:
+            clip.props["Usage"] = str(placements.get(clip.uid, 0))
+        stack.extend(folder.subfolders)
+    return Project(name, folders[0], tls), files
+
+
+def materialize(files: dict, media_root: str, target_root: str) -> int:
+    """Creates the empty media files under target_root; returns how many were written.
+
+    The project must have been generated with the same `media_root`, which should be
+    the target directory itself so clip paths point at real files.
+    """
+    written = 0
+    made = set()
+    for path, present in files.items():
+        if not present:
+            continue
+        real = os.path.join(target_root, os.path.relpath(path, media_root))
+        parent = os.path.dirname(real)
+        if parent not in made:
+            os.makedirs(parent, exist_ok=True)
+            made.add(parent)
+        open(real, "wb").close()
+        written += 1
+    return written
+
+
+# --- Script Loading ---
+
+def load_cleaner():
+    """Imports the cleaner script as a module; pass Backend.connect to CleanerEngine."""
+    spec = importlib.util.spec_from_file_location("unused_media_cleaner", SCRIPT_PATH)
+    cleaner = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(cleaner)
+    return cleaner
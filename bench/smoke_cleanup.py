@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+"""
+End-to-end smoke test of the destructive paths against the simulated backend.
+
+    python bench/smoke_cleanup.py
+    python bench/smoke_cleanup.py --clips 2000 --keep
+
+Each step runs on a fresh synthetic project whose media lives in a temporary
+folder (config and Trash folders too, via XDG_CONFIG_HOME and XDG_DATA_HOME):
+
+    dry       a dry run, checked against the project's placements; nothing changes
+    move      a move-mode cleanup, then --undo (files back, clips re-imported)
+    trash     a trash-mode cleanup through the freedesktop.org Trash (Linux only)
+    apply     a dry run writing a plan, then --apply of that plan
+    resume    a move-mode cleanup whose Media Pool removal fails, then --resume
+
+Every step checks the files on disk and the Media Pool afterwards, prints one
+line, and the script exits non-zero if any check failed.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fake_resolve  # noqa: E402
+
+
+class SmokeFailure(Exception):
+    pass
+
+
+def check(condition, message):
+    if not condition:
+        raise SmokeFailure(message)
+
+
+def pool_usage(project):
+    """(file path, Usage) of every file clip in the project's Media Pool."""
+    stack = [project.media_pool.root]
+    while stack:
+        folder = stack.pop()
+        for c in folder.clips:
+            if c.props["File Path"]:
+                yield c.props["File Path"], c.props["Usage"]
+        stack.extend(folder.subfolders)
+
+
+def pool_paths(project) -> list:
+    """File paths of every file clip in the project's Media Pool, one per clip."""
+    return [path for path, _ in pool_usage(project)]
+
+
+class Step:
+    """One fresh project, backend and option set for a smoke step."""
+
+    def __init__(self, cleaner, args, root, name):
+        self.cleaner = cleaner
+        self.dir = os.path.join(root, name)
+        self.media = os.path.join(self.dir, "media")
+        self.project, files = fake_resolve.generate_project(
+            clips=args.clips, shared_ratio=0.1, compounds=1, media_root=self.media, seed=args.seed)
+        fake_resolve.materialize(files, self.media, self.media)
+        self.backend = fake_resolve.Backend([self.project], latency=0)
+        self.log = []
+
+    def engine(self, **options):
+        options = self.cleaner.ScanOptions(use_cache=False, timeline_workers=1, **options)
+        return self.cleaner.CleanerEngine(options, log=self.log.append, connect=self.backend.connect,
+                                          confirm=lambda title, message: True)
+
+    def expect(self, report, *statuses):
+        check(report["status"] in statuses,
+              f"status {report['status']!r}, expected {' or '.join(statuses)}: {report.get('error') or ''}")
+        errors = (report.get("summary") or {}).get("errors") or report.get("errors") or 0
+        check(not errors, f"{errors} errors reported")
+        return report
+
+
+def unused_files(report) -> set:
+    return {e["path"] for e in report["unused"]}
+
+
+def expected_findings(project) -> tuple[set, set]:
+    """(unused, missing) file paths by construction: Usage is derived from the placements."""
+    placed, files = set(), set()
+    for path, usage in pool_usage(project):
+        files.add(path)
+        if usage != "0":
+            placed.add(path)
+    unused = {p for p in files - placed if os.path.exists(p)}
+    return unused, {p for p in files if not os.path.exists(p)}
+
+
+def step_dry(step):
+    c = step.cleaner
+    before = pool_paths(step.project)
+    unused, missing = expected_findings(step.project)
+    report = step.expect(step.engine(action=c.ACTION_MOVE, dry_run=True).run(), "dry_run")
+    check(unused_files(report) == unused,
+          f"{len(unused_files(report) ^ unused)} files listed differently from the unused ones")
+    check({e["path"] for e in report["missing"]} == missing, "the missing clips differ from the offline files")
+    check(all(os.path.exists(p) for p in unused), "the dry run touched a file")
+    check(pool_paths(step.project) == before, "the dry run changed the Media Pool")
+    return f"{len(unused)} unused and {len(missing)} missing found, nothing changed"
+
+
+def step_move(step):
+    c = step.cleaner
+    before = pool_paths(step.project)
+    report = step.expect(step.engine(action=c.ACTION_MOVE).run(), "ok")
+    files = unused_files(report)
+    offline = {e["path"] for e in report["missing"]}
+    check(files, "nothing to clean up in the synthetic project")
+    check(not any(os.path.exists(p) for p in files), "an unused file is still in place after the move")
+    moved = [os.path.join(os.path.dirname(p), "Unused", os.path.basename(p)) for p in files]
+    check(all(os.path.exists(p) for p in moved), "a moved file is missing from the Unused folder")
+    check(not files & set(pool_paths(step.project)), "a moved file's clip is still in the Media Pool")
+
+    report = step.expect(step.engine(action=c.ACTION_MOVE).undo(), "ok")
+    check(all(os.path.exists(p) for p in files), "undo did not move every file back")
+    # Offline clips have no file to re-import; every other removed clip must be back
+    check(sorted(pool_paths(step.project)) == sorted(p for p in before if p not in offline),
+          "undo did not re-import every removed clip")
+    return f"{len(files)} files moved and restored, {report['reimported']} clips re-imported"
+
+
+def step_trash(step):
+    c = step.cleaner
+    if not c.IS_LINUX:
+        return "skipped (the Trash backend under test is Linux only)"
+    report = step.expect(step.engine(action=c.ACTION_TRASH).run(), "ok")
+    files = unused_files(report)
+    check(not any(os.path.exists(p) for p in files), "an unused file is still in place after trashing")
+    trash = os.path.join(os.environ["XDG_DATA_HOME"], "Trash")
+    trashed = os.listdir(os.path.join(trash, "files"))
+    infos = os.listdir(os.path.join(trash, "info"))
+    check(len(trashed) == len(files), f"{len(trashed)} files in the Trash, expected {len(files)}")
+    check(sorted(n + ".trashinfo" for n in trashed) == sorted(infos), "Trash files and .trashinfo entries differ")
+    check(not files & set(pool_paths(step.project)), "a trashed file's clip is still in the Media Pool")
+
+    report = step.engine(action=c.ACTION_TRASH).undo()
+    check(report["status"] == "not_undoable", f"undo of a trash cleanup returned {report['status']!r}")
+    shutil.rmtree(trash)
+    return f"{len(files)} files trashed, undo refused as expected"
+
+
+def step_apply(step):
+    c = step.cleaner
+    plan_path = os.path.join(step.dir, "plan.json")
+    before = pool_paths(step.project)
+    report = step.expect(step.engine(action=c.ACTION_MOVE, dry_run=True, plan_path=plan_path).run(), "dry_run")
+    files = unused_files(report)
+    check(os.path.exists(plan_path), "the dry run wrote no plan")
+    check(all(os.path.exists(p) for p in files), "the dry run touched a file")
+    check(pool_paths(step.project) == before, "the dry run changed the Media Pool")
+
+    report = step.expect(step.engine(action=c.ACTION_MOVE).apply(plan_path), "ok")
+    check(unused_files(report) == files, "apply acted on different files than the plan lists")
+    check(not report["skipped"], f"{len(report['skipped'])} planned entries skipped")
+    check(not any(os.path.exists(p) for p in files), "an unused file is still in place after apply")
+    check(not files & set(pool_paths(step.project)), "an applied file's clip is still in the Media Pool")
+    return f"{len(files)} planned files applied"
+
+
+def step_resume(step):
+    c = step.cleaner
+    pool = step.project.media_pool
+    working = pool.DeleteClips
+
+    def unreachable(clips):
+        raise RuntimeError("Resolve stopped responding")
+
+    # The files are moved, then every DeleteClips call fails, as if Resolve had quit
+    pool.DeleteClips = unreachable
+    try:
+        report = step.engine(action=c.ACTION_MOVE).run()
+    finally:
+        pool.DeleteClips = working
+    files = unused_files(report)
+    check(report["summary"] and report["summary"]["errors"], "the interrupted cleanup reported no errors")
+    check(not any(os.path.exists(p) for p in files), "the interrupted cleanup did not move its files")
+    left = files & set(pool_paths(step.project))
+    check(left, "the interrupted cleanup removed clips anyway")
+
+    report = step.expect(step.engine(action=c.ACTION_MOVE).resume(), "ok")
+    check(not files & set(pool_paths(step.project)), "resume left clips of moved files in the Media Pool")
+    report = step.engine(action=c.ACTION_MOVE).resume()
+    check(report["status"] == "nothing_to_do", f"a second resume returned {report['status']!r}")
+    return f"{len(left)} clips left by the interrupted cleanup removed on resume"
+
+
+STEPS = (("dry", step_dry), ("move", step_move), ("trash", step_trash), ("apply", step_apply), ("resume", step_resume))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clips", type=int, default=500, help="Media Pool clips per synthetic project")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--keep", action="store_true", help="Keep the temporary folder and print its path")
+    args = parser.parse_args(argv)
+
+    root = tempfile.mkdtemp(prefix="drmediacleaner-smoke-")
+    # Journals, caches and the Trash stay inside the temporary folder
+    os.environ["XDG_CONFIG_HOME"] = os.path.join(root, "config")
+    os.environ["XDG_DATA_HOME"] = os.path.join(root, "data")
+    cleaner = fake_resolve.load_cleaner()
+    failed = 0
+    try:
+        for name, run in STEPS:
+            step = Step(cleaner, args, root, name)
+            try:
+                print(f"{name:<8} ok    {run(step)}")
+            except SmokeFailure as e:
+                failed += 1
+                print(f"{name:<8} FAIL  {e}")
+                for line in step.log[-20:]:
+                    print(f"    {line}")
+    finally:
+        if args.keep:
+            print(f"Kept {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())